@@ -49,7 +49,7 @@ async def collect_rag_results(test_cases):
         
         # Clear previous state for this session if it exists
         try:
-            r.delete(f"agent_state:{session_id}")
+            r.delete(f"session_state:{session_id}", f"agent_state:{session_id}")
         except Exception:
             pass
 
@@ -141,14 +141,14 @@ async def run_eval(data_file: str = None, limit: int = None, output_file: str =
     # CRITICAL: Flush Redis before eval to prevent stale state from contaminating results.
     # We flush TWO key namespaces:
     # 1. agent_res:*   — cached final responses (prevents serving old answers)
-    # 2. agent_state:* — session state (prevents GoalExtractor reading stale core_goal
+    # 2. session_state:* / agent_state:* — session state, hash / legacy JSON (prevents GoalExtractor reading stale core_goal
     #                    from a previous test case's session)
     # NOTE: GoalExtractor/QueryRewriter are KEPT — they are essential for production
     # multi-turn conversations. The issue is eval isolation, not the components themselves.
     try:
         r = redis.Redis(host="localhost", port=6379, db=0)
         res_keys = r.keys("agent_res:*") or []
-        state_keys = r.keys("agent_state:eval_case_*") or []
+        state_keys = (r.keys("session_state:eval_case_*") or []) + (r.keys("agent_state:eval_case_*") or [])
         all_keys = res_keys + state_keys
         if all_keys:
             r.delete(*all_keys)
@@ -202,7 +202,7 @@ async def run_eval(data_file: str = None, limit: int = None, output_file: str =
 
         # Delete this session's state so GoalExtractor starts fresh (no stale core_goal)
         try:
-            r.delete(f"agent_state:{test_session_id}")
+            r.delete(f"session_state:{test_session_id}", f"agent_state:{test_session_id}")
         except Exception:
             pass
 
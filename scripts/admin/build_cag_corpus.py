@@ -0,0 +1,137 @@
+"""
+Builds the canonical corpus used by LegalResearchAgent's Cache-Augmented Generation path.
+
+Mines the audit log for the most frequent legal questions, clusters them by
+embedding similarity, and pre-retrieves the official passages for each
+cluster's most central question. Output format: see src/shared/cag_corpus.py.
+
+Usage:
+    python -m scripts.admin.build_cag_corpus --audit-log logs/audit.log --top 100
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import os
+from collections import Counter
+
+import numpy as np
+
+from skills.legal_retriever.main import _get_embeddings, retrieve_legal_info
+
+
+def load_queries(audit_log: str, intents: set) -> Counter:
+    """Counts rewritten queries from the (rotated) audit log files."""
+    counts = Counter()
+    for path in sorted(glob.glob(f"{audit_log}*")):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    data = json.loads(line).get("audit_data") or {}
+                except json.JSONDecodeError:
+                    continue
+                query = (data.get("rewritten_query") or data.get("query") or "").strip()
+                if query and (not intents or data.get("intent") in intents):
+                    counts[query] += 1
+    return counts
+
+
+def cluster_queries(counts: Counter, threshold: float) -> list:
+    """
+    Greedy leader clustering: queries are visited by decreasing frequency and
+    join the first cluster whose leader is within `threshold` cosine.
+    """
+    queries = [q for q, _ in counts.most_common()]
+    vectors = np.asarray(_get_embeddings().embed_documents(queries), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    leaders, clusters = [], []
+    for query, vector in zip(queries, vectors):
+        if leaders:
+            similarities = np.asarray(leaders) @ vector
+            best = int(np.argmax(similarities))
+            if similarities[best] >= threshold:
+                clusters[best]["members"].append((query, vector))
+                clusters[best]["size"] += counts[query]
+                continue
+        leaders.append(vector)
+        clusters.append({"members": [(query, vector)], "size": counts[query]})
+    return sorted(clusters, key=lambda c: c["size"], reverse=True)
+
+
+async def build_corpus(clusters: list, docs_per_cluster: int, max_chars: int) -> list:
+    corpus, seen = [], set()
+    for i, cluster in enumerate(clusters, start=1):
+        vectors = np.asarray([v for _, v in cluster["members"]])
+        centroid = vectors.mean(axis=0)
+        centroid /= np.linalg.norm(centroid)
+        # The most central question stands for the whole cluster
+        label = cluster["members"][int(np.argmax(vectors @ centroid))][0]
+
+        docs = await retrieve_legal_info(label, domain="general")
+        passages = []
+        for d in docs[:docs_per_cluster]:
+            content = d.get("content", "")[:max_chars]
+            key = (d.get("source"), content)
+            if key in seen:
+                continue
+            seen.add(key)
+            passages.append(
+                {
+                    "source": d.get("source", "Unknown"),
+                    "title": d.get("metadata", {}).get("title", "N/A"),
+                    "content": content,
+                }
+            )
+        if not passages:
+            print(f"  ! no passages for '{label}', skipped")
+            continue
+
+        corpus.append(
+            {
+                "id": f"c{i:03d}",
+                "label": label,
+                "size": cluster["size"],
+                "centroid": centroid.tolist(),
+                "passages": passages,
+            }
+        )
+        print(f"  {label} ({cluster['size']} queries, {len(passages)} passages)")
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the CAG canonical corpus")
+    parser.add_argument("--audit-log", default="logs/audit.log")
+    parser.add_argument("--output", default="data/cag_corpus.json")
+    parser.add_argument("--top", type=int, default=100, help="Number of query clusters to keep")
+    parser.add_argument("--threshold", type=float, default=0.85, help="Clustering cosine threshold")
+    parser.add_argument("--docs-per-cluster", type=int, default=3)
+    parser.add_argument("--max-chars", type=int, default=1000, help="Per-passage truncation")
+    parser.add_argument(
+        "--intents",
+        default="LEGAL_INQUIRY",
+        help="Comma-separated intents to keep (empty for all)",
+    )
+    args = parser.parse_args()
+
+    intents = {i for i in args.intents.split(",") if i}
+    counts = load_queries(args.audit_log, intents)
+    if not counts:
+        print("No queries found in the audit log.")
+        return
+    print(f"Loaded {sum(counts.values())} queries ({len(counts)} distinct)")
+
+    clusters = cluster_queries(counts, args.threshold)[: args.top]
+    corpus = asyncio.run(build_corpus(clusters, args.docs_per_cluster, args.max_chars))
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"embedding_model": "BAAI/bge-m3", "clusters": corpus}, f, ensure_ascii=False)
+    chars = sum(len(p["content"]) for c in corpus for p in c["passages"])
+    print(f"Wrote {len(corpus)} clusters (~{chars // 4} tokens) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
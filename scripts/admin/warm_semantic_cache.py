@@ -0,0 +1,105 @@
+"""
+Pre-warms the semantic response cache with answers to the most frequent legal questions.
+
+Mines the audit log for the top rewritten LEGAL_INQUIRY queries, retrieves
+and checks their context like LegalResearchAgent does, synthesizes every
+answer in one OpenAI Batch API job (half price, up to 24h), and stores the
+answers in the semantic cache, where live requests are served from it
+(SEMANTIC_CACHE_ENABLED).
+
+Only French queries are warmed by default: for other languages the agent
+searches with a French translation, which the audit log does not record.
+
+Usage:
+    python -m scripts.admin.warm_semantic_cache --audit-log logs/audit.log --top 200
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+from collections import Counter
+
+from skills.legal_retriever.main import retrieve_legal_info
+from src.agents.legal_agent import INSUFFICIENT_CONTEXT_MESSAGE, NO_CONTEXT_MESSAGE, legal_agent
+from src.config import settings
+from src.shared.context_pruner import prune_context
+from src.shared.semantic_cache import semantic_cache
+from src.utils.embedding_cache import embedding_cache
+
+
+def load_queries(audit_log: str, intents: set, languages: set) -> Counter:
+    """Counts (rewritten query, language) pairs from the (rotated) audit log files."""
+    counts = Counter()
+    for path in sorted(glob.glob(f"{audit_log}*")):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    data = json.loads(line).get("audit_data") or {}
+                except json.JSONDecodeError:
+                    continue
+                query = (data.get("rewritten_query") or data.get("query") or "").strip()
+                language = data.get("language") or "French"
+                if not query or (intents and data.get("intent") not in intents):
+                    continue
+                if languages and language not in languages:
+                    continue
+                counts[(query, language)] += 1
+    return counts
+
+
+async def build_items(pairs: list) -> list:
+    """(query, context, language) for every pair whose retrieved context passes the groundedness check."""
+    items = []
+    for query, language in pairs:
+        docs = await retrieve_legal_info(query, domain="general")
+        if not await legal_agent._verify_groundedness(query, docs, {}):
+            print(f"  ! not grounded, skipped: {query}")
+            continue
+        if settings.CONTEXT_PRUNING_ENABLED:
+            context = legal_agent._format_docs(await prune_context(query, docs), max_chars=None)
+        else:
+            context = legal_agent._format_docs(docs)
+        items.append((query, context, language))
+    return items
+
+
+async def warm(pairs: list, poll_interval: float) -> int:
+    items = await build_items(pairs)
+    answers = await legal_agent.synthesize_answer_batch(items, poll_interval=poll_interval)
+    embeddings = await embedding_cache.get_or_embed_many([query for query, _, _ in items])
+
+    stored = 0
+    for (query, _, language), answer, embedding in zip(items, answers, embeddings):
+        if answer is None or answer in (NO_CONTEXT_MESSAGE, INSUFFICIENT_CONTEXT_MESSAGE):
+            print(f"  ! no answer, skipped: {query}")
+            continue
+        await semantic_cache.set(embedding, answer, namespace=legal_agent._cache_namespace(language))
+        stored += 1
+    return stored
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm the semantic response cache via the OpenAI Batch API")
+    parser.add_argument("--audit-log", default="logs/audit.log")
+    parser.add_argument("--top", type=int, default=200, help="Number of most frequent queries to warm")
+    parser.add_argument("--intents", default="LEGAL_INQUIRY", help="Comma-separated intents to keep (empty for all)")
+    parser.add_argument("--languages", default="French", help="Comma-separated languages to keep (empty for all)")
+    parser.add_argument("--poll-interval", type=float, default=60.0, help="Seconds between batch status checks")
+    args = parser.parse_args()
+
+    intents = {i for i in args.intents.split(",") if i}
+    languages = {lang for lang in args.languages.split(",") if lang}
+    counts = load_queries(args.audit_log, intents, languages)
+    if not counts:
+        print("No queries found in the audit log.")
+        return
+    pairs = [pair for pair, _ in counts.most_common(args.top)]
+    print(f"Warming {len(pairs)} of {len(counts)} distinct queries")
+
+    stored = asyncio.run(warm(pairs, args.poll_interval))
+    print(f"Stored {stored} answers in the semantic cache (TTL {semantic_cache.ttl}s)")
+
+
+if __name__ == "__main__":
+    main()
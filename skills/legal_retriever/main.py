@@ -1,16 +1,49 @@
 import asyncio
-from functools import lru_cache
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from itertools import chain
+from typing import Sequence
 from qdrant_client import QdrantClient
+from qdrant_client.http.models import QuantizationSearchParams, SearchParams
 from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_qdrant import QdrantVectorStore
 from src.config import settings
 from src.utils.logger import logger
 from src.utils import metrics
+from src.utils.embedding_cache import QUERY, embedding_cache
 from src.shared.reranker import get_reranker
+from src.shared.hybrid_retriever import hybrid_rerank, rrf_fuse
 import time
 from src.utils.tracing import tracer
 from opentelemetry import trace
 
+PROCEDURES_COLLECTION = "service_public_procedures"
+LEGISLATION_COLLECTION = "legi_legislation"
+
+# Collections are int8 scalar- or product-quantized (see scripts/admin/ingest_data.py):
+# search the quantized vectors, then rescore the top k*oversampling with FP32.
+# Ignored by Qdrant for collections without quantization.
+_QUANTIZATION_PARAMS = QuantizationSearchParams(
+    rescore=True, oversampling=settings.QDRANT_RESCORE_OVERSAMPLING
+)
+
+
+@lru_cache(maxsize=8)
+def _search_params(ef_search: int) -> SearchParams:
+    """HNSW beam width per search: higher ef_search = better recall, slower query."""
+    return SearchParams(hnsw_ef=ef_search, quantization=_QUANTIZATION_PARAMS)
+
+# Dedicated pool for the blocking embedding and Qdrant calls of retrieval. Not
+# the loop's default executor: Whisper/TTS, the reranker and the local intent
+# classifier run there, and a few long voice calls must not starve retrieval.
+EMBED_EXECUTOR_WORKERS = 4
+
+
+@lru_cache(maxsize=1)
+def _get_retrieval_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=EMBED_EXECUTOR_WORKERS, thread_name_prefix="retrieval")
+
 
 # Singleton clients — avoid re-creating expensive connections per request
 @lru_cache(maxsize=1)
@@ -30,78 +63,174 @@ def _get_embeddings():
     return HuggingFaceEmbeddings(model_name="BAAI/bge-m3")
 
 
+# One vector store per collection. The constructor validates the collection
+# config against Qdrant, so it must not run on every search.
+_STORES: dict = {}
+
+
+def _get_vector_store(collection_name: str):
+    """
+    Returns the cached QdrantVectorStore for a collection, building it on first use.
+    Returns None (without caching) if the collection does not exist yet, so a
+    collection created after startup is picked up on the next request.
+    """
+    store = _STORES.get(collection_name)
+    if store is None:
+        client = _get_qdrant_client()
+        if not client.collection_exists(collection_name):
+            return None
+        store = QdrantVectorStore(
+            client=client,
+            collection_name=collection_name,
+            embedding=_get_embeddings(),
+            content_payload_key="text",
+        )
+        _STORES[collection_name] = store
+    return store
+
+
+
+
+# Single-flight: identical concurrent retrievals share one embedding + Qdrant + rerank run
+_INFLIGHT: dict = {}
+
+
+def _profile_key(user_profile):
+    if user_profile is None:
+        return None
+    if hasattr(user_profile, "model_dump_json"):
+        return user_profile.model_dump_json()
+    return repr(user_profile)
 
 
 @tracer.start_as_current_span("retrieve_legal_info")
-async def retrieve_legal_info(query: str, domain: str = "general", user_profile=None):
+async def retrieve_legal_info(
+    query: str,
+    domain: str = "general",
+    user_profile=None,
+    ef_search: int = None,
+    expansions: Sequence[str] = (),
+):
     span = trace.get_current_span()
     span.set_attribute("query", query)
     span.set_attribute("domain", domain)
     """
     Retrieves information about French administrative procedures or legislation.
     domain: 'procedure' (service-public) or 'legislation' (legi) or 'general' (both)
+    ef_search: HNSW search beam (defaults to QDRANT_HNSW_EF); raise it for
+    high-recall lookups where latency matters less.
+    expansions: paraphrases of `query`, embedded together and searched
+    alongside it; per-collection results are RRF-fused.
     """
-    client = _get_qdrant_client()
-    embeddings = _get_embeddings()
+    ef_search = ef_search or settings.QDRANT_HNSW_EF
+    expansions = tuple(expansions)
+    key = (query, domain, _profile_key(user_profile), ef_search, expansions)
+    task = _INFLIGHT.get(key)
+    if task is None:
+        task = asyncio.ensure_future(
+            _retrieve(query, domain, user_profile, ef_search, expansions)
+        )
+        _INFLIGHT[key] = task
+        task.add_done_callback(lambda _: _INFLIGHT.pop(key, None))
+    else:
+        span.set_attribute("coalesced", True)
 
-    async def search_collection(collection_name, label, k):
-        if not client.collection_exists(collection_name):
+    # shield: one caller being cancelled must not cancel the shared work
+    results = await asyncio.shield(task)
+    # Each caller gets its own list so appends/slices do not leak across requests
+    return list(results)
+
+
+async def _retrieve(
+    query: str,
+    domain: str,
+    user_profile=None,
+    ef_search: int = None,
+    expansions: Sequence[str] = (),
+):
+    search_params = _search_params(ef_search or settings.QDRANT_HNSW_EF)
+
+    async def search_collection(embeddings, collection_name, label, k):
+        store = _get_vector_store(collection_name)
+        if store is None:
             return []
-        store = QdrantVectorStore(
-            client=client,
-            collection_name=collection_name,
-            embedding=embeddings,
-            content_payload_key="text",
+        loop = asyncio.get_running_loop()
+        # With scores: the cosine similarity is kept as `vector_score` so callers
+        # (e.g. the groundedness check) can use it without another model call
+        batches = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    _get_retrieval_executor(),
+                    partial(
+                        store.similarity_search_with_score_by_vector,
+                        e,
+                        k=k,
+                        search_params=search_params,
+                    ),
+                )
+                for e in embeddings
+            )
         )
-        docs = await store.asimilarity_search(query, k=k)
-        return [
-            {"source": label, "content": d.page_content, "metadata": d.metadata}
-            for d in docs
+        ranked = [
+            [
+                {
+                    "source": label,
+                    "content": d.page_content,
+                    "metadata": d.metadata,
+                    "vector_score": float(score),
+                }
+                for d, score in hits
+            ]
+            for hits in batches
         ]
+        return ranked[0] if len(ranked) == 1 else rrf_fuse(ranked, top_n=k)
 
-    search_tasks = []
+    collections = []
     if domain in ["procedure", "general"]:
-        search_tasks.append(
-            search_collection("service_public_procedures", "service-public", 6)
-        )
+        collections.append((PROCEDURES_COLLECTION, "service-public", 6))
     if domain in ["legislation", "general"]:
-        search_tasks.append(search_collection("legi_legislation", "legi", 4))
+        collections.append((LEGISLATION_COLLECTION, "legi", 4))
 
-    if not search_tasks:
+    if not collections:
         return []
 
     try:
-        start_time = time.time()
+        start_time = time.perf_counter()
+        # Embed once (cached across requests) and search every collection by vector;
+        # paraphrases are embedded together in a single executor job
+        if expansions:
+            embeddings = await embedding_cache.get_or_embed_many(
+                [query, *expansions], kind=QUERY
+            )
+        else:
+            embeddings = [await embedding_cache.get_or_embed(query)]
+        search_tasks = [search_collection(embeddings, *c) for c in collections]
         batch_results = await asyncio.gather(*search_tasks)
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
         metrics.RAG_RETRIEVAL_LATENCY.labels(domain=domain).observe(duration)
 
-        results = []
-        for batch in batch_results:
-            results.extend(batch)
+        results = list(chain.from_iterable(batch_results))
 
-        logger.debug(f"Retriever found {len(results)} results for query: '{query}'")
-        for r in results:
-            logger.debug(
-                f" - Found: {r['source']} | Title: {r['metadata'].get('title', 'N/A')}"
-            )
+        # Skip building per-document debug strings unless DEBUG is actually on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Retriever found %s results for query: '%s'", len(results), query)
+            for r in results:
+                logger.debug(" - Found: %s | Title: %s", r["source"], r["metadata"].get("title", "N/A"))
 
         # BM25 Hybrid Fusion (Layer 2.5): RRF-merge semantic + lexical rankings
-        from src.shared.hybrid_retriever import hybrid_rerank
-
         results = hybrid_rerank(results, query, top_n=len(results))
         logger.debug(
-            f"Hybrid RRF fusion applied. Top result: {results[0].get('source', '?') if results else 'none'}"
+            "Hybrid RRF fusion applied. Top result: %s", results[0].get("source", "?") if results else "none"
         )
 
         # Context-Aware Reranking (Layer 3)
         reranker = get_reranker()
-        rerank_start = time.time()
-        reranked_results = reranker.rerank(query, results, user_profile=user_profile)
-        rerank_duration = time.time() - rerank_start
+        rerank_start = time.perf_counter()
+        reranked_results = await reranker.arerank(query, results, user_profile=user_profile)
+        rerank_duration = time.perf_counter() - rerank_start
         metrics.RERANKER_LATENCY.observe(rerank_duration)
 
-        logger.debug(f"Reranked top {len(reranked_results)} results in {rerank_duration:.3f}s")
+        logger.debug("Reranked top %s results in %.3fs", len(reranked_results), rerank_duration)
 
         return reranked_results
     except Exception as e:
@@ -111,9 +240,26 @@ async def retrieve_legal_info(query: str, domain: str = "general", user_profile=
 
 
 def warmup():
-    """Pre-load singleton clients on startup."""
-    _get_qdrant_client()
-    _get_embeddings()
+    """
+    Pre-load singleton clients and prime cold paths on startup.
+
+    Spawns the retrieval executor's threads so the first search does not pay
+    for thread creation, then runs one embedding (tokenizer/model kernels)
+    and one query per collection (Qdrant connection) before the first user.
+    """
+    executor = _get_retrieval_executor()
+    for future in [executor.submit(lambda: None) for _ in range(EMBED_EXECUTOR_WORKERS)]:
+        future.result()
+
+    client = _get_qdrant_client()
+    embeddings = _get_embeddings()
+
+    vector = embeddings.embed_query("warmup")
+    for collection_name in (PROCEDURES_COLLECTION, LEGISLATION_COLLECTION):
+        # Builds and caches the vector store as a side effect
+        if _get_vector_store(collection_name) is not None:
+            client.query_points(collection_name=collection_name, query=vector, limit=1)
+    logger.info("Retriever warmup complete (executor, embeddings, Qdrant).")
 
 
 if __name__ == "__main__":
@@ -1,10 +1,19 @@
+from openai import OpenAI
+
+from src.config import settings
+from src.utils.llm_factory import get_http_client
+
+
+def _get_client() -> OpenAI:
+    # Cheap to build: the connection pool is the shared one, not per call
+    return OpenAI(api_key=settings.OPENAI_API_KEY, http_client=get_http_client())
+
+
 def speech_to_text(audio_path: str, language: str = "fr"):
     """
     Converts audio input to text using OpenAI Whisper.
     """
-    from openai import OpenAI
-
-    client = OpenAI()
+    client = _get_client()
 
     with open(audio_path, "rb") as audio_file:
         transcript = client.audio.transcriptions.create(
@@ -18,9 +27,8 @@ def text_to_speech(text: str, language: str = "fr"):
     Converts informative text to speech for the user.
     """
     import uuid
-    from openai import OpenAI
 
-    client = OpenAI()
+    client = _get_client()
 
     response = client.audio.speech.create(model="tts-1", voice="alloy", input=text)
     # Use unique filename to prevent concurrent request conflicts
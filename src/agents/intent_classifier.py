@@ -1,5 +1,10 @@
+import asyncio
+import threading
+from functools import lru_cache
 from langchain_core.prompts import ChatPromptTemplate
+from src.config import settings
 from src.utils.llm_factory import get_llm
+from src.utils.logger import logger
 from enum import Enum
 
 
@@ -12,9 +17,44 @@ class Intent(str, Enum):
     UNKNOWN = "UNKNOWN"
 
 
+# Natural-language hypotheses for the local zero-shot (NLI) backend.
+# NLI models score label *descriptions* far better than raw enum names.
+_ZERO_SHOT_LABELS = {
+    "a simple factual question about a document, a cost, a location or a definition": Intent.SIMPLE_QA,
+    "a multi-step administrative procedure or a personal situation": Intent.COMPLEX_PROCEDURE,
+    "a question about a specific law, regulation or legal article": Intent.LEGAL_INQUIRY,
+    "a request for help filling out a specific form": Intent.FORM_FILLING,
+}
+
+
+# Serialises the first load so concurrent requests don't load the model twice.
+_PIPELINE_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _get_zero_shot_pipeline():
+    """Lazily loads the local zero-shot classifier (cached singleton)."""
+    from transformers import pipeline
+
+    logger.info(
+        "Loading local intent classifier: %s", settings.INTENT_CLASSIFIER_LOCAL_MODEL
+    )
+    return pipeline(
+        "zero-shot-classification", model=settings.INTENT_CLASSIFIER_LOCAL_MODEL
+    )
+
+
+def _load_zero_shot_pipeline():
+    with _PIPELINE_LOCK:
+        return _get_zero_shot_pipeline()
+
+
 class IntentClassifier:
     def __init__(self):
         # We no longer instantiate self.llm globally
+        # Set once the local model fails to load so later calls go straight
+        # to the LLM path instead of retrying the load on every request.
+        self._local_unavailable = False
 
 
         system_prompt = """You are an intent classifier for a French Administration Assistant.
@@ -42,6 +82,13 @@ class IntentClassifier:
         pass
 
     async def classify(self, query: str, model_override: str = None) -> str:
+        # Local zero-shot backend: no API round-trip, no per-call cost.
+        # Falls back to the LLM path if the model cannot be loaded or fails.
+        if settings.INTENT_CLASSIFIER_BACKEND == "local":
+            intent = await self._classify_local(query)
+            if intent is not None:
+                return intent
+
         try:
             llm = get_llm(temperature=0, model_override=model_override)
             chain = self.prompt | llm
@@ -53,6 +100,34 @@ class IntentClassifier:
         except Exception:
             return Intent.UNKNOWN
 
+    async def _classify_local(self, query: str):
+        """Runs the zero-shot pipeline in the default executor. Returns None on failure."""
+        if self._local_unavailable:
+            return None
+
+        loop = asyncio.get_running_loop()
+        try:
+            # Loading pulls the model from disk/network: keep it off the event loop.
+            classifier = await loop.run_in_executor(None, _load_zero_shot_pipeline)
+        except Exception as e:
+            logger.error(
+                "Local intent classifier could not be loaded: %s. "
+                "Using the LLM classifier from now on.",
+                e,
+            )
+            self._local_unavailable = True
+            return None
+
+        try:
+            result = await loop.run_in_executor(
+                None,
+                lambda: classifier(query, candidate_labels=list(_ZERO_SHOT_LABELS)),
+            )
+            return _ZERO_SHOT_LABELS[result["labels"][0]].value
+        except Exception as e:
+            logger.error("Local intent classifier failed: %s. Falling back to LLM.", e)
+            return None
+
 
 # Singleton
 intent_classifier = IntentClassifier()
@@ -1,183 +1,510 @@
-from typing import List, Dict
+import asyncio
+import hashlib
+import io
+import math
+import re
+from dataclasses import dataclass
+from functools import cached_property
+from typing import List, Dict, Optional, Tuple, Union
+from langchain_core.messages import SystemMessage, convert_to_openai_messages
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from tenacity import (
-    retry,
-    wait_exponential,
-    stop_after_attempt,
-    retry_if_exception_type,
-)
+from tenacity import retry, retry_if_exception_type
+from src.config import settings
 from src.utils.llm_factory import get_llm
 from src.agents.state import AgentState
 
 from skills.legal_retriever.main import retrieve_legal_info
+from src.shared.cag_corpus import get_cag_corpus
+from src.shared.context_pruner import prune_context
+from src.shared.semantic_cache import semantic_cache
+from src.utils.embedding_cache import embedding_cache
 from src.utils.logger import logger
+from src.utils.openai_batch import run_chat_batch
+from src.utils.rate_limit import (
+    LLM_RETRY_STOP,
+    LLM_RETRY_WAIT,
+    RETRYABLE_ERRORS,
+    rate_limit_gate,
+)
+
+NO_CONTEXT_MESSAGE = "Je n'ai trouvé aucune information officielle correspondante dans ma base de données."
+INSUFFICIENT_CONTEXT_MESSAGE = "Désolé, les documents trouvés ne permettent pas de répondre avec certitude."
+# Reply the synthesis prompt asks for when the context does not answer the question
+INSUFFICIENT_CONTEXT_SENTINEL = "INSUFFICIENT_CONTEXT"
+
+# Per-document content limits: synthesis context (when context pruning is
+# off), and a short summary of the top documents for the groundedness check
+_CONTENT_TRUNC = 1000
+_SUMMARY_TRUNC = 500
+
+# Caps concurrent agent LLM calls per process to stay under provider rate limits
+_LLM_SEMAPHORE = asyncio.Semaphore(settings.LEGAL_AGENT_MAX_CONCURRENCY)
+
+# Static synthesis rules. Must not contain per-request placeholders: the target
+# language is passed in the human turn, never interpolated here.
+SYNTHESIS_SYSTEM_PROMPT = """You are a French Administration Assistant. Reason step-by-step before answering.
+Answer the user's question using ONLY the provided context.
+Cite your sources (Service-Public or Legifrance).
+
+STRICT RESPONSE STRUCTURE:
+**[DONNER]**: Legal answer or status based on law.
+**[EXPLIQUER]**: Explanation of legal articles or criteria.
+**[DEMANDER]**: Mandatory clarification. 
+
+**CLARIFICATION LOGIC**:
+If info is missing, you MUST ask for 2-3 specific details based on the topic:
+- TAXES: Annual income, fiscal household composition, date of last gift.
+- WORK/LABOR: Contract type (CDI/CDD), Proof of hours (for unpaid wages), Company size (mandatory for chômage technique).
+- TRANSPORT/DAILY LIFE: 'Line used' and 'Period of the strike' (for refunds). 'Activity type' (for insurance).
+- VISA RENEWAL: Convention d'accueil status, contract extension proof, AND 'Family situation' (for 10-year residency).
+- IDENTITY/BIRTH/ID: Place of birth and Marital status of parents, or Urgency/Emergency level (for lost docs).
+- LEGAL: Exact case type (litigation, conseil, etc.), court involved.
+- FAMILY/SUCCESSION: Heirs involved, relationship to deceased.
+
+STRICT MANDATE: ONLY ask for variables relevant to the detected topic. Do NOT ask for 'Nationality' unless it is an IMMIGRATION query. DO NOT ask conversational questions (e.g., 'Have you talked to your boss?'). Always ask for the technical variables above.
+
+**MANDATORY CITATION RULE**:
+- You MUST cite the source URL for every key fact provided.
+- Use the format: `[Source: service-public.fr/...]` at the end of the distinct section or sentence.
+- Use ONLY sources provided in the Context.
+
+**LANGUAGE RULE**:
+- Supported response languages: French, English, Vietnamese.
+- You MUST respond ENTIRELY in the language requested at the end of the user's message.
+- KEEP official French administrative terms (e.g., 'Titre de séjour', 'Préfecture') in parentheses if there is no direct equivalent, or if the term is essential for identifying the procedure.
+- Example: "You need to apply for a residence permit (Titre de séjour) at the local prefecture (Préfecture)."
+
+If the provided context does not contain the answer, strictly reply with: "INSUFFICIENT_CONTEXT"."""
+
+# Static rules go in the system message and everything per-request in the
+# human turn, so the prompt prefix is byte-identical across calls and the
+# provider's automatic prefix caching applies to it.
+SYNTHESIS_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        ("system", SYNTHESIS_SYSTEM_PROMPT),
+        ("human", "Context:\n{context}\n\nQuestion: {query}\n\nAnswer in {user_language}:"),
+    ]
+)
+
+# A draft without a single citation is escalated (MANDATORY CITATION RULE above)
+_CITATION_RE = re.compile(r"\[Source: [^\]]+\]")
+
+# Version of the synthesis rules, hashed once at import. Semantic-cache entries
+# are namespaced by it: editing the prompt makes every stale answer unreachable.
+SYNTHESIS_PROMPT_VERSION = hashlib.sha256(SYNTHESIS_SYSTEM_PROMPT.encode("utf-8")).hexdigest()[:16]
+
+CAG_CORPUS_HEADER = "\n\nCANONICAL CORPUS (official passages; this is your Context):\n"
+CAG_HUMAN_TEMPLATE = "Topic: {topic}\n\nQuestion: {query}\n\nAnswer in {user_language}:"
+
+EXPANSION_PROMPT = ChatPromptTemplate.from_template(
+    """Rewrite the following French administrative/legal search query in {n} different ways,
+    using the official French administrative vocabulary (e.g. 'titre de séjour', 'préfecture').
+    Return ONLY the rewrites, one per line, without numbering.
+
+    Query: {query}"""
+)
+
+GROUNDEDNESS_PROMPT = ChatPromptTemplate.from_template(
+    """Evaluate if the provided Context contains sufficient legal information to answer the User Query.
+
+    User Query: {query}
+    User Profile: {profile}
+
+    Context:
+    {context}
+
+    Rules:
+    - Provide ONLY "YES" if the context contains relevant legal definitions, criteria, or statuses.
+    - Provide ONLY "NO" if the context is about a different topic, or is just irrelevant info.
+
+    Evaluation (YES/NO):"""
+)
+
+FALLBACK_PROMPT = ChatPromptTemplate.from_template(
+    """You are a French Administration Assistant.
+    The user asked a legal question but your database search returned IRRELEVANT documents.
+
+    DO NOT attempt to answer the legal question.
+
+    Provide a response following this structure:
+    **[DONNER]**: State clearly that you cannot find the specific law or text for their situation.
+    **[EXPLIQUER]**: Explain that you need more keywords or context to search the legal database effectively.
+    **[DEMANDER]**: Ask them to provide the specific name of the procedure, document, or situation they are inquiring about.
+
+    User's original query: {query}
+
+    Respond in {user_language}.
+    """
+)
+
+
+def _yes_no_probabilities(message) -> Optional[Tuple[float, float]]:
+    """
+    Reads P(YES) and P(NO) from the first generated token's top logprobs.
+    Returns None if the backend did not return logprobs.
+    """
+    logprobs = (getattr(message, "response_metadata", None) or {}).get("logprobs") or {}
+    content = logprobs.get("content") or []
+    if not content:
+        return None
+    probs = {"YES": 0.0, "NO": 0.0}
+    for candidate in content[0].get("top_logprobs") or []:
+        token = candidate["token"].strip().upper()
+        if token in probs:
+            probs[token] += math.exp(candidate["logprob"])
+    return probs["YES"], probs["NO"]
+
+
+def _average_logprob(message) -> Optional[float]:
+    """Mean per-token logprob of a generation, or None without logprobs."""
+    logprobs = (getattr(message, "response_metadata", None) or {}).get("logprobs") or {}
+    content = logprobs.get("content") or []
+    if not content:
+        return None
+    return sum(token["logprob"] for token in content) / len(content)
+
+
+@dataclass
+class RetrievedBundle:
+    """
+    Documents retrieved for one request. Derived views are computed on first
+    access and reused by every later step of the request.
+    """
+
+    docs: List[Dict]
+
+    @cached_property
+    def summary(self) -> str:
+        """Short summary of the top documents, for the groundedness check."""
+        return "\n".join(d["content"][:_SUMMARY_TRUNC] for d in self.docs[:3])
+
+    @cached_property
+    def best_score(self) -> Optional[float]:
+        """Highest query/document cosine from the retriever, None if unscored."""
+        scores = [d["vector_score"] for d in self.docs if d.get("vector_score") is not None]
+        return max(scores) if scores else None
 
 
 class LegalResearchAgent:
     def __init__(self):
-        # We no longer instantiate self.llm globally to support dynamic model switching per request
-        pass
-
-        # Synthesizer: Generates the final answer
-        self.synthesis_prompt = ChatPromptTemplate.from_template(
-            """You are a French Administration Assistant. Reason step-by-step before answering.
-            Answer the user's question using ONLY the provided context.
-            Cite your sources (Service-Public or Legifrance).
-            
-            STRICT RESPONSE STRUCTURE:
-            **[DONNER]**: Legal answer or status based on law.
-            **[EXPLIQUER]**: Explanation of legal articles or criteria.
-            **[DEMANDER]**: Mandatory clarification. 
-            
-            **CLARIFICATION LOGIC**:
-            If info is missing, you MUST ask for 2-3 specific details based on the topic:
-            - TAXES: Annual income, fiscal household composition, date of last gift.
-            - WORK/LABOR: Contract type (CDI/CDD), Proof of hours (for unpaid wages), Company size (mandatory for chômage technique).
-            - TRANSPORT/DAILY LIFE: 'Line used' and 'Period of the strike' (for refunds). 'Activity type' (for insurance).
-            - VISA RENEWAL: Convention d'accueil status, contract extension proof, AND 'Family situation' (for 10-year residency).
-            - IDENTITY/BIRTH/ID: Place of birth and Marital status of parents, or Urgency/Emergency level (for lost docs).
-            - LEGAL: Exact case type (litigation, conseil, etc.), court involved.
-            - FAMILY/SUCCESSION: Heirs involved, relationship to deceased.
-
-            STRICT MANDATE: ONLY ask for variables relevant to the detected topic. Do NOT ask for 'Nationality' unless it is an IMMIGRATION query. DO NOT ask conversational questions (e.g., 'Have you talked to your boss?'). Always ask for the technical variables above.
-
-            **MANDATORY CITATION RULE**:
-            - You MUST cite the source URL for every key fact provided.
-            - Use the format: `[Source: service-public.fr/...]` at the end of the distinct section or sentence.
-            - Use ONLY sources provided in the Context.
-
-            **LANGUAGE RULE**:
-            - You MUST respond ENTIRELY in {user_language}.
-            - KEEP official French administrative terms (e.g., 'Titre de séjour', 'Préfecture') in parentheses if there is no direct equivalent, or if the term is essential for identifying the procedure.
-            - Example: "You need to apply for a residence permit (Titre de séjour) at the local prefecture (Préfecture)."
-
-            If the provided context does not contain the answer, strictly reply with: "INSUFFICIENT_CONTEXT".
-
-            Context:
-            {context}
-
-            Question: {query}
-
-            Answer in {user_language}:"""
-        )
+        # No LLM is instantiated here, to support dynamic model switching per request.
+        # Synthesizer: Generates the final answer.
+        self.synthesis_prompt = SYNTHESIS_PROMPT
+
+        # LCEL chains are built once per (chain, model) and reused across requests
+        self._chains: Dict[tuple, object] = {}
+
+    def _get_chain(self, kind: str, model_override: str = None):
+        """
+        Returns the cached chain for `kind` ("expansion", "groundedness",
+        "fallback", "synthesis", "synthesis_draft" or "cag").
+        """
+        key = (kind, model_override)
+        chain = self._chains.get(key)
+        if chain is None:
+            if kind == "cag":
+                # Corpus in the static system prefix; passed as a message, not a
+                # template, since official passages may contain braces
+                prompt = ChatPromptTemplate.from_messages(
+                    [
+                        SystemMessage(content=SYNTHESIS_SYSTEM_PROMPT + CAG_CORPUS_HEADER + get_cag_corpus().text),
+                        ("human", CAG_HUMAN_TEMPLATE),
+                    ]
+                )
+                llm = get_llm(temperature=0, streaming=True, model_override=model_override)
+                chain = (prompt | llm | StrOutputParser()).with_config({"tags": ["final_answer"]})
+            elif kind == "expansion":
+                llm_fast = get_llm(temperature=0.3, model_override=model_override or settings.FAST_LLM_MODEL)
+                chain = EXPANSION_PROMPT | llm_fast | StrOutputParser()
+            elif kind == "synthesis_draft":
+                # Non-streamed draft: kept whole as a message so its token
+                # logprobs can gate the escalation to the larger model
+                llm_fast = get_llm(temperature=0, model_override=model_override).bind(
+                    max_tokens=settings.SYNTHESIS_DRAFT_MAX_TOKENS, logprobs=True
+                )
+                chain = self.synthesis_prompt | llm_fast
+            elif kind == "groundedness":
+                # Single-token YES/NO classification: the verdict and its
+                # confidence come from the first token's logprobs.
+                llm_fast = get_llm(temperature=0, model_override=model_override).bind(
+                    max_tokens=1, logprobs=True, top_logprobs=5
+                )
+                chain = GROUNDEDNESS_PROMPT | llm_fast
+            else:
+                prompt = FALLBACK_PROMPT if kind == "fallback" else self.synthesis_prompt
+                llm = get_llm(temperature=0, streaming=True, model_override=model_override)
+                chain = (prompt | llm | StrOutputParser()).with_config({"tags": ["final_answer"]})
+            self._chains[key] = chain
+        return chain
 
     @retry(
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        stop=stop_after_attempt(3),
-        retry=retry_if_exception_type(Exception),
+        wait=LLM_RETRY_WAIT,
+        stop=LLM_RETRY_STOP,
+        retry=retry_if_exception_type(RETRYABLE_ERRORS),
+        before_sleep=rate_limit_gate.before_sleep,
     )
-    async def _run_chain(self, chain, input_data):
-        """Wrapper for LCEL chain invocations with retry."""
-        return await chain.ainvoke(input_data)
+    async def _run_chain(self, chain, input_data, stream: bool = False):
+        """
+        Wrapper for LCEL chain invocations with retry.
+
+        With `stream=True` the chain is consumed through `astream` and stops as
+        soon as the INSUFFICIENT_CONTEXT sentinel shows up, instead of paying
+        for the rest of the generation.
+        """
+        await rate_limit_gate.wait_if_cooling()
+        async with _LLM_SEMAPHORE:
+            if not stream:
+                return await chain.ainvoke(input_data)
+
+            parts = []
+            tail = ""
+            stream_iter = chain.astream(input_data)
+            try:
+                async for chunk in stream_iter:
+                    parts.append(chunk)
+                    # Rolling window, so a sentinel split across chunks is still seen
+                    tail = (tail + chunk)[-2 * len(INSUFFICIENT_CONTEXT_SENTINEL):]
+                    if INSUFFICIENT_CONTEXT_SENTINEL in tail:
+                        return INSUFFICIENT_CONTEXT_SENTINEL
+            finally:
+                await stream_iter.aclose()
+            return "".join(parts)
 
     async def run(self, query: str, state: AgentState) -> str:
-        logger.info(f"LegalResearchAgent started for query: {query}")
+        logger.info("LegalResearchAgent started for query: %s", query)
         user_lang = state.user_profile.language or "French"
 
         # Note: `query` here is already the goal-anchored, pipeline-rewritten query.
-        # Step 1: Search using the pipeline-anchored query
-        docs = await retrieve_legal_info(query, domain="general")
-        
+        # Step 1: Search using the pipeline-anchored query. Started right away so it
+        # overlaps with the semantic-cache embedding + lookup below.
+        docs_task = asyncio.create_task(self._retrieve(query, state))
+
+        # Semantic cache — a paraphrase of an already-answered question
+        # short-circuits the retrieval and every LLM call below.
+        query_embedding = None
+        if settings.SEMANTIC_CACHE_ENABLED or settings.CAG_ENABLED:
+            query_embedding = await self._embed_query(query)
+        if settings.SEMANTIC_CACHE_ENABLED and query_embedding is not None:
+            cached_answer = await semantic_cache.get(query_embedding, namespace=self._cache_namespace(user_lang))
+            if cached_answer is not None:
+                docs_task.cancel()
+                return cached_answer
+
+        # CAG — frequent questions are answered from the canonical corpus, no retrieval
+        cluster = self._match_corpus(query_embedding) if settings.CAG_ENABLED else None
+        if cluster is not None:
+            docs_task.cancel()
+            answer = await self._synthesize_from_corpus(query, cluster, user_lang, state=state)
+            if answer != INSUFFICIENT_CONTEXT_MESSAGE:
+                await self._remember_answer(query_embedding, answer, user_lang)
+                return answer
+            logger.info("CAG corpus insufficient for cluster '%s', falling back to retrieval.", cluster['id'])
+            docs_task = asyncio.create_task(self._retrieve(query, state))
+
+        bundle = RetrievedBundle(await docs_task)
+
         # Pre-Synthesis Verification (Groundedness Check)
-        is_grounded = await self._verify_groundedness(query, docs, state.user_profile.model_dump(), state=state)
+        is_grounded = await self._verify_groundedness(query, bundle, state.user_profile.model_dump(), state=state)
         if not is_grounded:
             logger.warning(f"Groundedness check failed in LegalAgent for query: {query}. Triggering fallback.")
             return await self._ask_clarification_fallback(query, user_lang, state=state)
 
-        context = self._format_docs(docs)
+        if settings.CONTEXT_PRUNING_ENABLED:
+            # Token-budgeted already, no fixed per-document truncation
+            context = self._format_docs(await prune_context(query, bundle.docs), max_chars=None)
+        else:
+            context = self._format_docs(bundle.docs)
 
         # Step 2: Synthesize
-        return await self._synthesize_answer(query, context, user_lang, state=state)
+        answer = await self._synthesize_answer(query, context, user_lang, state=state)
+        await self._remember_answer(query_embedding, answer, user_lang)
+        return answer
+
+    async def _retrieve(self, query: str, state: AgentState) -> List[Dict]:
+        if settings.LEGAL_QUERY_EXPANSIONS <= 0:
+            return await retrieve_legal_info(query, domain="general")
+        expansions = await self._expand_query(query, settings.LEGAL_QUERY_EXPANSIONS, state)
+        return await retrieve_legal_info(query, domain="general", expansions=expansions)
+
+    async def _expand_query(self, query: str, n: int, state: AgentState = None) -> List[str]:
+        """Paraphrases the query for recall. Returns [] on failure (plain retrieval)."""
+        model_override = state.metadata.get("model") if state else None
+        try:
+            result = await self._get_chain("expansion", model_override).ainvoke({"query": query, "n": n})
+        except Exception as e:
+            logger.error(f"Query expansion failed: {e}")
+            return []
+        lines = (line.strip(" -•\t") for line in result.splitlines())
+        return [line for line in lines if line and line != query][:n]
+
+    async def _remember_answer(self, query_embedding, answer: str, user_lang: str):
+        # Only grounded, synthesized answers are worth replaying to other users
+        if (
+            settings.SEMANTIC_CACHE_ENABLED
+            and query_embedding is not None
+            and answer not in (NO_CONTEXT_MESSAGE, INSUFFICIENT_CONTEXT_MESSAGE)
+        ):
+            await semantic_cache.set(query_embedding, answer, namespace=self._cache_namespace(user_lang))
+
+    @staticmethod
+    def _cache_namespace(user_lang: str) -> str:
+        """Semantic-cache namespace: answers are reused only for the same language and prompt version."""
+        return f"{SYNTHESIS_PROMPT_VERSION}:{user_lang}"
+
+    def _match_corpus(self, query_embedding) -> Optional[dict]:
+        if query_embedding is None:
+            return None
+        corpus = get_cag_corpus()
+        return corpus.match(query_embedding) if corpus is not None else None
+
+    async def _synthesize_from_corpus(self, query: str, cluster: dict, user_lang: str, state: AgentState = None) -> str:
+        model_override = state.metadata.get("model") if state else None
+        chain = self._get_chain("cag", model_override)
+        result = await self._run_chain(
+            chain, {"topic": cluster["label"], "query": query, "user_language": user_lang}, stream=True
+        )
+        if INSUFFICIENT_CONTEXT_SENTINEL in result:
+            return INSUFFICIENT_CONTEXT_MESSAGE
+        return result
 
-    async def _verify_groundedness(self, query: str, docs: List[Dict], user_profile: dict, state: AgentState = None) -> bool:
-        if not docs:
+    async def _embed_query(self, query: str):
+        """Embeds the query with the retrieval model. Returns None on failure (cache is skipped)."""
+        try:
+            # Shared with the retriever, which embeds the same query concurrently
+            return await embedding_cache.get_or_embed(query)
+        except Exception as e:
+            logger.error(f"Query embedding for semantic cache failed: {e}")
+            return None
+
+    async def _verify_groundedness(
+        self, query: str, docs: Union[List[Dict], RetrievedBundle], user_profile: dict, state: AgentState = None
+    ) -> bool:
+        bundle = docs if isinstance(docs, RetrievedBundle) else RetrievedBundle(docs)
+        if not bundle.docs:
             return False
 
-        context_summary = "\n".join([d["content"][:500] for d in docs[:3]])
-        
-        prompt = ChatPromptTemplate.from_template(
-            """Evaluate if the provided Context contains sufficient legal information to answer the User Query.
-
-            User Query: {query}
-            User Profile: {profile}
-            
-            Context:
-            {context}
+        # Tier 1: the retriever's query/document cosine settles clear-cut cases
+        # without an LLM call; only the borderline band goes to the LLM judge.
+        best = bundle.best_score
+        if best is not None:
+            if best >= settings.GROUNDEDNESS_COSINE_HIGH:
+                return True
+            if best < settings.GROUNDEDNESS_COSINE_LOW:
+                logger.info("Groundedness: best cosine %.3f below threshold, skipping LLM judge.", best)
+                return False
 
-            Rules:
-            - Provide ONLY "YES" if the context contains relevant legal definitions, criteria, or statuses.
-            - Provide ONLY "NO" if the context is about a different topic, or is just irrelevant info.
-
-            Evaluation (YES/NO):"""
-        )
-        
         model_override = state.metadata.get("model") if state else None
-        llm_fast = get_llm(temperature=0, model_override=model_override)
-
-        chain = prompt | llm_fast | StrOutputParser()
+        chain = self._get_chain("groundedness", model_override)
         try:
             result = await chain.ainvoke({
                 "query": query,
                 "profile": user_profile,
-                "context": context_summary
+                "context": bundle.summary
             })
-            return "YES" in result.upper()
+            probabilities = _yes_no_probabilities(result)
+            if probabilities is None:
+                # Backend without logprobs support: fall back to the generated text
+                return "YES" in str(result.content).upper()
+            p_yes, p_no = probabilities
+            logger.debug("Groundedness P(YES)=%.3f P(NO)=%.3f", p_yes, p_no)
+            return p_yes > p_no and p_yes > settings.GROUNDEDNESS_MIN_YES_PROB
         except Exception as e:
             logger.error(f"Groundedness check failed: {e}. Defaulting to True to avoid blocking.")
             return True
 
     async def _ask_clarification_fallback(self, query: str, user_lang: str, state: AgentState = None) -> str:
         """Fallback response when retrieved documents are irrelevant."""
-        prompt = ChatPromptTemplate.from_template(
-            """You are a French Administration Assistant.
-            The user asked a legal question but your database search returned IRRELEVANT documents.
-            
-            DO NOT attempt to answer the legal question.
-            
-            Provide a response following this structure:
-            **[DONNER]**: State clearly that you cannot find the specific law or text for their situation.
-            **[EXPLIQUER]**: Explain that you need more keywords or context to search the legal database effectively.
-            **[DEMANDER]**: Ask them to provide the specific name of the procedure, document, or situation they are inquiring about.
-            
-            User's original query: {query}
-            
-            Respond in {user_language}.
-            """
-        )
         model_override = state.metadata.get("model") if state else None
-        llm = get_llm(temperature=0, streaming=True, model_override=model_override)
-
-        chain = (prompt | llm | StrOutputParser()).with_config({"tags": ["final_answer"]})
+        chain = self._get_chain("fallback", model_override)
         return await self._run_chain(chain, {"query": query, "user_language": user_lang})
 
     async def _synthesize_answer(self, query: str, context: str, user_lang: str, state: AgentState = None) -> str:
         if not context:
-            return "Je n'ai trouvé aucune information officielle correspondante dans ma base de données."
+            return NO_CONTEXT_MESSAGE
 
+        input_data = {"query": query, "context": context, "user_language": user_lang}
         model_override = state.metadata.get("model") if state else None
-        llm = get_llm(temperature=0, streaming=True, model_override=model_override)
-
-        chain = (self.synthesis_prompt | llm | StrOutputParser()).with_config(
-            {"tags": ["final_answer"]}
-        )
-        result = await self._run_chain(
-            chain, {"query": query, "context": context, "user_language": user_lang}
-        )
-
-        if "INSUFFICIENT_CONTEXT" in result:
+        if model_override or not settings.LEGAL_SYNTHESIS_ESCALATION:
+            # An explicitly chosen model is always honoured, no tiering
+            result = await self._run_chain(self._get_chain("synthesis", model_override), input_data, stream=True)
+        elif state is not None and state.metadata.get("streaming") is False:
+            result = await self._draft_then_escalate(input_data)
+        else:
+            # The draft is already on its way to the user: only the sentinel,
+            # which the stream never shows, can still be escalated
+            draft_chain = self._get_chain("synthesis", settings.FAST_LLM_MODEL)
+            result = await self._run_chain(draft_chain, input_data, stream=True)
+            if INSUFFICIENT_CONTEXT_SENTINEL in result:
+                logger.info("Synthesis draft insufficient, escalating to the default model.")
+                result = await self._run_chain(self._get_chain("synthesis"), input_data, stream=True)
+
+        if INSUFFICIENT_CONTEXT_SENTINEL in result:
             # Logic for fallback or search loop could go here
-            return "Désolé, les documents trouvés ne permettent pas de répondre avec certitude."
+            return INSUFFICIENT_CONTEXT_MESSAGE
 
         return result
 
-    def _format_docs(self, docs: List[Dict]) -> str:
-        return "\n\n".join(
-            [
-                f"Source: {d.get('source', 'Unknown')}\nTitle: {d.get('metadata', {}).get('title', 'N/A')}\nContent: {d.get('content', '')[:1000]}"
-                for d in docs
-            ]
-        )
+    async def _draft_then_escalate(self, input_data: dict) -> str:
+        """Drafts with FAST_LLM_MODEL; redoes the answer with the default model if the draft fails its self-check."""
+        draft = await self._run_chain(self._get_chain("synthesis_draft", settings.FAST_LLM_MODEL), input_data)
+        text = str(getattr(draft, "content", draft))
+        avg_logprob = _average_logprob(draft)
+        finish_reason = (getattr(draft, "response_metadata", None) or {}).get("finish_reason")
+
+        reason = None
+        if INSUFFICIENT_CONTEXT_SENTINEL in text:
+            reason = "insufficient context"
+        elif finish_reason == "length":
+            reason = "truncated draft"
+        elif avg_logprob is not None and avg_logprob < settings.SYNTHESIS_ESCALATION_MIN_AVG_LOGPROB:
+            reason = f"low confidence (avg logprob {avg_logprob:.2f})"
+        elif not _CITATION_RE.search(text):
+            reason = "no citation"
+        if reason is None:
+            return text
+
+        logger.info("Escalating legal synthesis to the default model: %s.", reason)
+        return await self._run_chain(self._get_chain("synthesis"), input_data)
+
+    async def synthesize_answer_batch(
+        self, items: List[Tuple[str, str, str]], poll_interval: float = 30.0
+    ) -> List[Optional[str]]:
+        """
+        Offline variant of `_synthesize_answer` for (query, context, user_lang)
+        items, run through the OpenAI Batch API (half price, results within 24h).
+        Uses the synthesis prompt with the default model (no fast-model draft:
+        batch pricing already halves its cost). None for requests that failed.
+        """
+        answers: List[Optional[str]] = [NO_CONTEXT_MESSAGE] * len(items)
+        pending = [i for i, (_, context, _) in enumerate(items) if context]
+        requests = [
+            convert_to_openai_messages(
+                self.synthesis_prompt.format_messages(query=query, context=context, user_language=user_lang)
+            )
+            for query, context, user_lang in (items[i] for i in pending)
+        ]
+        results = await run_chat_batch(requests, model=settings.OPENAI_MODEL, poll_interval=poll_interval, temperature=0)
+
+        for i, result in zip(pending, results):
+            if result is not None and INSUFFICIENT_CONTEXT_SENTINEL in result:
+                result = INSUFFICIENT_CONTEXT_MESSAGE
+            answers[i] = result
+        return answers
+
+    def _format_docs(self, docs: List[Dict], max_chars: Optional[int] = _CONTENT_TRUNC) -> str:
+        # Written straight into one buffer: no per-document f-strings or list to join
+        buf = io.StringIO()
+        for i, d in enumerate(docs):
+            if i:
+                buf.write("\n\n")
+            buf.write("Source: ")
+            buf.write(str(d.get("source", "Unknown")))
+            buf.write("\nTitle: ")
+            buf.write(str(d.get("metadata", {}).get("title", "N/A")))
+            buf.write("\nContent: ")
+            buf.write(d.get("content", "")[:max_chars])
+        return buf.getvalue()
 
 
 # Singleton
@@ -1,25 +1,36 @@
-import hashlib
+import asyncio
 import time
+import zlib
+from collections import OrderedDict
+from types import MappingProxyType
+from functools import lru_cache
+from typing import Optional
 import redis.asyncio as redis
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
-from tenacity import (
-    retry,
-    wait_exponential,
-    stop_after_attempt,
-    retry_if_exception_type,
-)
+from pydantic import BaseModel, ValidationError
+from tenacity import retry, retry_if_exception_type
 from skills.legal_retriever.main import retrieve_legal_info
 from skills.admin_translator import translate_admin_text
 from src.memory.manager import memory_manager
 from src.config import settings
 from src.utils.logger import logger
+from src.utils.rate_limit import (
+    LLM_RETRY_STOP,
+    LLM_RETRY_WAIT,
+    RETRYABLE_ERRORS,
+    rate_limit_gate,
+)
 from src.utils import metrics
 from src.agents.graph import agent_graph
+from src.agents.legal_agent import INSUFFICIENT_CONTEXT_SENTINEL
 from src.agents.intent_classifier import Intent
 from src.rules.registry import topic_registry
-from src.shared.guardrails import guardrail_manager
-from src.shared.query_pipeline import get_query_pipeline
-from src.shared.language_resolver import language_resolver
+from src.shared.injection_guard import injection_guard
+from src.shared.guardrails import GROUNDING_RULES, TOPIC_ROUTE_PERSONAL, TOPIC_RULES, guardrail_manager
+from src.shared.query_pipeline import PipelineResult, get_query_pipeline
+from src.shared.context_pruner import MAX_DOC_CHARS, count_tokens, truncate_to_tokens
+from src.shared.language_resolver import LANG_MAP, language_resolver
+from src.utils.hashing import key_digest
 from src.utils.llm_factory import get_llm
 from src.utils.tracing import tracer
 from opentelemetry import trace
@@ -31,6 +42,112 @@ from src.utils.audit import audit_logger
 # Complex Vietnamese queries with multi-step reasoning can take 30-50s.
 # Without this, the frontend gets "Failed to fetch" instead of a graceful error.
 QUERY_TIMEOUT_SECONDS = 60
+# A hung preprocessing call (goal, rewrite, intent, profile) falls back to the
+# raw query instead of using up the whole query budget
+PIPELINE_TIMEOUT_SECONDS = 20
+
+# Sliding TTL of cached responses: frequently asked questions stay cached
+RESPONSE_CACHE_TTL = 3600
+# Cached responses larger than this are stored zlib-compressed behind a marker
+# byte (long procedure answers shrink ~3x); UTF-8 text never starts with 0x01
+COMPRESS_MIN_BYTES = 4096
+COMPRESSED_PREFIX = b"\x01"
+# In-process copy of recently served responses, in front of Redis: a hot key
+# is answered without a network round trip. Entries expire RESPONSE_CACHE_TTL
+# after they were stored (not sliding: another replica may have dropped them).
+LOCAL_CACHE_MAX_ENTRIES = settings.LOCAL_RESPONSE_CACHE_SIZE
+# Messages of the session history a request reads: the fast-lane prompt takes
+# all of them, the guardrails and preprocessors fewer. Sliced once per request.
+PROMPT_HISTORY_MESSAGES = 10
+# Graph events stream_query consumes: tokens of the LLM runs tagged as the
+# final answer, and the expert nodes' outputs
+FINAL_ANSWER_TAG = "final_answer"
+EXPERT_NODES = ("legal_expert", "procedure_expert")
+# Cache hits are streamed in token events of this many characters
+CACHED_STREAM_CHUNK_CHARS = 64
+# Background response-cache writes in flight (process-wide, see _cache_response)
+_CACHE_WRITE_SLOTS = asyncio.Semaphore(settings.RESPONSE_CACHE_MAX_PENDING_WRITES)
+
+# One pool per process, shared by every orchestrator instance: no per-instance
+# connect/handshake. Creating the pool does not connect; connections are lazy.
+# Blocking: under a burst (lookups plus background writes) a request waits up
+# to REDIS_POOL_TIMEOUT for a free connection instead of failing with
+# "Too many connections" once REDIS_POOL_SIZE are checked out.
+# redis.asyncio round trips assume the service runs on uvloop (uvicorn
+# --loop uvloop/auto); on the default selector loop each await costs far more.
+_REDIS_POOL = redis.BlockingConnectionPool(
+    host=settings.REDIS_HOST,
+    port=settings.REDIS_PORT,
+    db=settings.REDIS_DB,
+    max_connections=settings.REDIS_POOL_SIZE,
+    timeout=settings.REDIS_POOL_TIMEOUT,
+    # Raw bytes: misses skip decoding entirely, hits are decoded once (_get_cached_response)
+    decode_responses=False,
+    health_check_interval=30,
+    socket_keepalive=True,
+)
+
+# Fused fast lane (FUSED_FAST_LANE_ENABLED): one JSON-mode call judges the
+# topic, answers and self-checks grounding, instead of topic guardrail +
+# answer + hallucination check. Same rule blocks as the separate guardrails.
+FUSED_FAST_LANE_INSTRUCTION = (
+    """Before answering, act as the gatekeeper and the factual verifier of Marianne AI.
+
+TOPIC """
+    + TOPIC_RULES
+    + """
+
+GROUNDING (judge your own answer against the Context above):
+"""
+    + GROUNDING_RULES
+    + """
+
+Respond ONLY with a JSON object:
+{"valid": true|false, "reject_reason": "<short reason in English if REJECTED, else empty>", "answer": "<your answer, empty if REJECTED>", "grounded": true|false}"""
+)
+
+# Fast-lane context placeholder when retrieval found nothing
+NO_CONTEXT_TEXT = "No direct information found in specific administrative databases."
+NO_RETRIEVAL_TEXT = "No retrieval needed for this personal/contextual query."
+
+# Response language ("fr"/"French"/"english"...) -> message-table key, built
+# once from LANG_MAP so both tables accept the same spellings
+_LANG_KEYS = {
+    spelling: {"French": "fr", "English": "en", "Vietnamese": "vi"}[name]
+    for spelling, name in LANG_MAP.items()
+}
+
+# Localized user-facing messages, by _lang_key. Read-only: shared by every request
+REJECTION_TEMPLATES = MappingProxyType({
+    "fr": "Désolé, je ne peux pas traiter cette demande. Raison : {reason}",
+    "en": "Sorry, I cannot process this request. Reason: {reason}",
+    "vi": "Xin lỗi, tôi không thể hỗ trợ yêu cầu này. Lý do: {reason}",
+})
+
+HALLUCINATION_FALLBACK_MESSAGES = MappingProxyType({
+    "fr": "Désolé, je n'ai pas trouvé d'informations suffisamment fiables pour répondre à cette question en toute sécurité.",
+    "en": "Sorry, I could not find reliable enough information to answer this question safely.",
+    "vi": "Xin lỗi, tôi không tìm thấy thông tin đủ tin cậy để trả lời câu hỏi này một cách an toàn.",
+})
+
+TIMEOUT_MESSAGES = MappingProxyType({
+    "fr": "Désolé, la requête a pris trop de temps. Veuillez réessayer avec une question plus courte.",
+    "en": "Sorry, the request timed out. Please try again with a shorter question.",
+    "vi": "Xin lỗi, yêu cầu mất quá nhiều thời gian. Vui lòng thử lại với câu hỏi ngắn hơn.",
+})
+
+
+@lru_cache(maxsize=1)
+def _fast_lane_prompt_prefix() -> str:
+    """Persona + global rules of the fast-lane system prompt (static: built once)."""
+    return f"{topic_registry.persona}\n\n{topic_registry.build_global_rules_fragment()}"
+
+
+class FusedFastLaneAnswer(BaseModel):
+    valid: bool
+    reject_reason: str = ""
+    answer: str = ""
+    grounded: bool = True
 
 
 class AdminOrchestrator:
@@ -42,51 +159,46 @@ class AdminOrchestrator:
 
         # Initialize Redis Cache for Agent Responses
         # Using redis.asyncio for async operations
-        self.cache = redis.Redis(
-            host=settings.REDIS_HOST,
-            port=settings.REDIS_PORT,
-            db=settings.REDIS_DB,
-            decode_responses=True,
-        )
+        self.cache = redis.Redis(connection_pool=_REDIS_POOL)
         self.memory = memory_manager
-        self.lang_map = {
-            "fr": "French",
-            "en": "English",
-            "vi": "Vietnamese",
-            "french": "French",
-            "english": "English",
-            "vietnamese": "Vietnamese",
-        }
+        # Fire-and-forget writes in flight (strong references until done)
+        self._pending = set()
+        # handle_query executions in flight, by (response-cache key, model)
+        self._inflight = {}
+        # L1 response cache: key -> (expiry on the monotonic clock, response), LRU order
+        self._local_cache: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+        # DEBUG serves every request fresh: no response-cache lookup at all
+        self._bypass_cache = bool(settings.DEBUG)
 
     @tracer.start_as_current_span("orchestrator_call_llm")
     @retry(
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        stop=stop_after_attempt(3),
-        retry=retry_if_exception_type(Exception),
+        wait=LLM_RETRY_WAIT,
+        stop=LLM_RETRY_STOP,
+        retry=retry_if_exception_type(RETRYABLE_ERRORS),
+        before_sleep=rate_limit_gate.before_sleep,
     )
     async def _call_llm(self, messages: list, llm=None):
         """Wrapper for LLM calls with retry logic."""
         if llm is None:
             llm = self.llm
+        model_name = llm.model_name
         span = trace.get_current_span()
-        span.set_attribute("llm.model", llm.model_name)
+        span.set_attribute("llm.model", model_name)
         
-        start_time = time.time()
+        await rate_limit_gate.wait_if_cooling()
+        start_time = time.perf_counter()
         response = await llm.ainvoke(messages)
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
 
         # Record Latency
-        metrics.LLM_REQUEST_DURATION.labels(model=llm.model_name).observe(duration)
+        llm_metrics = metrics.llm_metrics(model_name)
+        llm_metrics.duration.observe(duration)
 
         # Record Tokens
         if response.response_metadata and "token_usage" in response.response_metadata:
             usage = response.response_metadata["token_usage"]
-            metrics.LLM_TOKEN_USAGE.labels(
-                model=llm.model_name, type="prompt"
-            ).inc(usage.get("prompt_tokens", 0))
-            metrics.LLM_TOKEN_USAGE.labels(
-                model=llm.model_name, type="completion"
-            ).inc(usage.get("completion_tokens", 0))
+            llm_metrics.prompt_tokens.inc(usage.get("prompt_tokens", 0))
+            llm_metrics.completion_tokens.inc(usage.get("completion_tokens", 0))
 
         return response
 
@@ -99,8 +211,8 @@ class AdminOrchestrator:
     ) -> str:
         """Translate & format a guardrail rejection message into the user's language."""
         final_reason = reason
-        lang_key = effective_lang[:2].lower()
-        if lang_key not in ["en"]:
+        lang_key = self._lang_key(effective_lang)
+        if lang_key != "en":
             try:
                 final_reason = await self.translator(
                     text=reason, target_language=effective_lang
@@ -108,25 +220,265 @@ class AdminOrchestrator:
             except Exception:
                 pass
 
-        rejection_templates = {
-            "fr": "Désolé, je ne peux pas traiter cette demande. Raison : {reason}",
-            "en": "Sorry, I cannot process this request. Reason: {reason}",
-            "vi": "Xin lỗi, tôi không thể hỗ trợ yêu cầu này. Lý do: {reason}",
-        }
-        target_key = self.lang_map.get(lang_key, "French")[:2].lower()
-        return rejection_templates.get(
-            target_key, rejection_templates["fr"]
-        ).format(reason=final_reason)
+        return self._pick_message(REJECTION_TEMPLATES, effective_lang, reason=final_reason)
+
+    @staticmethod
+    def _fast_lane_system_prompt(topic_fragment: str) -> str:
+        """
+        Persona and global rules first: that prefix is byte-identical across
+        requests, so the provider's prompt cache can reuse it; only the topic
+        fragment (topic rules, missing profile variables) varies.
+        """
+        prefix = _fast_lane_prompt_prefix()
+        return f"{prefix}\n\n{topic_fragment}" if topic_fragment else prefix
+
+    @staticmethod
+    def _format_context(context: list, token_budget: Optional[int] = None) -> str:
+        """
+        One "Source <source>: <content>" line per retrieved document, in
+        retrieval order, keeping only the documents that fit `token_budget`
+        (FAST_LANE_CONTEXT_TOKEN_BUDGET). Each content is first cut to
+        MAX_DOC_CHARS; the first document is truncated if it alone still
+        exceeds the budget.
+        """
+        if not context:
+            return NO_CONTEXT_TEXT
+        budget = token_budget or settings.FAST_LANE_CONTEXT_TOKEN_BUDGET
+        candidates = [f"Source {d['source']}: {d['content'][:MAX_DOC_CHARS]}" for d in context]
+        # A token never covers less than one UTF-8 byte (nor less than one
+        # character in the chars/4 estimate): a context whose byte size fits
+        # the budget needs no tokenization at all.
+        if sum(len(line.encode("utf-8")) for line in candidates) <= budget:
+            return "\n".join(candidates)
+        lines = []
+        used = 0
+        for line in candidates:
+            tokens = count_tokens(line)
+            if used + tokens > budget:
+                if not lines:
+                    lines.append(truncate_to_tokens(line, budget))
+                break
+            lines.append(line)
+            used += tokens
+        return "\n".join(lines)
+
+    @staticmethod
+    def _lang_key(language: str) -> str:
+        """Message-table key ("fr", "en", "vi") of a response language; French by default."""
+        key = _LANG_KEYS.get(language)
+        return key if key is not None else _LANG_KEYS.get(language.lower(), "fr")
+
+    @classmethod
+    def _pick_message(cls, table, language: str, **fmt) -> str:
+        """Entry of a localized message table for `language`, formatted with `fmt` if given."""
+        message = table[cls._lang_key(language)]
+        return message.format(**fmt) if fmt else message
+
+    async def _reject(self, state, session_id: str, query: str, reason: str, effective_lang: str) -> str:
+        """Records a topic rejection in the session and returns the user-facing message."""
+        metrics.GUARDRAIL_REJECTIONS.labels(reason=reason).inc()
+        state.messages.append(HumanMessage(content=query))
+        state.messages.append(AIMessage(content=f"Rejected: {reason}"))
+        self._in_background(self.memory.save_agent_state(session_id, state))
+        return await self._build_rejection_response(reason, effective_lang)
+
+    async def _fused_fast_lane(self, messages: list, llm) -> Optional[FusedFastLaneAnswer]:
+        """
+        Topic check, answer and grounding self-check in a single JSON-mode call.
+        Returns None if the call or its JSON fails: the caller then runs the
+        separate guardrails.
+        """
+        try:
+            response = await self._call_llm(
+                messages + [SystemMessage(content=FUSED_FAST_LANE_INSTRUCTION)],
+                llm.bind(response_format={"type": "json_object"}),
+            )
+            return FusedFastLaneAnswer.model_validate_json(response.content)
+        except ValidationError as e:
+            logger.error(f"Fused fast lane returned invalid JSON: {e}. Falling back to separate guardrails.")
+        except Exception as e:
+            logger.error(f"Fused fast lane call failed: {e}. Falling back to separate guardrails.")
+        return None
+
+    @staticmethod
+    def _needs_translation(answer: str, lang: str) -> bool:
+        """
+        False when `answer` is already in `lang`: French answers for French
+        users, and answers the agents or localized fallbacks already wrote in
+        the user's language (LanguageResolver.detect_text_language).
+        """
+        return lang != "French" and language_resolver.detect_text_language(answer) != lang
+
+    def _hallucination_fallback(self, effective_lang: str) -> str:
+        logger.warning("Hallucination detected, using fallback response.")
+        return self._pick_message(HALLUCINATION_FALLBACK_MESSAGES, effective_lang)
 
     async def _to_french_retrieval_query(self, query: str, lang: str) -> str:
-        """Translate a query to French for Qdrant RAG. No-op if already French."""
-        if lang == "French":
+        """
+        Translate a query to French for Qdrant RAG. No-op if already French:
+        the conversation language, or the query's own text (a French question
+        typed with an English/Vietnamese UI selection).
+        """
+        if lang == "French" or language_resolver.detect_text_language(query) == "French":
             return query
         return await self.translator(
             text=f"Translate strictly to French administrative terms: {query}",
             target_language="French",
         )
 
+    async def _fast_lane_context(self, rewritten_query: str, lang: str, user_profile) -> list:
+        """Fast-lane retrieval: French retrieval query, then vector search."""
+        retrieval_query = await self._to_french_retrieval_query(rewritten_query, lang)
+        return await self.retriever(query=retrieval_query, user_profile=user_profile)
+
+    def _start_lane_preparation(self, is_slow_lane: bool, rewritten_query: str, lang: str, user_profile) -> asyncio.Task:
+        """
+        Starts the work the chosen lane needs before answering and that does
+        not depend on the topic guardrail's verdict, so that both overlap:
+        the French retrieval query (slow lane) or the retrieved context (fast lane).
+        Only the rewritten query is translated: the raw one is never sent to retrieval.
+        """
+        if is_slow_lane:
+            return asyncio.create_task(self._to_french_retrieval_query(rewritten_query, lang))
+        return asyncio.create_task(self._fast_lane_context(rewritten_query, lang, user_profile))
+
+    def _start_topic_check(self, query: str, chat_history: list, state, fused_possible: bool) -> Optional[asyncio.Task]:
+        """
+        Starts the topic guardrail alongside the query pipeline: it only needs
+        the raw query and history. Not started for a short answer to a
+        clarification (always a continuation), nor when the fused fast lane
+        may fold it into the answer call.
+        """
+        if fused_possible or (state.current_step == "CLARIFICATION" and len(query.split()) <= 5):
+            return None
+        return asyncio.create_task(guardrail_manager.validate_topic(query, history=chat_history))
+
+    async def _check_topic(
+        self, query: str, chat_history: list, prep_task: asyncio.Task, topic_task: Optional[asyncio.Task] = None
+    ):
+        """
+        Topic guardrail (awaiting `topic_task` if it was started early);
+        cancels the lane preparation if it fails or rejects.
+        """
+        try:
+            if topic_task is not None:
+                is_valid, reason = await topic_task
+            else:
+                is_valid, reason = await guardrail_manager.validate_topic(query, history=chat_history)
+        except BaseException:
+            self._discard(prep_task)
+            raise
+        if not is_valid:
+            self._discard(prep_task)
+        return is_valid, reason
+
+    async def _resolve_fast_lane_context(self, prep_task: asyncio.Task, topic_route: str):
+        """
+        (documents, formatted context) for the fast lane. Queries the topic
+        guardrail routed as personal skip retrieval: whatever is still running
+        of it is cancelled.
+        """
+        if topic_route == TOPIC_ROUTE_PERSONAL:
+            self._discard(prep_task)
+            return [], NO_RETRIEVAL_TEXT
+        context = await prep_task
+        return context, self._format_context(context)
+
+    def _in_background(self, coro) -> asyncio.Task:
+        """
+        Runs a side-effect write (response cache, session state) without making
+        the user wait for its Redis round trip. Both writes log their own errors.
+        """
+        task = asyncio.create_task(coro)
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+        return task
+
+    async def _get_cached_response(self, cache_key: str) -> Optional[str]:
+        """Cached response, or None on a miss, a Redis error, or when DEBUG bypasses the cache."""
+        if self._bypass_cache:
+            return None
+        local = self._get_local(cache_key)
+        if local is not None:
+            return local
+        try:
+            # GETEX: a hit also refreshes its TTL, in the same round trip
+            cached = await self.cache.getex(cache_key, ex=RESPONSE_CACHE_TTL)
+        except Exception as e:
+            logger.error(f"Redis cache error: {e}")
+            return None
+        if not cached:
+            return None
+        response = self._decode_response(cached)
+        self._put_local(cache_key, response)
+        return response
+
+    @staticmethod
+    def _encode_response(response: str):
+        """Value stored in Redis: the text, or its compressed bytes past COMPRESS_MIN_BYTES."""
+        raw = response.encode("utf-8")
+        if len(raw) <= COMPRESS_MIN_BYTES:
+            return response
+        return COMPRESSED_PREFIX + zlib.compress(raw)
+
+    @staticmethod
+    def _decode_response(cached: bytes) -> str:
+        if cached.startswith(COMPRESSED_PREFIX):
+            cached = zlib.decompress(cached[len(COMPRESSED_PREFIX):])
+        return cached.decode("utf-8")
+
+    def _get_local(self, cache_key: str) -> Optional[str]:
+        entry = self._local_cache.get(cache_key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._local_cache[cache_key]
+            return None
+        self._local_cache.move_to_end(cache_key)
+        return entry[1]
+
+    def _put_local(self, cache_key: str, response: str):
+        if LOCAL_CACHE_MAX_ENTRIES <= 0:
+            return
+        self._local_cache[cache_key] = (time.monotonic() + RESPONSE_CACHE_TTL, response)
+        self._local_cache.move_to_end(cache_key)
+        while len(self._local_cache) > LOCAL_CACHE_MAX_ENTRIES:
+            self._local_cache.popitem(last=False)
+
+    def _cache_response(self, cache_key: str, response: str) -> Optional[asyncio.Task]:
+        """
+        Schedules the response-cache write in the background. When Redis is
+        slow or down, writes pile up: past RESPONSE_CACHE_MAX_PENDING_WRITES
+        in flight the write is skipped (and counted), since a missing entry
+        only costs a later cache miss. The in-process copy is always stored.
+        """
+        self._put_local(cache_key, response)
+        if _CACHE_WRITE_SLOTS.locked():
+            metrics.CACHE_WRITES_SKIPPED.inc()
+            return None
+        return self._in_background(self._safe_setex(cache_key, response))
+
+    async def _safe_setex(self, cache_key: str, response: str):
+        async with _CACHE_WRITE_SLOTS:
+            try:
+                await self.cache.setex(cache_key, RESPONSE_CACHE_TTL, self._encode_response(response))
+            except Exception as e:
+                logger.error(f"Failed to set cache: {e}")
+
+    @staticmethod
+    def _discard(task: asyncio.Task):
+        task.cancel()
+        # Retrieve a failure that happened before the cancel, so it is not reported as unhandled
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    @staticmethod
+    def _cache_key(query: str, lang: str, session_id: str) -> str:
+        """
+        Response-cache key: 128-bit BLAKE2b of the NUL-delimited parts
+        (see src/utils/hashing.py).
+        """
+        return f"agent_res:{key_digest(query, lang, session_id)}"
+
     def _log_audit(
         self,
         session_id: str,
@@ -163,54 +515,91 @@ class AdminOrchestrator:
         """
         Main orchestration logic with Guardrails, Caching, and Query Translation.
         Uses AgentState for structured context management.
+        Bounded by QUERY_TIMEOUT_SECONDS: past it, a localized timeout message is returned.
+        Identical concurrent requests (same response-cache key and model) share
+        one execution instead of each missing the cache and calling the LLMs.
         """
+        key = (self._cache_key(query, user_lang or "fr", session_id), model_override)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._bounded_query(query, user_lang, session_id, model_override))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _bounded_query(self, query: str, user_lang: str, session_id: str, model_override: str):
+        try:
+            return await asyncio.wait_for(
+                self._handle_query_impl(query, user_lang, session_id, model_override),
+                timeout=QUERY_TIMEOUT_SECONDS,
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"Query timed out after {QUERY_TIMEOUT_SECONDS}s: {query}")
+            return self._pick_message(TIMEOUT_MESSAGES, user_lang or "fr")
+
+    async def _run_pipeline(self, pipeline, query: str, chat_history: list, state, model_override: str):
+        """QueryPipeline.run bounded by PIPELINE_TIMEOUT_SECONDS; the raw query is used past it."""
+        try:
+            return await asyncio.wait_for(
+                pipeline.run(
+                    query=query,
+                    chat_history=chat_history,
+                    current_goal=state.core_goal,
+                    user_profile_dict=state.user_profile.model_dump(exclude_none=True),
+                    model_override=model_override,
+                ),
+                timeout=PIPELINE_TIMEOUT_SECONDS,
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"QueryPipeline timed out after {PIPELINE_TIMEOUT_SECONDS}s, using the raw query.")
+            return PipelineResult(rewritten_query=query, intent="UNKNOWN", new_core_goal=state.core_goal)
+
+    async def _handle_query_impl(
+        self, query: str, user_lang: str, session_id: str, model_override: str
+    ):
         span = trace.get_current_span()
         span.set_attribute("query", query)
         span.set_attribute("session", session_id)
 
         # 0: Injection Guard
-        from src.shared.injection_guard import injection_guard
         is_safe, reason = injection_guard.validate_query(query)
         if not is_safe:
             metrics.GUARDRAIL_REJECTIONS.labels(reason="Prompt Injection").inc()
             logger.warning(f"Injection blocked for session {session_id}")
             return f"Demande bloquée : {reason}"
 
-        # LOAD STATE (Structured State Management)
-        state = await self.memory.load_agent_state(session_id)
-        chat_history = state.messages
-
-        # PREVIOUS STATE LANGUAGE (Fallback)
-        previous_lang = state.user_profile.language
-
         # Cache Key — use user_lang as stable lookup key (detection happens after)
-        lookup_lang = user_lang or previous_lang or "fr"
-        cache_key = f"agent_res:{hashlib.md5((query + lookup_lang + session_id).encode()).hexdigest()}"
+        cache_key = self._cache_key(query, user_lang or "fr", session_id)
 
-        # Bypass cache if DEBUG=True
-        if not settings.DEBUG:
-            try:
-                cached_res = await self.cache.get(cache_key)
-                if cached_res:
-                    logger.info(f"Cache hit for query: {query}")
-                    return cached_res
-            except Exception as e:
-                logger.error(f"Redis cache error: {e}")
+        # Cache lookup and state load (Structured State Management) are
+        # independent round trips: issue both at once
+        cached_res, state = await asyncio.gather(
+            self._get_cached_response(cache_key),
+            self.memory.load_agent_state(session_id),
+        )
+        if cached_res:
+            logger.info("Cache hit for query: %s", query)
+            return cached_res
+        recent_history = state.messages[-PROMPT_HISTORY_MESSAGES:]
+
+        # Topic guardrail runs alongside the pipeline
+        topic_task = self._start_topic_check(
+            query, recent_history, state, fused_possible=settings.FUSED_FAST_LANE_ENABLED
+        )
 
         # STEP 1: Preprocess (goal + rewrite + intent + profile) via QueryPipeline
         pipeline = get_query_pipeline()
-        pr = await pipeline.run(
-            query=query,
-            chat_history=chat_history,
-            current_goal=state.core_goal,
-            user_profile_dict=state.user_profile.model_dump(exclude_none=True),
-            model_override=model_override,
-        )
+        try:
+            pr = await self._run_pipeline(pipeline, query, recent_history, state, model_override)
+        except BaseException:
+            if topic_task is not None:
+                self._discard(topic_task)
+            raise
 
         # Update state from pipeline results
         if pr.new_core_goal and pr.new_core_goal != state.core_goal:
             state.core_goal = pr.new_core_goal
-            logger.info(f"Core Goal set/updated: {state.core_goal}")
+            logger.info("Core Goal set/updated: %s", state.core_goal)
 
         rewritten_query = pr.rewritten_query
         intent = pr.intent
@@ -224,14 +613,14 @@ class AdminOrchestrator:
 
         state.metadata["current_query"] = rewritten_query
         state.intent = intent
-        logger.info(f"Original: {query} | Rewritten: {rewritten_query}")
-        logger.info(f"Query Intent Classified: {intent}")
+        logger.info("Original: %s | Rewritten: %s", query, rewritten_query)
+        logger.info("Query Intent Classified: %s", intent)
         metrics.TOPIC_DETECTION.labels(topic=intent.name if hasattr(intent, 'name') else str(intent)).inc()
 
         # STEP 2: Apply profile + resolve language via LanguageResolver
         if pr.extracted_data:
-            logger.info(f"Extracted Profile Data: {pr.extracted_data}")
-            has_history = len(chat_history) > 0
+            logger.info("Extracted Profile Data: %s", pr.extracted_data)
+            has_history = len(recent_history) > 0
             updated = language_resolver.apply_to_state(
                 extracted_data=pr.extracted_data,
                 user_lang=user_lang,
@@ -239,38 +628,45 @@ class AdminOrchestrator:
                 has_history=has_history,
             )
             if updated:
-                logger.info(f"Updated User Profile: {state.user_profile}")
+                logger.info("Updated User Profile: %s", state.user_profile)
 
         # Final Language for response
         effective_lang = state.user_profile.language or "French"
-        logger.info(f"Effective Response Language: {effective_lang}")
+        logger.info("Effective Response Language: %s", effective_lang)
+
+        # Language normalization (already handled by extraction logic above)
+        full_lang = effective_lang
+        is_slow_lane = intent in [
+            Intent.COMPLEX_PROCEDURE,
+            Intent.FORM_FILLING,
+            Intent.LEGAL_INQUIRY,
+        ]
+        # Translation (+ fast-lane retrieval) overlaps the topic guardrail below
+        prep_task = self._start_lane_preparation(is_slow_lane, rewritten_query, full_lang, state.user_profile)
+        # Fast lane may fold the topic check into the answer call (see _fused_fast_lane)
+        use_fused = settings.FUSED_FAST_LANE_ENABLED and not is_slow_lane and not is_contextual_continuation
 
         # Guardrail 1: Topic Validation (Context-aware)
         # BYPASS if Contextual Continuation (User answering a question)
+        if (is_contextual_continuation or use_fused) and topic_task is not None:
+            self._discard(topic_task)
         if is_contextual_continuation:
             is_valid = True
             reason = "Contextual Continuation"
+        elif use_fused:
+            is_valid = True
+            reason = ""
         else:
-            is_valid, reason = await guardrail_manager.validate_topic(
-                query, history=chat_history
-            )
+            is_valid, reason = await self._check_topic(query, recent_history, prep_task, topic_task)
 
         if not is_valid:
-            metrics.GUARDRAIL_REJECTIONS.labels(reason=reason).inc()
-            state.messages.append(HumanMessage(content=query))
-            state.messages.append(AIMessage(content=f"Rejected: {reason}"))
-            await self.memory.save_agent_state(session_id, state)
-            return await self._build_rejection_response(reason, effective_lang)
+            return await self._reject(state, session_id, query, reason, effective_lang)
 
-        # Language normalization (already handled by extraction logic above)
-        full_lang = effective_lang
+        # Translation of the answer, when started before the final answer was settled
+        translation_task = None
 
-        if intent in [
-            Intent.COMPLEX_PROCEDURE,
-            Intent.FORM_FILLING,
-            Intent.LEGAL_INQUIRY,
-        ]:
-            logger.info(f"Routing to AgentGraph for intent: {intent}")
+        if is_slow_lane:
+            logger.info("Routing to AgentGraph for intent: %s", intent)
 
             # We need to ensure state has the latest query in messages for the graph to see it?
             # actually our graph nodes read state.messages[-1].content
@@ -286,15 +682,12 @@ class AdminOrchestrator:
             # QueryRewriter preserves the original language by default. 
             # If the user is speaking Vietnamese/English, we MUST translate the rewritten query 
             # into French before RAG search, otherwise the vector DB will return 0 results.
-            retrieval_query_fr = rewritten_query
-            if full_lang != "French":
-                logger.info("Translating rewritten query to French for Slow Lane RAG...")
-                retrieval_query_fr = await self.translator(
-                    text=f"Translate strictly to French administrative terms: {rewritten_query}",
-                    target_language="French",
-                )
+            # (translation started before the topic guardrail, see prep_task)
+            retrieval_query_fr = await prep_task
             state.metadata["retrieval_query_fr"] = retrieval_query_fr
             state.metadata["model"] = model_override
+            # Nothing reaches the user before the node returns, so agents may discard a draft
+            state.metadata["streaming"] = False
 
             # Invoke Graph
             # Graph returns a dict with key "messages" containing the response (AIMessage)
@@ -325,7 +718,7 @@ class AdminOrchestrator:
             # Observability: log retrieved_docs count for monitoring.
             docs_count = len(final_state_dict.get("retrieved_docs", []))
             logger.info(
-                f"AgentGraph response grounded on {docs_count} retrieved docs (guardrail: internal)."
+                "AgentGraph response grounded on %s retrieved docs (guardrail: internal).", docs_count
             )
 
             # Update local state object to match graph result (for consistency if we use object elsewhere)
@@ -335,47 +728,25 @@ class AdminOrchestrator:
                 state.messages[-1].content = internal_answer
 
             # Save state
-            await self.memory.save_agent_state(session_id, state)
+            self._in_background(self.memory.save_agent_state(session_id, state))
 
         else:
             # FAST LANE (Legacy RAG for SIMPLE_QA)
             logger.info("Routing to Fast Lane (Legacy RAG) for intent: SIMPLE_QA")
 
-            # Translate the goal-anchored rewritten query to French for Qdrant retrieval.
-            retrieval_query = await self._to_french_retrieval_query(rewritten_query, full_lang)
-
-            # Step 1: Search for info (RAG)
-            context = await self.retriever(
-                query=retrieval_query, user_profile=state.user_profile
-            )
-            if not context:
-                context_text = (
-                    "No direct information found in specific administrative databases."
-                )
-            else:
-                context_text = "\n".join(
-                    [f"Source {d['source']}: {d['content']}" for d in context]
-                )
+            # Step 1: Search for info (RAG) with the goal-anchored rewritten query,
+            # translated to French for Qdrant (started before the topic guardrail)
+            context, context_text = await self._resolve_fast_lane_context(prep_task, reason)
 
             # Step 2: Formulate answer (inject topic-specific rules from registry)
             detected_topic = topic_registry.detect_topic(query, intent)
             topic_fragment = topic_registry.build_prompt_fragment(
                 detected_topic, state.user_profile.model_dump(), query
             )
-            global_rules = topic_registry.build_global_rules_fragment()
-
-            system_prompt = f"""{topic_registry.persona}
-            
-            {topic_fragment}
-            
-            {global_rules}
-            """
-
-            messages = [SystemMessage(content=system_prompt)]
+            messages = [SystemMessage(content=self._fast_lane_system_prompt(topic_fragment))]
 
             # Add history (last 5 turns to keep context window clean)
-            # We use strict list slicing on the state messages
-            messages.extend(chat_history[-10:])
+            messages.extend(recent_history)
 
             messages.append(
                 HumanMessage(
@@ -384,39 +755,58 @@ class AdminOrchestrator:
             )
 
             llm = get_llm(temperature=0.2, streaming=True, model_override=model_override)
-            french_answer_msg = await self._call_llm(messages, llm)
-            internal_answer = french_answer_msg.content
-
-            # Guardrail 2: Hallucination Check (Query + Context + History aware)
-            # IMPORTANT: Only run if context is real (not the "No direct information" placeholder).
+            # IMPORTANT: Only check grounding if context is real (not the "No direct information" placeholder).
             # An empty/placeholder context causes false rejections — the LLM has nothing to verify against.
-            real_context = context_text and "No direct information" not in context_text
-            if real_context and not await guardrail_manager.check_hallucination(
-                context_text, internal_answer, query=query, history=chat_history
-            ):
-                fallback_messages = {
-                    "fr": "Désolé, je n'ai pas trouvé d'informations suffisamment fiables pour répondre à cette question en toute sécurité.",
-                    "en": "Sorry, I could not find reliable enough information to answer this question safely.",
-                    "vi": "Xin lỗi, tôi không tìm thấy thông tin đủ tin cậy để trả lời câu hỏi này một cách an toàn.",
-                }
-                lang_key = self.lang_map.get(effective_lang.lower(), "French")[
-                    :2
-                ].lower()
-                internal_answer = fallback_messages.get(
-                    lang_key, fallback_messages["fr"]
-                )
-                logger.warning("Hallucination detected, using fallback response.")
+            real_context = bool(context)
+
+            fused = await self._fused_fast_lane(messages, llm) if use_fused else None
+            if fused is not None:
+                if not fused.valid:
+                    return await self._reject(state, session_id, query, fused.reject_reason, effective_lang)
+                internal_answer = fused.answer
+                if real_context and not fused.grounded:
+                    internal_answer = self._hallucination_fallback(effective_lang)
+            else:
+                if use_fused:
+                    # Fused call unusable: run the topic guardrail it replaced
+                    is_valid, reason = await guardrail_manager.validate_topic(query, recent_history)
+                    if not is_valid:
+                        return await self._reject(state, session_id, query, reason, effective_lang)
+
+                french_answer_msg = await self._call_llm(messages, llm)
+                internal_answer = french_answer_msg.content
+
+                # Guardrail 2: Hallucination Check (Query + Context + History aware)
+                if real_context:
+                    # The answer is usually grounded: translate it speculatively while it is checked
+                    if self._needs_translation(internal_answer, full_lang):
+                        translation_task = asyncio.create_task(
+                            self.translator(text=internal_answer, target_language=full_lang)
+                        )
+                    try:
+                        grounded = await guardrail_manager.check_hallucination(
+                            context_text, internal_answer, query=query, history=recent_history
+                        )
+                    except BaseException:
+                        if translation_task is not None:
+                            self._discard(translation_task)
+                        raise
+                    if not grounded:
+                        if translation_task is not None:
+                            self._discard(translation_task)
+                            translation_task = None
+                        internal_answer = self._hallucination_fallback(effective_lang)
 
             # Save the finalized (possibly safe-fallback) answer to state
             state.messages.append(HumanMessage(content=query))
             state.messages.append(AIMessage(content=internal_answer))
-            await self.memory.save_agent_state(session_id, state)
+            self._in_background(self.memory.save_agent_state(session_id, state))
 
         # Step 3: Polyglot Translation
         final_answer = internal_answer
-        if full_lang != "French":
-            # Optimization: If the internal answer seems to already be in the target language (e.g. from AgentGraph),
-            # we might still run translation to ensure formalizing, but agents now handle this.
+        if translation_task is not None:
+            final_answer = await translation_task
+        elif self._needs_translation(internal_answer, full_lang):
             final_answer = await self.translator(
                 text=internal_answer, target_language=full_lang
             )
@@ -424,15 +814,41 @@ class AdminOrchestrator:
         # Guardrail 3: Add Disclaimer
         final_response = guardrail_manager.add_disclaimer(final_answer, effective_lang)
 
-        # Save to cache (TTL 1 hour)
-        try:
-            await self.cache.setex(cache_key, 3600, final_response)
-        except Exception as e:
-            logger.error(f"Failed to set cache: {e}")
+        # Save to cache (off the response path)
+        self._cache_response(cache_key, final_response)
 
         self._log_audit(session_id, query, rewritten_query, intent, effective_lang, len(final_response))
         return final_response
 
+    async def bounded_stream_query(
+        self, query: str, user_lang: str = "fr", session_id: str = "default_session",
+        model_override: str = None
+    ):
+        """
+        stream_query bounded by QUERY_TIMEOUT_SECONDS, like handle_query: past
+        it, the stream is closed and a localized timeout message is yielded.
+        Only the generator's own steps count against the deadline, not the
+        time the consumer takes to send each event.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + QUERY_TIMEOUT_SECONDS
+        events = self.stream_query(query, user_lang, session_id, model_override)
+        try:
+            while True:
+                try:
+                    async with asyncio.timeout_at(deadline):
+                        event = await events.__anext__()
+                except StopAsyncIteration:
+                    return
+                except TimeoutError:
+                    logger.error(f"Stream timed out after {QUERY_TIMEOUT_SECONDS}s: {query}")
+                    yield {"type": "token", "content": self._pick_message(TIMEOUT_MESSAGES, user_lang or "fr")}
+                    yield {"type": "status", "content": "Génération terminée."}
+                    return
+                yield event
+        finally:
+            await events.aclose()
+
     @tracer.start_as_current_span("orchestrator_stream_query")
     async def stream_query(
         self, query: str, user_lang: str = "fr", session_id: str = "default_session",
@@ -449,7 +865,6 @@ class AdminOrchestrator:
         span.set_attribute("session", session_id)
 
         # 0: Injection Guard
-        from src.shared.injection_guard import injection_guard
         is_safe, reason = injection_guard.validate_query(query)
         if not is_safe:
             metrics.GUARDRAIL_REJECTIONS.labels(reason="Prompt Injection").inc()
@@ -459,43 +874,38 @@ class AdminOrchestrator:
             return
 
         # Cache Key — include session_id to prevent cross-session contamination
-        cache_key = f"agent_res:{hashlib.md5((query + user_lang + session_id).encode()).hexdigest()}"
+        cache_key = self._cache_key(query, user_lang or "fr", session_id)
 
-        # 1. Check Cache
-        if not settings.DEBUG:
-            try:
-                cached_res = await self.cache.get(cache_key)
-                if cached_res:
-                    yield {"type": "status", "content": "Récupération depuis le cache..."}
-                    yield {"type": "token", "content": cached_res}
-                    return
-            except Exception:
-                pass
+        # 1. Check Cache + 2. Load State, in parallel
+        cached_res, state = await asyncio.gather(
+            self._get_cached_response(cache_key),
+            self.memory.load_agent_state(session_id),
+        )
+        if cached_res:
+            yield {"type": "status", "content": "Récupération depuis le cache..."}
+            # Chunked like a generated answer; the sleep lets other streams interleave
+            for i in range(0, len(cached_res), CACHED_STREAM_CHUNK_CHARS):
+                yield {"type": "token", "content": cached_res[i : i + CACHED_STREAM_CHUNK_CHARS]}
+                await asyncio.sleep(0)
+            return
 
         yield {"type": "status", "content": "Analyse de la requête..."}
-
-        # 2. Load State
-        state = await self.memory.load_agent_state(session_id)
-        chat_history = state.messages
+        recent_history = state.messages[-PROMPT_HISTORY_MESSAGES:]
         is_contextual_continuation = False
 
-        from src.shared.query_pipeline import get_query_pipeline
-        from src.shared.guardrails import guardrail_manager
-        from src.shared.language_resolver import language_resolver
-        from src.agents.intent_classifier import Intent
-        from src.agents.graph import agent_graph
+        # Topic guardrail runs alongside the pipeline
+        topic_task = self._start_topic_check(query, recent_history, state, fused_possible=False)
 
         pipeline = get_query_pipeline()
-        pr = await pipeline.run(
-            query=query,
-            chat_history=chat_history,
-            current_goal=state.core_goal,
-            user_profile_dict=state.user_profile.model_dump(exclude_none=True),
-            model_override=model_override
-        )
+        try:
+            pr = await self._run_pipeline(pipeline, query, recent_history, state, model_override)
+        except BaseException:
+            if topic_task is not None:
+                self._discard(topic_task)
+            raise
 
         if pr.new_core_goal and pr.new_core_goal != state.core_goal:
-            logger.info(f"Core Goal updated: {pr.new_core_goal}")
+            logger.info("Core Goal updated: %s", pr.new_core_goal)
             state.core_goal = pr.new_core_goal
 
         intent = pr.intent
@@ -511,7 +921,7 @@ class AdminOrchestrator:
 
         # LAYER 2: Apply profile + resolve language
         if pr.extracted_data:
-            has_history = len(chat_history) > 0
+            has_history = len(recent_history) > 0
             language_resolver.apply_to_state(
                 extracted_data=pr.extracted_data,
                 user_lang=user_lang,
@@ -521,73 +931,102 @@ class AdminOrchestrator:
 
         effective_lang = state.user_profile.language or "French"
         full_lang = effective_lang
+        is_slow_lane = intent in [Intent.COMPLEX_PROCEDURE, Intent.FORM_FILLING, Intent.LEGAL_INQUIRY]
+        # Translation (+ fast-lane retrieval) overlaps the topic guardrail below
+        prep_task = self._start_lane_preparation(is_slow_lane, rewritten_query, full_lang, state.user_profile)
 
         # 4. Guardrail 1: Topic Check
         if is_contextual_continuation:
+            if topic_task is not None:
+                self._discard(topic_task)
             is_valid, reason = True, "Contextual Continuation"
         else:
-            is_valid, reason = await guardrail_manager.validate_topic(query, history=chat_history)
+            is_valid, reason = await self._check_topic(query, recent_history, prep_task, topic_task)
 
         if not is_valid:
-            metrics.GUARDRAIL_REJECTIONS.labels(reason=reason).inc()
-            state.messages.append(HumanMessage(content=query))
-            state.messages.append(AIMessage(content=f"Rejected: {reason}"))
-            await self.memory.save_agent_state(session_id, state)
-            resp = await self._build_rejection_response(reason, effective_lang)
+            resp = await self._reject(state, session_id, query, reason, effective_lang)
             yield {"type": "token", "content": resp}
             return
 
         internal_answer = ""
 
         # 5. Routing
-        if intent in [Intent.COMPLEX_PROCEDURE, Intent.FORM_FILLING, Intent.LEGAL_INQUIRY]:
+        if is_slow_lane:
             # SLOW LANE (Agent Graph)
             yield {"type": "status", "content": "Routage vers le système expert..."}
             state.messages.append(HumanMessage(content=query))
             
             # --- POLYGLOT RAG FIX ---
-            retrieval_query_fr = rewritten_query
-            if full_lang != "French":
-                retrieval_query_fr = await self.translator(
-                    text=f"Translate strictly to French administrative terms: {rewritten_query}",
-                    target_language="French",
-                )
+            retrieval_query_fr = await prep_task
             state.metadata["retrieval_query_fr"] = retrieval_query_fr
             state.metadata["model"] = model_override
+            state.metadata["streaming"] = True
 
             # Stream events from Graph filtering for 'final_answer' tagged LLM runs
-            async for event in agent_graph.astream_events(state, version="v2"):
+            node_answer = ""
+            # Tokens are held back while they could still spell the synthesis
+            # INSUFFICIENT_CONTEXT sentinel, which must never reach the user
+            held_back = ""
+            # LLM runs that produced the sentinel; a later run (e.g. an escalated
+            # synthesis) streams normally
+            suppressed_runs = set()
+            # Filtered at the source: only the answer LLM runs (and their
+            # children) and the expert nodes reach this loop
+            async for event in agent_graph.astream_events(
+                state,
+                version="v2",
+                include_tags=[FINAL_ANSWER_TAG],
+                include_names=list(EXPERT_NODES),
+            ):
                 kind = event["event"]
                 tags = event.get("tags", [])
                 
                 # Only stream tokens from the LLM invocation that ultimately generates the answer
-                if kind == "on_chat_model_stream" and "final_answer" in tags:
+                if kind == "on_chat_model_stream" and FINAL_ANSWER_TAG in tags:
                     content = event["data"]["chunk"].content
-                    if content:
-                        internal_answer += content
-                        yield {"type": "token", "content": content}
+                    if not content or event.get("run_id") in suppressed_runs:
+                        continue
+                    if not internal_answer:
+                        held_back += content
+                        if INSUFFICIENT_CONTEXT_SENTINEL in held_back:
+                            # The expert node replaces it with a proper message (node_answer)
+                            suppressed_runs.add(event.get("run_id"))
+                            held_back = ""
+                            continue
+                        if INSUFFICIENT_CONTEXT_SENTINEL.startswith(held_back.lstrip()):
+                            continue
+                        content, held_back = held_back, ""
+                    internal_answer += content
+                    yield {"type": "token", "content": content}
+                # Keep the expert node's return value for answers produced without
+                # a streamed LLM call (semantic cache hits, fixed fallback messages)
+                elif kind == "on_chain_end" and event.get("name") in EXPERT_NODES:
+                    output = event.get("data", {}).get("output")
+                    if isinstance(output, dict) and output.get("messages"):
+                        node_answer = output["messages"][-1].content
+
+            if not internal_answer and node_answer:
+                internal_answer = node_answer
+                yield {"type": "token", "content": node_answer}
+            elif held_back:
+                internal_answer += held_back
+                yield {"type": "token", "content": held_back}
 
             # Update State with final answer
             state.messages.append(AIMessage(content=internal_answer))
-            await self.memory.save_agent_state(session_id, state)
+            self._in_background(self.memory.save_agent_state(session_id, state))
 
         else:
             # FAST LANE (Legacy RAG)
             yield {"type": "status", "content": "Recherche dans la base de données..."}
 
-            retrieval_query = await self._to_french_retrieval_query(rewritten_query, full_lang)
+            context, context_text = await self._resolve_fast_lane_context(prep_task, reason)
 
-            context = await self.retriever(query=retrieval_query, user_profile=state.user_profile)
-            context_text = "\n".join([f"Source {d['source']}: {d['content']}" for d in context]) if context else "No direct information found."
-
-            from src.rules.registry import topic_registry
             detected_topic = topic_registry.detect_topic(query, intent)
             topic_fragment = topic_registry.build_prompt_fragment(detected_topic, state.user_profile.model_dump(), query)
-            global_rules = topic_registry.build_global_rules_fragment()
-
-            system_prompt = f"{topic_registry.persona}\n\n{topic_fragment}\n\n{global_rules}"
+            system_prompt = self._fast_lane_system_prompt(topic_fragment)
             messages = [SystemMessage(content=system_prompt)]
-            messages.extend(chat_history[-10:])
+            messages.extend(recent_history)
             messages.append(
                 HumanMessage(content=f"Context: {context_text}\n\nQuestion in {effective_lang}: {query}")
             )
@@ -603,30 +1042,20 @@ class AdminOrchestrator:
 
             # Guardrail 2: Hallucination Check (skipping logic for brevity, just store it)
             # Check hallucination only if context existed
-            real_context = context_text and "No direct information" not in context_text
+            real_context = bool(context)
             if real_context and not await guardrail_manager.check_hallucination(
-                context_text, internal_answer, query=query, history=chat_history
+                context_text, internal_answer, query=query, history=recent_history
             ):
-                fallback_messages = {
-                    "fr": "Désolé, je n'ai pas trouvé d'informations suffisamment fiables pour répondre...",
-                    "en": "Sorry, I could not find reliable enough information...",
-                    "vi": "Xin lỗi, tôi không tìm thấy thông tin đủ tin cậy...",
-                }
-                lang_key = self.lang_map.get(effective_lang.lower(), "French")[:2].lower()
-                internal_answer = fallback_messages.get(lang_key, fallback_messages["fr"])
+                internal_answer = self._hallucination_fallback(effective_lang)
                 yield {"type": "token", "content": "\n\n[Warning: Answer rejected due to safety guardrails, showing fallback.]\n" + internal_answer}
 
             state.messages.append(HumanMessage(content=query))
             state.messages.append(AIMessage(content=internal_answer))
-            await self.memory.save_agent_state(session_id, state)
+            self._in_background(self.memory.save_agent_state(session_id, state))
 
         # 6. Polyglot & Guardrail 3 Add disclaimer
+        # No re-translation while streaming: it would buffer the whole answer
         final_response = internal_answer
-        if full_lang != "French" and intent not in [Intent.COMPLEX_PROCEDURE, Intent.FORM_FILLING, Intent.LEGAL_INQUIRY]:
-             # We skip full re-translation in streaming to avoid buffering, but if it MUST be translated,
-             # we do it here (which breaks streaming feeling, but users asked in EN/VI mostly get handled natively by LLM)
-             pass 
-
         final_response = guardrail_manager.add_disclaimer(final_response, effective_lang)
         
         # Yield the disclaimer at the end
@@ -636,10 +1065,7 @@ class AdminOrchestrator:
 
         # 7. Cache (Fire and forget)
         if final_response:
-            try:
-                await self.cache.setex(cache_key, 3600, final_response)
-            except Exception as e:
-                logger.error(f"Failed to set cache: {e}")
+            self._cache_response(cache_key, final_response)
 
         self._log_audit(
             session_id, query, rewritten_query, intent, effective_lang,
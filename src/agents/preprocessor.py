@@ -1,5 +1,8 @@
+from typing import Optional
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser, JsonOutputParser
+from pydantic import BaseModel, Field
+from src.agents.intent_classifier import Intent
 from src.agents.state import UserProfile
 from src.utils.llm_factory import get_llm
 from src.utils.logger import logger
@@ -155,28 +158,31 @@ class ProfileExtractor:
             chain = self.prompt | llm | self.parser
             data = await chain.ainvoke({"history": history_str, "query": query})
 
-            # Defensive fix: If detection is 'fr' but query is clearly English keywords, force 'en'
-            if data and data.get("language") == "fr":
-                english_keywords = [
-                    " i am",
-                    "how to",
-                    " i have",
-                    " i live",
-                    "american",
-                    "usa",
-                    "english",
-                ]
-                if any(kw in query.lower() for kw in english_keywords):
-                    logger.info(
-                        f"Corrected 'fr' detection to 'en' for English query: {query}"
-                    )
-                    data["language"] = "en"
-
-            return data
+            return self.correct_language(data, query)
         except Exception as e:
             logger.error(f"Profile extraction failed: {e}")
             return {}
 
+    @staticmethod
+    def correct_language(data: dict, query: str) -> dict:
+        """Defensive fix: If detection is 'fr' but query is clearly English keywords, force 'en'."""
+        if data and data.get("language") == "fr":
+            english_keywords = [
+                " i am",
+                "how to",
+                " i have",
+                " i live",
+                "american",
+                "usa",
+                "english",
+            ]
+            if any(kw in query.lower() for kw in english_keywords):
+                logger.info(
+                    "Corrected 'fr' detection to 'en' for English query: %s", query
+                )
+                data["language"] = "en"
+        return data
+
 
 profile_extractor = ProfileExtractor()
 
@@ -241,3 +247,111 @@ class GoalExtractor:
 
 
 goal_extractor = GoalExtractor()
+
+
+class CombinedPreprocessing(BaseModel):
+    """Output of the single-call preprocessing (see CombinedPreprocessor)."""
+
+    core_goal: Optional[str] = None
+    rewritten_query: str
+    intent: str = Intent.UNKNOWN.value
+    profile: dict = Field(default_factory=dict)
+
+
+class CombinedPreprocessor:
+    """
+    Goal extraction, query rewriting, intent classification and profile
+    extraction in one JSON-mode call (COMBINED_PREPROCESSING_ENABLED), instead
+    of four. The instructions are a fixed system message so that they form a
+    prompt prefix shared by every request; only the human message varies.
+    Returns None on any failure: QueryPipeline then runs the separate steps.
+    """
+
+    SYSTEM_PROMPT = """You are the preprocessing stage of a French Administration Bot.
+From the conversation, produce four things in one JSON object.
+
+1. core_goal: the user's PRIMARY administrative goal, as a concise French task
+   (e.g., "Obtenir un permis de conduire", "Renouveler un titre de séjour").
+   GOAL LOCK: if a CURRENT GOAL is given, keep it unless the user EXPLICITLY says
+   they want something completely different. Personal information (nationality,
+   residency, documents) never changes the goal. null if no goal is clear yet.
+
+2. rewritten_query: the CURRENT QUERY rewritten as a precise, standalone search query.
+   - Anchor it to the core goal.
+   - Replace pronouns with the specific entities from the history.
+   - Enrich it with known profile facts (nationality, residency).
+   - Keep the language of the CURRENT QUERY. DO NOT translate to French.
+   - Do NOT answer the question.
+   - "Yes", "No", "Done", "Ok", "Rồi" answering a previous question: rewrite as a
+     statement of the confirmation + the next logical step.
+   - With no history and no current goal, return the query unchanged.
+
+3. intent: exactly one of
+   SIMPLE_QA (simple factual question: document, cost, location, definition),
+   COMPLEX_PROCEDURE (multi-step process, personal situation, how-to guide),
+   LEGAL_INQUIRY (specific laws, regulations, legal text references),
+   FORM_FILLING (explicit request to help fill out a specific form).
+   Classify the rewritten query.
+
+4. profile: user facts clearly stated or logically implied, as an object with only
+   the fields found among: language (fr, en, vi), name, age, nationality,
+   residency_status, has_legal_residency (boolean), visa_type, duration_of_stay,
+   location, fiscal_residence, income_source.
+   - language is the language of the CURRENT QUERY's syntax. Topic words ("France",
+     "titre de séjour", "Paris") do NOT make a sentence French. If ambiguous, use
+     the history's language.
+   - "living legally" / "en situation régulière" / "sống hợp pháp" / a titre de séjour
+     -> has_legal_residency = true.
+
+Respond ONLY with a JSON object:
+{{"core_goal": "..." or null, "rewritten_query": "...", "intent": "...", "profile": {{...}}}}"""
+
+    def __init__(self):
+        self.prompt = ChatPromptTemplate.from_messages(
+            [
+                ("system", self.SYSTEM_PROMPT),
+                (
+                    "human",
+                    "Current Goal: {current_goal}\n\nUser Profile (known facts): {user_profile}\n\n"
+                    "Conversation History (last 5 turns):\n{history}\n\nCurrent Query: {query}",
+                ),
+            ]
+        )
+
+    async def run(
+        self,
+        query: str,
+        history: list,
+        current_goal: str = None,
+        user_profile: dict = None,
+        model_override: str = None,
+    ) -> Optional[CombinedPreprocessing]:
+        history_str = "\n".join(f"{msg.type}: {msg.content}" for msg in history[-5:])
+        try:
+            llm = get_llm(temperature=0, model_override=model_override)
+            chain = self.prompt | llm.bind(response_format={"type": "json_object"})
+            response = await chain.ainvoke(
+                {
+                    "history": history_str,
+                    "query": query,
+                    "current_goal": current_goal or "None",
+                    "user_profile": str(user_profile) if user_profile else "Unknown",
+                }
+            )
+            result = CombinedPreprocessing.model_validate_json(response.content)
+        except Exception as e:
+            logger.error(f"Combined preprocessing failed: {e}. Falling back to separate steps.")
+            return None
+
+        if not result.core_goal or result.core_goal.lower() in ("null", "none"):
+            result.core_goal = current_goal
+        if not history and not current_goal:
+            result.rewritten_query = query
+        intent = result.intent.strip().upper()
+        result.intent = intent if intent in Intent.__members__ else Intent.UNKNOWN.value
+        profile = {k: v for k, v in result.profile.items() if k in UserProfile.model_fields and v is not None}
+        result.profile = ProfileExtractor.correct_language(profile, query)
+        return result
+
+
+combined_preprocessor = CombinedPreprocessor()
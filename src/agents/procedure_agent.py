@@ -1,73 +1,129 @@
+import asyncio
 from typing import List, Dict
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from tenacity import (
-    retry,
-    wait_exponential,
-    stop_after_attempt,
-    retry_if_exception_type,
-)
+from tenacity import retry, retry_if_exception_type
 from src.agents.state import AgentState
 from src.utils.llm_factory import get_llm
 from skills.legal_retriever.main import retrieve_legal_info
 from src.utils.logger import logger
+from src.utils.rate_limit import (
+    LLM_RETRY_STOP,
+    LLM_RETRY_WAIT,
+    RETRYABLE_ERRORS,
+    rate_limit_gate,
+)
 from src.rules.registry import topic_registry
+from src.shared.context_pruner import MAX_DOC_CHARS
 from src.utils import metrics
 import time
 
+# Prompt templates are compiled once at import, not per request
+STEP_ANALYZER_PROMPT = ChatPromptTemplate.from_template(
+    """You are a French Administrative Procedure Guide.
+    Analyze the conversation to determine the next step.
 
-class ProcedureGuideAgent:
-    def __init__(self):
-        # We no longer instantiate self.llm globally
-        self.registry = topic_registry
+    User Query: {query}
+    Profile: {user_profile}
+    History: {history}
+    Topic: {topic_name} (default step: {default_step})
 
-        # Step Analyzer: Determines the current stage of the procedure
-        # Uses topic registry's default_step instead of hardcoded topic lists.
-        self.step_analyzer_prompt = ChatPromptTemplate.from_template(
-            """You are a French Administrative Procedure Guide.
-            Analyze the conversation to determine the next step.
+    Possible Steps:
+    1. CLARIFICATION: The procedure has CONDITIONAL BRANCHES based on user profile.
+       - Use when key variables are MISSING (see below).
+       - DO NOT use if the profile already has all needed info.
+       - DO NOT use if the query is a direct answer to a previous agent question.
 
-            User Query: {query}
-            Profile: {user_profile}
-            History: {history}
-            Topic: {topic_name} (default step: {default_step})
+    2. RETRIEVAL: Truly fact-based questions with a SINGLE universal answer.
+       - Examples: "How much does a passport cost?", "Can a student work?"
+       - RULES FOR COSTS: "How much is X?" is ALWAYS RETRIEVAL.
 
-            Possible Steps:
-            1. CLARIFICATION: The procedure has CONDITIONAL BRANCHES based on user profile.
-               - Use when key variables are MISSING (see below).
-               - DO NOT use if the profile already has all needed info.
-               - DO NOT use if the query is a direct answer to a previous agent question.
+    3. EXPLANATION: We have the procedure content and profile is complete.
+    4. COMPLETED: Procedure finished.
 
-            2. RETRIEVAL: Truly fact-based questions with a SINGLE universal answer.
-               - Examples: "How much does a passport cost?", "Can a student work?"
-               - RULES FOR COSTS: "How much is X?" is ALWAYS RETRIEVAL.
+    Missing variables for this topic:
+    {missing_variables}
 
-            3. EXPLANATION: We have the procedure content and profile is complete.
-            4. COMPLETED: Procedure finished.
+    CRITICAL RULE: When in doubt, choose CLARIFICATION (unless factual/cost question).
+    Return ONLY the step name."""
+)
 
-            Missing variables for this topic:
-            {missing_variables}
+GROUNDEDNESS_PROMPT = ChatPromptTemplate.from_template(
+    """Evaluate if the provided Context contains sufficient information to answer the User Query for the given User Profile.
 
-            CRITICAL RULE: When in doubt, choose CLARIFICATION (unless factual/cost question).
-            Return ONLY the step name."""
-        )
+    User Query: {query}
+    User Profile: {profile}
+    
+    Context:
+    {context}
+
+    Rules:
+    - Provide ONLY "YES" if the context directly addresses the core administrative task requested.
+    - Provide ONLY "NO" if the context is about a completely different procedure, explicitly excludes the user's profile conditions, or is just irrelevant generic information.
+
+    Evaluation (YES/NO):"""
+)
+
+CLARIFICATION_PROMPT = ChatPromptTemplate.from_template(
+    """{persona}
+    User Query: {query}
+    Context from official documents:
+    {context}
+    User Profile (already known): {profile}
+
+    {topic_rules}
+
+    {global_rules}
+    
+    {fallback_instruction}
+    
+    Respond in {user_language}.
+    """
+)
+
+EXPLANATION_PROMPT = ChatPromptTemplate.from_template(
+    """{persona}
+    User Query: {query}
+    User Location: {user_location}
+    Context from official documents:
+    {context}
+
+    {topic_rules}
+
+    {global_rules}
+    
+    Respond in {user_language}.
+    """
+)
+
+
+class ProcedureGuideAgent:
+    def __init__(self):
+        # We no longer instantiate self.llm globally
+        self.registry = topic_registry
+
+        # Step Analyzer: Determines the current stage of the procedure
+        # Uses topic registry's default_step instead of hardcoded topic lists.
+        self.step_analyzer_prompt = STEP_ANALYZER_PROMPT
 
 
     @retry(
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        stop=stop_after_attempt(3),
-        retry=retry_if_exception_type(Exception),
+        wait=LLM_RETRY_WAIT,
+        stop=LLM_RETRY_STOP,
+        retry=retry_if_exception_type(RETRYABLE_ERRORS),
+        before_sleep=rate_limit_gate.before_sleep,
     )
     async def _run_chain(self, chain, input_data, model_name: str = "unknown"):
         """Wrapper for LCEL chain invocations with retry."""
-        start_time = time.time()
+        await rate_limit_gate.wait_if_cooling()
+        start_time = time.perf_counter()
         result = await chain.ainvoke(input_data)
-        duration = time.time() - start_time
-        metrics.LLM_REQUEST_DURATION.labels(model=model_name).observe(duration)
+        duration = time.perf_counter() - start_time
+        metrics.llm_metrics(model_name).duration.observe(duration)
         return result
 
     async def run(self, query: str, state: AgentState) -> str:
-        logger.info(f"ProcedureGuideAgent started for query: {query}")
+        logger.info("ProcedureGuideAgent started for query: %s", query)
         history_str = "\n".join([f"{m.type}: {m.content}" for m in state.messages[-5:]])
 
         # DEFENSIVE: use getattr for backward compat with any cached state objects
@@ -75,14 +131,12 @@ class ProcedureGuideAgent:
 
         # GOAL LOCK: Use core_goal for retrieval to prevent topic drift.
         retrieval_query = core_goal or query
-        logger.info(f"ProcedureAgent retrieval anchored to: {retrieval_query}")
+        logger.info("ProcedureAgent retrieval anchored to: %s", retrieval_query)
 
         # Detect topic from registry (used by step analyzer and prompt building)
         detected_topic = self.registry.detect_topic(query, getattr(state, "intent", None))
         state.metadata["detected_topic"] = detected_topic
-        logger.info(f"ProcedureAgent detected topic: {detected_topic}")
-
-        import asyncio
+        logger.info("ProcedureAgent detected topic: %s", detected_topic)
 
         step_task = self._determine_step(
             query, state.user_profile.model_dump(), history_str, detected_topic, state=state
@@ -90,7 +144,7 @@ class ProcedureGuideAgent:
         docs_task = retrieve_legal_info(retrieval_query, domain="procedure")
 
         next_step, docs = await asyncio.gather(step_task, docs_task)
-        logger.info(f"Determined next step: {next_step}")
+        logger.info("Determined next step: %s", next_step)
         state.current_step = next_step
         state.retrieved_docs = docs  # Store docs for Hallucination Check
 
@@ -120,24 +174,8 @@ class ProcedureGuideAgent:
         fast_llm = get_llm(temperature=0, model_override=model_override)
 
         context_summary = "\n".join([d["content"][:500] for d in docs[:3]])
-        
-        prompt = ChatPromptTemplate.from_template(
-            """Evaluate if the provided Context contains sufficient information to answer the User Query for the given User Profile.
-
-            User Query: {query}
-            User Profile: {profile}
-            
-            Context:
-            {context}
-
-            Rules:
-            - Provide ONLY "YES" if the context directly addresses the core administrative task requested.
-            - Provide ONLY "NO" if the context is about a completely different procedure, explicitly excludes the user's profile conditions, or is just irrelevant generic information.
 
-            Evaluation (YES/NO):"""
-        )
-        
-        chain = prompt | fast_llm | StrOutputParser()
+        chain = GROUNDEDNESS_PROMPT | fast_llm | StrOutputParser()
         try:
             result = await chain.ainvoke({
                 "query": query,
@@ -199,26 +237,10 @@ class ProcedureGuideAgent:
             Instead, formulate a [DEMANDER] block asking for the exact name of the administrative document they are trying to process, and explain in [EXPLIQUER] that you need more precision to find the right procedure.
             """
 
-        prompt = ChatPromptTemplate.from_template(
-            """{persona}
-            User Query: {query}
-            Context from official documents:
-            {context}
-            User Profile (already known): {profile}
-
-            {topic_rules}
-
-            {global_rules}
-            
-            {fallback_instruction}
-            
-            Respond in {user_language}.
-            """
-        )
         model_override = state.metadata.get("model") if state else None
         llm = get_llm(temperature=0.2, streaming=True, model_override=model_override)
 
-        chain = (prompt | llm | StrOutputParser()).with_config(
+        chain = (CLARIFICATION_PROMPT | llm | StrOutputParser()).with_config(
             {"tags": ["final_answer"]}
         )
         return await self._run_chain(
@@ -242,7 +264,7 @@ class ProcedureGuideAgent:
         if not docs:
             return "Je ne trouve pas de procédure correspondant exactement à votre demande sur service-public.fr."
 
-        context = "\n\n".join([d["content"][:2000] for d in docs])
+        context = "\n\n".join([d["content"][:MAX_DOC_CHARS] for d in docs])
 
         # Get topic-specific rules from registry
         topic_key = state.metadata.get("detected_topic", "daily_life")
@@ -251,24 +273,10 @@ class ProcedureGuideAgent:
         )
         global_rules = self.registry.build_global_rules_fragment()
 
-        prompt = ChatPromptTemplate.from_template(
-            """{persona}
-            User Query: {query}
-            User Location: {user_location}
-            Context from official documents:
-            {context}
-
-            {topic_rules}
-
-            {global_rules}
-            
-            Respond in {user_language}.
-            """
-        )
         model_override = state.metadata.get("model") if state else None
         llm = get_llm(temperature=0.2, streaming=True, model_override=model_override)
 
-        chain = (prompt | llm | StrOutputParser()).with_config(
+        chain = (EXPLANATION_PROMPT | llm | StrOutputParser()).with_config(
             {"tags": ["final_answer"]}
         )
         return await self._run_chain(
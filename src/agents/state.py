@@ -1,5 +1,5 @@
 from typing import List, Optional, Dict, Any, Union
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, PrivateAttr
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 
 
@@ -50,4 +50,8 @@ class AgentState(BaseModel):
         default_factory=list
     )  # Stores docs for Hallucination Check
 
+    # Serialized fields as last loaded from / saved to Redis, so that
+    # MemoryManager.save_agent_state only writes the fields that changed
+    _stored_fields: Dict[str, bytes] = PrivateAttr(default_factory=dict)
+
     model_config = ConfigDict(arbitrary_types_allowed=True)
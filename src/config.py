@@ -23,21 +23,76 @@ class Settings(BaseSettings):
     OPENAI_MODEL: str = "gpt-4o"
     GUARDRAIL_MODEL: str = "gpt-4o-mini"  # Model used for topic validation and hallucination checks
     FAST_LLM_MODEL: str = "gpt-4o-mini"  # Model used for lightweight tasks (query rewriting, intent classification)
+    LEGAL_AGENT_MAX_CONCURRENCY: int = 5  # Concurrent synthesis/fallback LLM calls per process
+    GROUNDEDNESS_MIN_YES_PROB: float = 0.7  # Logprob-based groundedness: minimum P("YES") to synthesize
+    # Groundedness from retrieval cosine: >= HIGH grounded, < LOW not grounded,
+    # in between the LLM judge decides
+    GROUNDEDNESS_COSINE_HIGH: float = 0.6
+    GROUNDEDNESS_COSINE_LOW: float = 0.45
+    # Tiered legal synthesis: FAST_LLM_MODEL drafts, OPENAI_MODEL only redoes
+    # drafts that fail the self-check (sentinel, low confidence, no citation)
+    LEGAL_SYNTHESIS_ESCALATION: bool = True
+    SYNTHESIS_DRAFT_MAX_TOKENS: int = 600
+    SYNTHESIS_ESCALATION_MIN_AVG_LOGPROB: float = -1.2
+    # Fast lane: topic check + answer + grounding self-check in one JSON-mode call
+    # instead of three. Opt-in: self-graded grounding is weaker than the
+    # independent verifier. handle_query only; streaming keeps separate checks.
+    FUSED_FAST_LANE_ENABLED: bool = False
+    # Preprocessing (goal + rewrite + intent + profile) in one JSON-mode call
+    # instead of four. Opt-in: one prompt doing four jobs is less precise than
+    # the dedicated ones. Its intent replaces INTENT_CLASSIFIER_BACKEND's.
+    COMBINED_PREPROCESSING_ENABLED: bool = False
+    LEGAL_QUERY_EXPANSIONS: int = 0  # Paraphrases searched alongside the legal query (0 = off)
+    # Context pruning before legal synthesis (dedupe + MMR + token budget)
+    CONTEXT_PRUNING_ENABLED: bool = True
+    CONTEXT_MMR_K: int = 5
+    CONTEXT_MMR_LAMBDA: float = 0.6
+    CONTEXT_TOKEN_BUDGET: int = 4000
+    FAST_LANE_CONTEXT_TOKEN_BUDGET: int = 2500  # Retrieved context sent to the fast-lane answer call
     LLM_PROVIDER: str = "openai"  # "openai" or "local"
     LOCAL_LLM_URL: str = "http://localhost:8000/v1"
     LOCAL_LLM_MODEL: str = "qwen-7b-french-admin"
 
+    # Intent classification
+    INTENT_CLASSIFIER_BACKEND: str = "llm"  # "llm" or "local" (zero-shot NLI via transformers)
+    INTENT_CLASSIFIER_LOCAL_MODEL: str = "MoritzLaurer/mDeBERTa-v3-base-mnli-xnli"  # Multilingual (fr/en/vi)
+
+
+    # Reranker
+    RERANKER_BACKEND: str = "torch"  # "torch" or "onnx" (int8-quantized via onnxruntime)
+    RERANKER_ONNX_FILE: str = "onnx/model_qint8_avx512.onnx"
 
     # Redis
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
     REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_POOL_SIZE: int = 50  # Max connections of the shared response-cache pool (per process)
+    REDIS_POOL_TIMEOUT: float = 2.0  # Seconds to wait for a free pool connection before erroring
+    RESPONSE_CACHE_MAX_PENDING_WRITES: int = 256  # Background cache writes in flight before new ones are skipped
+    LOCAL_RESPONSE_CACHE_SIZE: int = 1024  # Responses kept in-process in front of Redis (0 = off)
+
+    # Semantic response cache (LegalResearchAgent): serves a previous answer to a
+    # paraphrased question. Opt-in, since hits bypass retrieval entirely.
+    SEMANTIC_CACHE_ENABLED: bool = False
+    SEMANTIC_CACHE_THRESHOLD: float = 0.92  # Minimum cosine similarity for a hit
+    SEMANTIC_CACHE_TTL: int = 86400  # 24h — FAQ-like admin procedures change slowly
+
+    # Cache-Augmented Generation (LegalResearchAgent): answer frequent questions
+    # from a canonical corpus in the system prompt, skipping retrieval.
+    # Build the corpus with scripts/admin/build_cag_corpus.py.
+    CAG_ENABLED: bool = False
+    CAG_CORPUS_PATH: str = "data/cag_corpus.json"
+    CAG_MATCH_THRESHOLD: float = 0.85  # Minimum cosine to a cluster centroid
 
     # Qdrant
     QDRANT_HOST: str = "localhost"
     QDRANT_PORT: int = 6333
     QDRANT_API_KEY: Optional[str] = None
+    # Quantized collections: FP32-rescore top k*oversampling candidates.
+    # 2.0 suits int8 scalar quantization; use ~4.0 for product quantization.
+    QDRANT_RESCORE_OVERSAMPLING: float = 2.0
+    QDRANT_HNSW_EF: int = 64  # HNSW search beam for user-facing retrieval
 
     # Security
     ALLOWED_ORIGINS: str = "*"
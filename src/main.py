@@ -1,8 +1,10 @@
 import os
+import asyncio
 import tempfile
 import uvicorn
 import time
 import openai
+import orjson
 from fastapi import (
     FastAPI,
     UploadFile,
@@ -13,7 +15,7 @@ from fastapi import (
     Depends,
 )
 from fastapi.security import APIKeyHeader
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from slowapi import Limiter, _rate_limit_exceeded_handler
@@ -23,10 +25,19 @@ from src.agents.orchestrator import AdminOrchestrator
 from skills.polyglot_voice.main import speech_to_text, text_to_speech
 from src.config import settings
 from src.utils.logger import logger
-from src.schemas import ChatRequest, ChatResponse, VoiceChatResponse, FeedbackRequest
+from src.schemas import (
+    ChatRequest,
+    ChatResponse,
+    VoiceChatResponse,
+    FeedbackRequest,
+    TranslateRequest,
+)
 from skills.legal_retriever.main import warmup as warmup_retriever
+from skills.admin_translator import translate_admin_text_stream
+from src.shared.language_resolver import LANG_MAP
 from prometheus_fastapi_instrumentator import Instrumentator
 from src.utils import metrics
+from src.utils.llm_factory import aclose_http_async_client
 
 
 @asynccontextmanager
@@ -41,6 +52,12 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down — closing connections...")
     try:
         await orchestrator.cache.aclose()
+        # The client does not own the shared pool: close its connections explicitly
+        await orchestrator.cache.connection_pool.disconnect()
+    except Exception:
+        pass
+    try:
+        await aclose_http_async_client()
     except Exception:
         pass
 
@@ -71,6 +88,14 @@ app.add_middleware(
 
 orchestrator = AdminOrchestrator()
 
+# Server-Sent Events are written as bytes: orjson encodes each event straight
+# to UTF-8, with no intermediate str for StreamingResponse to re-encode.
+SSE_DONE = b"data: [DONE]\n\n"
+
+
+def _sse_event(event: dict) -> bytes:
+    return b"data: " + orjson.dumps(event) + b"\n\n"
+
 
 # Global Exception Handler
 
@@ -120,11 +145,11 @@ async def get_api_key(
 
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    start_time = time.time()
+    start_time = time.perf_counter()
     response = await call_next(request)
-    process_time = time.time() - start_time
+    process_time = time.perf_counter() - start_time
     logger.info(
-        f"{request.method} {request.url.path} - {response.status_code} - {process_time:.2f}s"
+        "%s %s - %s - %.2fs", request.method, request.url.path, response.status_code, process_time
     )
     return response
 
@@ -132,14 +157,13 @@ async def log_requests(request: Request, call_next):
 @app.get("/health")
 async def health_check():
     """Deep health check — verifies Redis and Qdrant connectivity."""
-    import redis
     from qdrant_client import QdrantClient
 
-    # Check Redis
+    # Check Redis — through the shared async pool: no new connection per probe,
+    # and no blocking ping on the event loop
     redis_ok = False
     try:
-        r = redis.from_url(settings.REDIS_URL)
-        redis_ok = r.ping()
+        redis_ok = bool(await orchestrator.cache.ping())
     except Exception:
         pass
 
@@ -180,30 +204,23 @@ async def read_root():
 async def chat(request: Request, chat_request: ChatRequest):
     """
     Standard text chat endpoint.
+    Clients sending `Accept: text/event-stream` get the /chat/stream response
+    instead: tokens arrive as they are generated rather than after the full
+    answer. That path is bounded by the same QUERY_TIMEOUT_SECONDS, but it
+    does not share executions between identical requests, and it streams the
+    answer as generated (in the user's language) with no final re-translation.
     """
-    import asyncio
-
+    if "text/event-stream" in request.headers.get("accept", ""):
+        return _chat_event_stream(chat_request)
     logger.info(
-        f"Received chat request: {chat_request.query} [{chat_request.language}]"
+        "Received chat request: %s [%s]", chat_request.query, chat_request.language
     )
     try:
-        answer = await asyncio.wait_for(
-            orchestrator.handle_query(
-                chat_request.query, chat_request.language, chat_request.session_id
-            ),
-            timeout=60.0,  # 60s max — prevents 'Failed to fetch' on complex queries
+        # handle_query bounds itself (QUERY_TIMEOUT_SECONDS) and answers a timeout gracefully
+        answer = await orchestrator.handle_query(
+            chat_request.query, chat_request.language, chat_request.session_id
         )
         return ChatResponse(answer=answer)
-    except asyncio.TimeoutError:
-        logger.error(f"Query timed out after 60s: {chat_request.query}")
-        timeout_messages = {
-            "fr": "Désolé, la requête a pris trop de temps. Veuillez réessayer avec une question plus courte.",
-            "en": "Sorry, the request timed out. Please try again with a shorter question.",
-            "vi": "Xin lỗi, yêu cầu mất quá nhiều thời gian. Vui lòng thử lại với câu hỏi ngắn hơn.",
-        }
-        lang_key = chat_request.language.lower()[:2]
-        msg = timeout_messages.get(lang_key, timeout_messages["fr"])
-        return ChatResponse(answer=msg)
     except Exception as e:
         logger.error(f"Error in chat endpoint: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -219,27 +236,51 @@ async def chat_stream(
     Streaming endpoint using Server-Sent Events (SSE).
     Yields JSON events: {"type": "token"|"status"|"error", "content": "..."}
     """
+    return _chat_event_stream(chat_request)
+
+
+def _chat_event_stream(chat_request: ChatRequest) -> StreamingResponse:
+    """SSE response of orchestrator.bounded_stream_query, shared by /chat/stream and /chat."""
     query = chat_request.query
     language = chat_request.language
     session_id = chat_request.session_id
     model = chat_request.model
     
-    logger.info(f"Received stream request: {query} [{language}] model={model}")
+    logger.info("Received stream request: %s [%s] model=%s", query, language, model)
 
     async def event_generator():
         try:
-            async for event in orchestrator.stream_query(query, language, session_id, model):
-                # SSE format: data: <json>\n\n
-                import json
-
-                yield f"data: {json.dumps(event)}\n\n"
+            async for event in orchestrator.bounded_stream_query(query, language, session_id, model):
+                yield _sse_event(event)
         except Exception as e:
             logger.error(f"Stream error: {e}")
-            yield f'data: {{"type": "error", "content": "{str(e)}"}}\n\n'
+            yield _sse_event({"type": "error", "content": str(e)})
         finally:
-            yield "data: [DONE]\n\n"
+            yield SSE_DONE
+
+    return StreamingResponse(event_generator(), media_type="text/event-stream")
+
+
+@app.post("/translate/stream", dependencies=[Depends(get_api_key)])
+@limiter.limit(settings.RATE_LIMIT)
+async def translate_stream(request: Request, translate_request: TranslateRequest):
+    """
+    Streams an administrative translation as Server-Sent Events.
+    Yields JSON events: {"type": "token"|"error", "content": "..."}
+    """
+    target_language = LANG_MAP[translate_request.language]
 
-    from fastapi.responses import StreamingResponse
+    async def event_generator():
+        try:
+            async for chunk in translate_admin_text_stream(
+                translate_request.text, target_language
+            ):
+                yield _sse_event({"type": "token", "content": chunk})
+        except Exception as e:
+            logger.error(f"Translation stream error: {e}")
+            yield _sse_event({"type": "error", "content": str(e)})
+        finally:
+            yield SSE_DONE
 
     return StreamingResponse(event_generator(), media_type="text/event-stream")
 
@@ -257,7 +298,7 @@ async def voice_chat(
     """
     Multimodal endpoint: Speech -> Text -> Agent -> Answer -> Speech.
     """
-    logger.info(f"Received voice chat request [{language}]")
+    logger.info("Received voice chat request [%s]", language)
     temp_path = None
     try:
         # 1. STT — Use secure temp file
@@ -265,14 +306,20 @@ async def voice_chat(
             tmp.write(await audio.read())
             temp_path = tmp.name
 
-        user_text = speech_to_text(audio_path=temp_path, language=language)
-        logger.info(f"Transcribed audio: {user_text}")
+        # Whisper/TTS use the blocking OpenAI client: run them in a worker thread
+        # so the event loop keeps serving other requests meanwhile.
+        user_text = await asyncio.to_thread(
+            speech_to_text, audio_path=temp_path, language=language
+        )
+        logger.info("Transcribed audio: %s", user_text)
 
         # 2. Agent Logic
         answer_text = await orchestrator.handle_query(user_text, language, session_id)
 
         # 3. TTS
-        audio_response_path = text_to_speech(text=answer_text, language=language)
+        audio_response_path = await asyncio.to_thread(
+            text_to_speech, text=answer_text, language=language
+        )
 
         return VoiceChatResponse(
             user_text=user_text, answer_text=answer_text, audio_url=audio_response_path
@@ -295,10 +342,11 @@ async def submit_feedback(feedback: FeedbackRequest):
     metrics.USER_FEEDBACK.labels(score=feedback.score).inc()
 
     logger.info(
-        f"Received feedback: {feedback.score} for session {feedback.session_id}"
+        "Received feedback: %s for session %s", feedback.score, feedback.session_id
     )
     return {"status": "received", "score": feedback.score}
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host=settings.HOST, port=settings.PORT)
+    # loop="auto" picks uvloop when installed (not on Windows)
+    uvicorn.run(app, host=settings.HOST, port=settings.PORT, loop="auto")
@@ -1,10 +1,20 @@
 from langchain_community.chat_message_histories import RedisChatMessageHistory
 from langchain_core.runnables.history import RunnableWithMessageHistory
 from langchain_core.messages import messages_to_dict, messages_from_dict
+import orjson
 import redis.asyncio as redis
-import json
 from src.config import settings
 from src.agents.state import AgentState
+from src.utils.logger import logger
+
+# Messages kept in the stored session state. Prompts only read the last few
+# turns (at most 10 messages), so older ones would only make every save/load
+# of a long session slower and larger.
+MAX_STORED_MESSAGES = 40
+# Session state is a Redis HASH with one orjson-encoded value per AgentState
+# field; states saved before that are single JSON strings under the legacy key.
+STATE_KEY = "session_state:{}"
+LEGACY_STATE_KEY = "agent_state:{}"
 
 
 class MemoryManager:
@@ -12,8 +22,9 @@ class MemoryManager:
         self.redis_url = settings.REDIS_URL
         # Sync client for legacy LangChain compatibility
         self.redis_url_sync = settings.REDIS_URL
-        # Async client for efficient State Management
-        self.redis_client = redis.from_url(self.redis_url, decode_responses=True)
+        # Async client for efficient State Management. Raw bytes: orjson parses
+        # them directly, no intermediate UTF-8 decode to str
+        self.redis_client = redis.from_url(self.redis_url)
 
     def get_session_history(self, session_id: str):
         """
@@ -22,20 +33,50 @@ class MemoryManager:
         """
         return RedisChatMessageHistory(session_id, url=self.redis_url)
 
+    @staticmethod
+    def _serialize_fields(state: AgentState) -> dict:
+        """Field name -> orjson bytes, with only the last MAX_STORED_MESSAGES messages."""
+        state_data = state.model_dump(exclude={"messages"})
+        # Serialize LangChain messages to robust dict format
+        state_data["messages"] = messages_to_dict(state.messages[-MAX_STORED_MESSAGES:])
+        return {
+            field: orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+            for field, value in state_data.items()
+        }
+
+    def _changed_fields(self, state: AgentState):
+        """(all serialized fields, the ones that differ from what is stored)."""
+        fields = self._serialize_fields(state)
+        changed = {
+            field: value
+            for field, value in fields.items()
+            if state._stored_fields.get(field) != value
+        }
+        return fields, changed
+
+    def save_agent_state_pipeline(self, pipe, session_id: str, state: AgentState) -> dict:
+        """
+        Queues the save_agent_state HSET on `pipe`, so it shares a round trip
+        with the caller's other commands. Returns the serialized fields: the
+        caller records them as `state._stored_fields` once the pipeline ran.
+        """
+        fields, changed = self._changed_fields(state)
+        if changed:
+            pipe.hset(STATE_KEY.format(session_id), mapping=changed)
+        return fields
+
     async def save_agent_state(self, session_id: str, state: AgentState):
         """
-        Serializes and saves the full AgentState to Redis.
+        Saves the AgentState fields that changed since it was loaded or last
+        saved (typically messages and intent; rarely the profile) to the
+        session's Redis hash, in a single HSET.
         """
         try:
-            # Convert Pydantic model to dict
-            state_data = state.model_dump()
-
-            # Serialize LangChain messages to robust dict format
-            state_data["messages"] = messages_to_dict(state.messages)
-
-            await self.redis_client.set(f"agent_state:{session_id}", json.dumps(state_data))
+            fields, changed = self._changed_fields(state)
+            if changed:
+                await self.redis_client.hset(STATE_KEY.format(session_id), mapping=changed)
+            state._stored_fields = fields
         except Exception as e:
-            from src.utils.logger import logger
             logger.error(f"Redis save failed for session {session_id}: {str(e)}")
             # Graceful degradation: fail silently so the user still gets their answer
 
@@ -46,22 +87,28 @@ class MemoryManager:
         """
         try:
             # 1. Try to load structured state
-            data = await self.redis_client.get(f"agent_state:{session_id}")
+            stored = await self.redis_client.hgetall(STATE_KEY.format(session_id))
+            if stored:
+                stored = {field.decode(): value for field, value in stored.items()}
+                state_dict = {field: orjson.loads(value) for field, value in stored.items()}
+                state = self._state_from_dict(session_id, state_dict)
+                if state is not None:
+                    state._stored_fields = stored
+                    return state
+                return await self._migrate(session_id, state_dict.get("messages", []))
+
+            # 2. Fallback: single-JSON state saved before the hash layout
+            legacy_key = LEGACY_STATE_KEY.format(session_id)
+            data = await self.redis_client.get(legacy_key)
             if data:
-                state_dict = json.loads(data)
-                # Deserialize messages
-                if "messages" in state_dict:
-                    state_dict["messages"] = messages_from_dict(state_dict["messages"])
-                try:
-                    return AgentState(**state_dict)
-                except Exception:
-                    # Schema migration: state has old fields, create fresh state preserving messages
-                    messages = state_dict.get("messages", [])
-                    new_state = AgentState(session_id=session_id, messages=messages)
-                    await self.save_agent_state(session_id, new_state)
-                    return new_state
-
-            # 2. Fallback: Check for legacy history
+                state_dict = orjson.loads(data)
+                state = self._state_from_dict(session_id, state_dict)
+                if state is None:
+                    return await self._migrate(session_id, state_dict.get("messages", []))
+                await self._migrate_legacy_json(session_id, state, legacy_key)
+                return state
+
+            # 3. Fallback: Check for legacy history
             # Note: accessing .messages on RedisChatMessageHistory is a sync call (blocking)
             # but acceptable for one-time migration.
             legacy_history = self.get_session_history(session_id)
@@ -74,14 +121,41 @@ class MemoryManager:
                 await self.save_agent_state(session_id, new_state)
                 return new_state
 
-            # 3. Return fresh state
+            # 4. Return fresh state
             return AgentState(session_id=session_id)
         except Exception as e:
-            from src.utils.logger import logger
             logger.error(f"Redis load failed for session {session_id}: {str(e)}. Returning fresh state.")
             # Graceful degradation: return fresh state if Redis is unreachable
             return AgentState(session_id=session_id)
 
+    @staticmethod
+    def _state_from_dict(session_id: str, state_dict: dict):
+        """AgentState from stored fields, or None if they no longer match the schema."""
+        # Deserialize messages
+        if "messages" in state_dict:
+            state_dict["messages"] = messages_from_dict(state_dict["messages"])
+        try:
+            return AgentState(**state_dict)
+        except Exception:
+            return None
+
+    async def _migrate_legacy_json(self, session_id: str, state: AgentState, legacy_key: str):
+        """Rewrites a single-JSON state as a hash and drops the old key, in one round trip."""
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                fields = self.save_agent_state_pipeline(pipe, session_id, state)
+                pipe.delete(legacy_key)
+                await pipe.execute()
+            state._stored_fields = fields
+        except Exception as e:
+            logger.error(f"Redis state migration failed for session {session_id}: {str(e)}")
+
+    async def _migrate(self, session_id: str, messages: list) -> AgentState:
+        """Schema migration: state has old fields, create fresh state preserving messages."""
+        new_state = AgentState(session_id=session_id, messages=messages)
+        await self.save_agent_state(session_id, new_state)
+        return new_state
+
     def wrap_with_history(self, chain):
         """
         Wraps a LangChain chain with message history logic.
@@ -11,7 +11,8 @@ Usage:
 
 import os
 import yaml
-from typing import Optional, Dict, List
+from functools import lru_cache
+from typing import Optional, Dict, List, Tuple
 from src.utils.logger import logger
 
 
@@ -101,6 +102,9 @@ class TopicRegistry:
         
         self.global_rules = raw.get("global_rules", {})
         self.persona = raw.get("persona", "")
+        self._global_rules_fragment: Optional[str] = None
+        # Rendered topic fragments by (topic, names of the variables to ask for)
+        self._fragment_cache: Dict[Tuple[str, Tuple[str, ...]], str] = {}
         
         # Build keyword index for fast topic detection
         self._keyword_index: Dict[str, str] = {}
@@ -115,17 +119,9 @@ class TopicRegistry:
         Detects the most likely topic for a query using keyword matching.
         Falls back to 'daily_life' if no match found.
         """
-        query_lower = query.lower()
-        
-        # Count keyword hits per topic
-        scores: Dict[str, int] = {}
-        for kw, topic_key in self._keyword_index.items():
-            if kw in query_lower:
-                scores[topic_key] = scores.get(topic_key, 0) + 1
-        
-        if scores:
-            best_topic = max(scores, key=scores.get)
-            logger.debug(f"TopicDetector: '{query[:50]}...' → {best_topic} (score: {scores[best_topic]})")
+        best_topic = self._keyword_topic(query.lower())
+        if best_topic:
+            logger.debug("TopicDetector: '%s...' → %s", query[:50], best_topic)
             return best_topic
         
         # Fallback: use intent to guess
@@ -139,6 +135,19 @@ class TopicRegistry:
         logger.debug("TopicDetector: no keyword match, defaulting to 'daily_life'")
         return "daily_life"
     
+    # The keyword index is fixed once the registry is loaded, and the same
+    # query is detected several times per request (orchestrator, procedure
+    # agent) and across repeated questions: memoize the scan per query.
+    @lru_cache(maxsize=2048)
+    def _keyword_topic(self, query_lower: str) -> Optional[str]:
+        """Topic with the most keyword hits in `query_lower`, or None."""
+        # Count keyword hits per topic
+        scores: Dict[str, int] = {}
+        for kw, topic_key in self._keyword_index.items():
+            if kw in query_lower:
+                scores[topic_key] = scores.get(topic_key, 0) + 1
+        return max(scores, key=scores.get) if scores else None
+
     def get_rules(self, topic_key: str) -> Optional[TopicRules]:
         """Get rules for a specific topic."""
         return self.topics.get(topic_key)
@@ -147,6 +156,8 @@ class TopicRegistry:
         """
         Builds a focused prompt fragment with ONLY the relevant topic's rules.
         This replaces the massive inline rule blocks in the current prompts.
+        The fragment only depends on the topic and on which variables are
+        still to ask for, so each combination is rendered once.
         """
         rules = self.get_rules(topic_key)
         if not rules:
@@ -158,7 +169,17 @@ class TopicRegistry:
         missing = rules.get_missing_variables(user_profile)
         conditionals = rules.get_applicable_conditionals(query)
         all_vars = missing + conditionals
-        
+
+        # Bounded by the YAML: subsets of each topic's declared variables
+        cache_key = (topic_key, tuple(var["name"] for var in all_vars))
+        fragment = self._fragment_cache.get(cache_key)
+        if fragment is None:
+            fragment = self._render_fragment(rules, all_vars)
+            self._fragment_cache[cache_key] = fragment
+        return fragment
+
+    @staticmethod
+    def _render_fragment(rules: TopicRules, all_vars: List[dict]) -> str:
         fragment = f"""
 TOPIC: {rules.display_name}
 
@@ -170,7 +191,12 @@ VARIABLES YOU MUST ASK FOR (if not already known):
         return fragment.strip()
     
     def build_global_rules_fragment(self) -> str:
-        """Builds the global rules section for any prompt."""
+        """Builds the global rules section for any prompt (static: built once)."""
+        if self._global_rules_fragment is None:
+            self._global_rules_fragment = self._render_global_rules()
+        return self._global_rules_fragment
+
+    def _render_global_rules(self) -> str:
         lines = []
         for category, rules_list in self.global_rules.items():
             lines.append(f"\n{category.upper().replace('_', ' ')}:")
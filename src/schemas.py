@@ -14,6 +14,13 @@ class ChatResponse(BaseModel):
     answer: str = Field(..., description="Agent's response")
 
 
+class TranslateRequest(BaseModel):
+    text: str = Field(..., min_length=1, max_length=4000, description="Text to translate")
+    language: str = Field(
+        ..., pattern="^(fr|en|vi)$", description="Target language code (fr, en, vi)"
+    )
+
+
 class VoiceChatResponse(BaseModel):
     user_text: str
     answer_text: str
@@ -0,0 +1,100 @@
+"""
+CagCorpus — canonical passages for the most frequent legal questions (Cache-Augmented Generation).
+
+PURPOSE:
+    A small set of procedures (titre de séjour, CAF, impôts, CDI/CDD, acte de
+    naissance...) covers most legal questions. For those, LegalResearchAgent
+    can answer from a pre-built corpus placed in the system prompt instead of
+    running embedding search + rerank + groundedness on every request.
+
+DESIGN:
+    The corpus is a JSON file produced offline by
+    `scripts/admin/build_cag_corpus.py` from the audit log:
+
+        {"embedding_model": "BAAI/bge-m3",
+         "clusters": [{"id": "c001", "label": "...", "size": 42,
+                       "centroid": [...],
+                       "passages": [{"source": "...", "title": "...", "content": "..."}]}]}
+
+    A query is routed to the nearest cluster centroid (cosine on the same
+    bge-m3 embedding the retriever uses) if it clears the match threshold.
+
+    The WHOLE corpus goes into one static system prefix, not only the matched
+    cluster's passages: the prefix is then byte-identical for every CAG call,
+    so the provider's automatic prompt caching amortizes it across all users.
+
+    Loading is lazy and cached. A missing or malformed file disables CAG
+    (logged), it never breaks the RAG path.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+from functools import lru_cache
+from typing import Optional, Sequence
+
+import numpy as np
+
+from src.config import settings
+from src.utils.logger import logger
+
+
+class CagCorpus:
+    def __init__(self, clusters: list[dict], threshold: float):
+        self.clusters = clusters
+        self.threshold = threshold
+        centroids = np.asarray([c["centroid"] for c in clusters], dtype=np.float32)
+        norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+        self._centroids = centroids / np.where(norms == 0, 1, norms)
+        self.text = self._format(clusters)
+
+    @classmethod
+    def load(cls, path: str, threshold: float) -> "CagCorpus":
+        with open(path, encoding="utf-8") as f:
+            payload = json.load(f)
+        clusters = [c for c in payload.get("clusters", []) if c.get("passages")]
+        if not clusters:
+            raise ValueError("corpus has no clusters with passages")
+        return cls(clusters, threshold)
+
+    @staticmethod
+    def _format(clusters: list[dict]) -> str:
+        buf = io.StringIO()
+        for cluster in clusters:
+            buf.write(f"\n### {cluster['label']}\n")
+            for p in cluster["passages"]:
+                buf.write(f"Source: {p.get('source', 'Unknown')}\n")
+                buf.write(f"Title: {p.get('title', 'N/A')}\n")
+                buf.write(f"Content: {p.get('content', '')}\n\n")
+        return buf.getvalue()
+
+    def match(self, embedding: Sequence[float]) -> Optional[dict]:
+        """Returns the nearest cluster if its centroid is similar enough, else None."""
+        query = np.asarray(embedding, dtype=np.float32)
+        if query.shape[0] != self._centroids.shape[1]:
+            return None
+        norm = np.linalg.norm(query)
+        if not norm:
+            return None
+        similarities = self._centroids @ (query / norm)
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+        return self.clusters[best]
+
+
+@lru_cache(maxsize=1)
+def get_cag_corpus() -> Optional[CagCorpus]:
+    """Loads the configured corpus once. Returns None if it is unavailable."""
+    try:
+        corpus = CagCorpus.load(settings.CAG_CORPUS_PATH, settings.CAG_MATCH_THRESHOLD)
+    except Exception as e:
+        logger.error(
+            f"CAG corpus unavailable ({settings.CAG_CORPUS_PATH}): {e}. CAG disabled."
+        )
+        return None
+    logger.info(
+        f"Loaded CAG corpus: {len(corpus.clusters)} clusters, {len(corpus.text)} chars"
+    )
+    return corpus
@@ -0,0 +1,213 @@
+"""
+ContextPruner — shrinks retrieved documents to what the synthesis call needs.
+
+PURPOSE:
+    The synthesis prompt is the most expensive LLM call of a legal answer, and
+    its size is driven by the retrieved context. service-public.fr repeats the
+    same procedural text across many pages, so several retrieved passages are
+    often (near-)duplicates that cost tokens without adding information.
+
+DESIGN:
+    1. Exact duplicates are dropped: BLAKE2b of the first 500 normalized
+       characters (NFKC, lower-cased, whitespace collapsed).
+    2. If more than `k` documents remain, Maximal Marginal Relevance picks `k`
+       of them greedily, maximizing
+           λ·sim(q, d_i) − (1 − λ)·max_j sim(d_i, d_j)   (j already selected)
+       on the bge-m3 embeddings. Embeddings go through the shared
+       EmbeddingCache: the query is already cached by the retriever, and
+       popular passages are re-used across requests.
+    3. A total token budget replaces the fixed per-document truncation: each
+       document gets a share proportional to its relevance (query cosine);
+       budget left by short documents is redistributed to the others.
+       Tokens are counted with tiktoken (a langchain-openai dependency); if
+       its encoding cannot be loaded (offline), 4 characters ≈ 1 token.
+
+    Pruning never fails a request: if embedding fails, MMR is skipped and the
+    top-`k` documents in retrieval order are kept.
+"""
+
+import hashlib
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.config import settings
+from src.utils.embedding_cache import embedding_cache
+from src.utils.logger import logger
+
+_HASH_PREFIX_CHARS = 500
+# Passage prefix embedded for MMR (bge-m3 handles it in one window)
+_EMBED_CHARS = 1000
+_CHARS_PER_TOKEN = 4
+# Cap on one document's content in a prompt context, whatever the token
+# budget: one long page cannot crowd out the other retrieved documents
+MAX_DOC_CHARS = 2000
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _content_hash(content: str) -> bytes:
+    normalized = unicodedata.normalize(
+        "NFKC", content[: _HASH_PREFIX_CHARS * 2].lower()
+    )
+    normalized = _WHITESPACE_RE.sub(" ", normalized).strip()[:_HASH_PREFIX_CHARS]
+    # In-process set membership only: raw 128-bit digest, no hex encoding
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).digest()
+
+
+def dedupe_docs(docs: List[Dict]) -> List[Dict]:
+    """Drops documents whose normalized content prefix was already seen (first one wins)."""
+    seen = set()
+    unique = []
+    for doc in docs:
+        key = _content_hash(doc.get("content", ""))
+        if key not in seen:
+            seen.add(key)
+            unique.append(doc)
+    return unique
+
+
+def mmr_select(
+    query_embedding: Sequence[float],
+    doc_embeddings: Sequence[Sequence[float]],
+    k: int,
+    lambda_mult: float,
+) -> List[int]:
+    """Returns the indices of the `k` documents chosen by MMR, in selection order."""
+    docs = np.asarray(doc_embeddings, dtype=np.float32)
+    docs /= np.maximum(np.linalg.norm(docs, axis=1, keepdims=True), 1e-12)
+    query = np.asarray(query_embedding, dtype=np.float32)
+    query /= max(float(np.linalg.norm(query)), 1e-12)
+
+    relevance = docs @ query
+    pairwise = docs @ docs.T
+    selected = [int(np.argmax(relevance))]
+    redundancy = pairwise[selected[0]].copy()
+    while len(selected) < min(k, len(docs)):
+        scores = lambda_mult * relevance - (1 - lambda_mult) * redundancy
+        scores[selected] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        redundancy = np.maximum(redundancy, pairwise[best])
+    return selected
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    try:
+        import tiktoken
+
+        return tiktoken.encoding_for_model(settings.OPENAI_MODEL)
+    except Exception as e:
+        logger.error(
+            f"tiktoken encoding unavailable ({e}); estimating tokens from characters."
+        )
+        return None
+
+
+def count_tokens(text: str) -> int:
+    encoding = _get_encoding()
+    if encoding is None:
+        return -(-len(text) // _CHARS_PER_TOKEN)
+    return len(encoding.encode(text))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    encoding = _get_encoding()
+    if encoding is None:
+        return text[: max_tokens * _CHARS_PER_TOKEN]
+    tokens = encoding.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
+
+
+def allocate_budget(
+    lengths: Sequence[int], weights: Sequence[float], budget: int
+) -> List[int]:
+    """
+    Splits `budget` tokens across documents proportionally to `weights`.
+    A document never gets more than its own length; the surplus goes to the rest.
+    """
+    allocation = [0] * len(lengths)
+    remaining = set(range(len(lengths)))
+    while remaining and budget > 0:
+        total_weight = sum(weights[i] for i in remaining)
+        shares = {
+            i: budget
+            * (weights[i] / total_weight if total_weight > 0 else 1 / len(remaining))
+            for i in remaining
+        }
+        fitting = [i for i in remaining if lengths[i] <= shares[i]]
+        if not fitting:
+            for i in remaining:
+                allocation[i] = int(shares[i])
+            break
+        for i in fitting:
+            allocation[i] = lengths[i]
+            budget -= lengths[i]
+            remaining.discard(i)
+    return allocation
+
+
+async def prune_context(
+    query: str,
+    docs: List[Dict],
+    k: Optional[int] = None,
+    lambda_mult: Optional[float] = None,
+    token_budget: Optional[int] = None,
+) -> List[Dict]:
+    """
+    Dedupes, MMR-selects and budgets `docs`. Returns shallow copies whose
+    "content" fits the token budget; the input documents are not modified.
+    """
+    k = k or settings.CONTEXT_MMR_K
+    lambda_mult = settings.CONTEXT_MMR_LAMBDA if lambda_mult is None else lambda_mult
+    token_budget = token_budget or settings.CONTEXT_TOKEN_BUDGET
+
+    candidates = dedupe_docs(docs)
+    relevance = [doc.get("vector_score") for doc in candidates]
+
+    if len(candidates) > k:
+        try:
+            query_embedding = await embedding_cache.get_or_embed(query)
+            doc_embeddings = await embedding_cache.get_or_embed_many(
+                [doc.get("content", "")[:_EMBED_CHARS] for doc in candidates]
+            )
+            order = mmr_select(query_embedding, doc_embeddings, k, lambda_mult)
+            query_vec = np.asarray(query_embedding, dtype=np.float32)
+            query_vec /= max(float(np.linalg.norm(query_vec)), 1e-12)
+            for i in order:
+                vec = np.asarray(doc_embeddings[i], dtype=np.float32)
+                relevance[i] = float(
+                    vec @ query_vec / max(float(np.linalg.norm(vec)), 1e-12)
+                )
+        except Exception as e:
+            logger.error(f"MMR selection failed: {e}. Keeping the top {k} documents.")
+            order = list(range(k))
+    else:
+        order = list(range(len(candidates)))
+
+    selected = [candidates[i] for i in order]
+    weights = [
+        max(relevance[i], 0.0) if relevance[i] is not None else 1.0 for i in order
+    ]
+    contents = [doc.get("content", "") for doc in selected]
+    allocation = allocate_budget(
+        [count_tokens(c) for c in contents], weights, token_budget
+    )
+
+    pruned = []
+    for doc, content, tokens in zip(selected, contents, allocation):
+        if tokens <= 0:
+            continue
+        pruned.append({**doc, "content": truncate_to_tokens(content, tokens)})
+    logger.debug(
+        "Context pruning: %s docs -> %s (%s tokens max)",
+        len(docs),
+        len(pruned),
+        sum(allocation),
+    )
+    return pruned
@@ -4,12 +4,81 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from src.utils.logger import logger
 from src.config import settings
+from src.utils.llm_factory import get_http_async_client
 
 
 
 from src.utils.tracing import tracer
 from opentelemetry import trace
 
+# validate_topic route of approved queries about the user or the conversation
+# itself: they are answered from history, without retrieval
+TOPIC_ROUTE_PERSONAL = "personal"
+
+# Rule blocks shared by the guardrail prompts below and the orchestrator's
+# fused fast-lane prompt, so both always judge with the same criteria.
+TOPIC_RULES = """RULES:
+            1. If the query is about French procedures, law, public services, identity documents, transport (Navigo, SNCF, RATP, driving licenses, vehicle registration, Crit'Air), civil registry (birth/death/marriage/kết hôn/mariage), or legal records (Casier Judiciaire/Criminal Record), it is APPROVED.
+            2. If the query is about TAXES in France (Impôts, donations, inheritance/succession, IFI, local taxes, tax-free gifts), it is APPROVED.
+            3. If the query is about EDUCATION in France (School registration, Assurance scolaire, student aid, bourses, university admin), it is APPROVED.
+            4. If the query involves FOREIGN DOCUMENTS being used for French procedures (e.g., "Can I use my UK license?", "Is my US diploma valid?"), it is APPROVED.
+            5. If the query is about LABOR rights, strikes, chômage technique, employer disputes, or natural disaster compensation (floods, etc.), it is APPROVED. This includes Vietnamese queries about wages (lương, tiền lương), work contracts (hợp đồng lao động), or working without a contract.
+            6. Housing rights, tenant/landlord disputes, social benefits (CAF, AAH, RSA, Chèque Énergie, Retirement) are APPROVED.
+            7. Embassy/consular procedures, visa applications, and administrative certificates are APPROVED.
+            8. Conversational follow-ups, meta-questions, or personal introductions in an admin context are APPROVED.
+            9. HEALTHCARE and health insurance are ALWAYS APPROVED, including queries in Vietnamese (bảo hiểm y tế, sức khỏe) or English about dual-national/cross-border healthcare coverage.
+            10. UNRELATED topics (cooking, celebrities, general sports, non-French law unrelated to residency) are REJECTED.
+
+            CRITICAL: Your job is ONLY to validate the TOPIC, not to answer the question. 
+            Do NOT say 'REJECTED: It is not possible to do X'. Only say REJECTED if the topic is completely unrelated to French law or administration.
+            When in doubt, respond APPROVED."""
+
+GROUNDING_RULES = """An answer is SAFE if it is supported by:
+            1. The provided CONTEXT (Administrative data).
+            2. The conversation HISTORY.
+            3. The current user QUERY (e.g., names or details the user just introduced).
+            4. Common sense/AI identity (e.g., "I am an AI").
+            5. REASONABLE SYNTHESIS: Paraphrasing procedures, summarizing general requirements, or providing common administrative knowledge NOT explicitly in context (e.g., "you must be 18 to vote", "3-5 years residency for 10-year card") is SAFE.
+            6. CLARIFYING QUESTIONS: Responses that ask for missing information are always SAFE.
+
+            An answer is a HALLUCINATION ONLY if it:
+            - Invents specific data (EXACT prices like "55.23€", precise office addresses, exact quotas) NOT in context.
+            - Directly contradicts the context provided.
+            - Gives dangerous or incorrect legal advice that could lead to immediate rejection (e.g., "you don't need a visa" for a non-EU citizen).
+
+            When in doubt, respond SAFE. This is a helpful assistant, not a strict legal validator."""
+
+
+# Static prompt texts: identical bytes on every call, built into chains once
+TOPIC_SYSTEM_PROMPT = """You are a gatekeeper for Marianne AI, a French Administrative Assistant.
+            Your only job is to decide if the query is RELEVANT to French administrative tasks or the current conversation.
+
+""" + TOPIC_RULES + """
+
+            Respond only with 'APPROVED', 'APPROVED: PERSONAL' or 'REJECTED: [Short reason in English]'.
+            Use 'APPROVED: PERSONAL' when the query is only about the user themselves or the conversation so far
+            (greetings, introductions, "what did I tell you?") and needs no administrative documents to answer.
+
+            HISTORY:
+            {history}"""
+
+GROUNDING_SYSTEM_PROMPT = """You are a factual verifier for Marianne AI.
+""" + GROUNDING_RULES + """
+            Respond strictly with 'SAFE' or 'HALLUCINATION'."""
+
+GROUNDING_USER_PROMPT = "CONTEXT:\n{context}\n\nHISTORY:\n{history}\n\nUSER QUERY: {query}\n\nANSWER:\n{answer}"
+
+
+def format_history(history: list = None, turns: int = 6) -> str:
+    """Last `turns` messages as "type: content" lines for the guardrail prompts."""
+    if not history:
+        return "No history available."
+    # Use .type if available, otherwise class name
+    return "\n".join(
+        [f"{getattr(msg, 'type', msg.__class__.__name__)}: {msg.content}" for msg in history[-turns:]]
+    )
+
+
 class GuardrailManager:
     def __init__(self):
         # Always use a robust model for Guardrails to prevent false refusals,
@@ -18,9 +87,12 @@ class GuardrailManager:
         self.llm = ChatOpenAI(
             model=settings.GUARDRAIL_MODEL,
             temperature=0,
-            api_key=settings.OPENAI_API_KEY
+            api_key=settings.OPENAI_API_KEY,
+            http_async_client=get_http_async_client(),
         )
-
+        # Prompt | llm | parser chains, built on first use
+        self._topic_chain = None
+        self._grounding_chain = None
 
     @tracer.start_as_current_span("guardrail_validate_topic")
     async def validate_topic(
@@ -31,56 +103,21 @@ class GuardrailManager:
         """
         Ensures the query is related to French administration or law,
         considering conversation context for follow-up questions.
+        For an approved query, `reason` is its route: "" (administrative,
+        needs retrieval) or TOPIC_ROUTE_PERSONAL (answerable from history).
         """
-        # Format history for the prompt if it exists
-        history_text = "No history available."
-        if history:
-            # Use .type if available, otherwise class name
-            history_text = "\n".join(
-                [
-                    f"{getattr(msg, 'type', msg.__class__.__name__)}: {msg.content}"
-                    for msg in history[-6:]
-                ]
-            )
-
-        prompt = ChatPromptTemplate.from_messages(
-            [
-                (
-                    "system",
-                    """You are a gatekeeper for Marianne AI, a French Administrative Assistant.
-            Your only job is to decide if the query is RELEVANT to French administrative tasks or the current conversation.
-
-            RULES:
-            1. If the query is about French procedures, law, public services, identity documents, transport (Navigo, SNCF, RATP, driving licenses, vehicle registration, Crit'Air), civil registry (birth/death/marriage/kết hôn/mariage), or legal records (Casier Judiciaire/Criminal Record), it is APPROVED.
-            2. If the query is about TAXES in France (Impôts, donations, inheritance/succession, IFI, local taxes, tax-free gifts), it is APPROVED.
-            3. If the query is about EDUCATION in France (School registration, Assurance scolaire, student aid, bourses, university admin), it is APPROVED.
-            4. If the query involves FOREIGN DOCUMENTS being used for French procedures (e.g., "Can I use my UK license?", "Is my US diploma valid?"), it is APPROVED.
-            5. If the query is about LABOR rights, strikes, chômage technique, employer disputes, or natural disaster compensation (floods, etc.), it is APPROVED. This includes Vietnamese queries about wages (lương, tiền lương), work contracts (hợp đồng lao động), or working without a contract.
-            6. Housing rights, tenant/landlord disputes, social benefits (CAF, AAH, RSA, Chèque Énergie, Retirement) are APPROVED.
-            7. Embassy/consular procedures, visa applications, and administrative certificates are APPROVED.
-            8. Conversational follow-ups, meta-questions, or personal introductions in an admin context are APPROVED.
-            9. HEALTHCARE and health insurance are ALWAYS APPROVED, including queries in Vietnamese (bảo hiểm y tế, sức khỏe) or English about dual-national/cross-border healthcare coverage.
-            10. UNRELATED topics (cooking, celebrities, general sports, non-French law unrelated to residency) are REJECTED.
+        history_text = format_history(history)
 
-            CRITICAL: Your job is ONLY to validate the TOPIC, not to answer the question. 
-            Do NOT say 'REJECTED: It is not possible to do X'. Only say REJECTED if the topic is completely unrelated to French law or administration.
-            When in doubt, respond APPROVED.
-
-            Respond only with 'APPROVED' or 'REJECTED: [Short reason in English]'.
-
-            HISTORY:
-            {history}""",
-                ),
-                ("user", "{query}"),
-            ]
-        )
-
-        chain = prompt | self.llm | StrOutputParser()
-        response = await chain.ainvoke({"query": query, "history": history_text})
-        logger.debug(f"Guardrail Response: {response}")
+        if self._topic_chain is None:
+            prompt = ChatPromptTemplate.from_messages(
+                [("system", TOPIC_SYSTEM_PROMPT), ("user", "{query}")]
+            )
+            self._topic_chain = prompt | self.llm | StrOutputParser()
+        response = await self._topic_chain.ainvoke({"query": query, "history": history_text})
+        logger.debug("Guardrail Response: %s", response)
 
         if "APPROVED" in response:
-            return True, ""
+            return True, TOPIC_ROUTE_PERSONAL if "PERSONAL" in response.upper() else ""
         # Extract English reason
         reason = response.replace("REJECTED:", "").strip()
         return False, reason
@@ -94,48 +131,20 @@ class GuardrailManager:
         span.set_attribute("answer_length", len(answer))
         """
         Checks if the answer is grounded in the context, history, or the current query.
+        An empty answer claims nothing and is SAFE without an LLM call.
         """
-        history_text = "No history available."
-        if history:
-            history_text = "\n".join(
-                [
-                    f"{getattr(msg, 'type', msg.__class__.__name__)}: {msg.content}"
-                    for msg in history[-6:]
-                ]
-            )
+        if not answer.strip():
+            return True
+        history_text = format_history(history)
 
-        logger.debug(f"Hallucination Check - Query: {query}")
+        logger.debug("Hallucination Check - Query: %s", query)
 
-        prompt = ChatPromptTemplate.from_messages(
-            [
-                (
-                    "system",
-                    """You are a factual verifier for Marianne AI.
-            An answer is SAFE if it is supported by:
-            1. The provided CONTEXT (Administrative data).
-            2. The conversation HISTORY.
-            3. The current user QUERY (e.g., names or details the user just introduced).
-            4. Common sense/AI identity (e.g., "I am an AI").
-            5. REASONABLE SYNTHESIS: Paraphrasing procedures, summarizing general requirements, or providing common administrative knowledge NOT explicitly in context (e.g., "you must be 18 to vote", "3-5 years residency for 10-year card") is SAFE.
-            6. CLARIFYING QUESTIONS: Responses that ask for missing information are always SAFE.
-
-            An answer is a HALLUCINATION ONLY if it:
-            - Invents specific data (EXACT prices like "55.23€", precise office addresses, exact quotas) NOT in context.
-            - Directly contradicts the context provided.
-            - Gives dangerous or incorrect legal advice that could lead to immediate rejection (e.g., "you don't need a visa" for a non-EU citizen).
-
-            When in doubt, respond SAFE. This is a helpful assistant, not a strict legal validator.
-            Respond strictly with 'SAFE' or 'HALLUCINATION'.""",
-                ),
-                (
-                    "user",
-                    "CONTEXT:\n{context}\n\nHISTORY:\n{history}\n\nUSER QUERY: {query}\n\nANSWER:\n{answer}",
-                ),
-            ]
-        )
-
-        chain = prompt | self.llm | StrOutputParser()
-        response = await chain.ainvoke(
+        if self._grounding_chain is None:
+            prompt = ChatPromptTemplate.from_messages(
+                [("system", GROUNDING_SYSTEM_PROMPT), ("user", GROUNDING_USER_PROMPT)]
+            )
+            self._grounding_chain = prompt | self.llm | StrOutputParser()
+        response = await self._grounding_chain.ainvoke(
             {
                 "context": context,
                 "answer": answer,
@@ -143,7 +152,7 @@ class GuardrailManager:
                 "history": history_text,
             }
         )
-        logger.debug(f"Hallucination Response: {response}")
+        logger.debug("Hallucination Response: %s", response)
 
         return "SAFE" in response
 
@@ -111,6 +111,32 @@ def _rrf_merge(
     return ordered[:top_n]
 
 
+def rrf_fuse(
+    ranked_doc_lists: list[list[dict[str, Any]]],
+    top_n: int | None = None,
+) -> list[dict[str, Any]]:
+    """
+    RRF-merge several ranked lists of documents (e.g. one per query paraphrase).
+
+    Documents are identified by (source, content); the first occurrence is kept.
+    """
+    docs: list[dict[str, Any]] = []
+    index: dict[tuple, int] = {}
+    ranked_lists = []
+    for ranked_docs in ranked_doc_lists:
+        ranked = []
+        for doc in ranked_docs:
+            key = (doc.get("source"), doc.get("content"))
+            if key not in index:
+                index[key] = len(docs)
+                docs.append(doc)
+            ranked.append(index[key])
+        ranked_lists.append(ranked)
+
+    order = _rrf_merge(ranked_lists, len(docs), top_n if top_n is not None else len(docs))
+    return [docs[i] for i in order]
+
+
 # ---------------------------------------------------------------------------
 # HybridRetriever
 # ---------------------------------------------------------------------------
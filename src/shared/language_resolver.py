@@ -15,11 +15,18 @@ DIVERGENCES FIXED:
 DESIGN:
     Pure function with no side effects. Takes inputs, returns resolved language string.
     No LLM calls. No state mutation. Independently unit-testable.
+
+    `detect_text_language` is a cheap heuristic for generated answers (not user
+    queries): Vietnamese-only letters, then French vs English function words.
+    Long texts are judged on their head and their tail, which must agree: an
+    English opening followed by quoted French articles is not "English".
+    It answers None rather than guess, so callers fall back to the LLM path.
 """
 
 from __future__ import annotations
 
 import logging
+import re
 
 logger = logging.getLogger("french_admin_agent")
 
@@ -31,11 +38,28 @@ LANG_MAP: dict[str, str] = {
     "english": "English",
     "vi": "Vietnamese",
     "vietnamese": "Vietnamese",
+    "French": "French",
+    "English": "English",
+    "Vietnamese": "Vietnamese",
 }
 
 # Languages we consider "non-default" (i.e., switching away from French is significant)
 NON_DEFAULT_LANGUAGES = {"English", "Vietnamese"}
 
+# detect_text_language: characters sampled at each end, letters Vietnamese needs none of
+# French/English share (ă đ ơ ư and stacked tone marks), and function words
+DETECTION_SAMPLE_CHARS = 500
+_VIETNAMESE_LETTERS = frozenset(
+    "ăđơưạảấầẩẫậắằẳẵặẹẻẽếềểễệỉịĩọỏốồổỗộớờởỡợụủũứừửữựỳỵỷỹ"
+)
+_FRENCH_WORDS = frozenset(
+    "le la les des du un une et est sont pour vous votre vos dans que qui sur avec pas ne au aux il elle je ce cette à".split()
+)
+_ENGLISH_WORDS = frozenset(
+    "the and is are for you your to of in that with not be this can it on will have".split()
+)
+_WORD_RE = re.compile(r"[a-zà-ÿ']+")
+
 
 class LanguageResolver:
     """
@@ -57,7 +81,40 @@ class LanguageResolver:
 
     def normalize(self, lang_code: str) -> str:
         """Normalize a language code or name to its full English name."""
-        return self.lang_map.get(lang_code.lower(), lang_code)
+        # Exact codes/names (the usual input) skip the lower() copy
+        name = self.lang_map.get(lang_code)
+        return name if name is not None else self.lang_map.get(lang_code.lower(), lang_code)
+
+    def detect_text_language(self, text: str) -> str | None:
+        """
+        Full name of the language `text` is written in, guessed from its first
+        and last DETECTION_SAMPLE_CHARS characters; None when too short,
+        ambiguous, or when the two ends disagree (mixed-language text).
+        """
+        if len(text) <= 2 * DETECTION_SAMPLE_CHARS:
+            return self._detect_sample(text)
+        head = self._detect_sample(text[:DETECTION_SAMPLE_CHARS])
+        if head is None:
+            return None
+        tail = self._detect_sample(text[-DETECTION_SAMPLE_CHARS:])
+        return head if tail == head else None
+
+    @staticmethod
+    def _detect_sample(sample: str) -> str | None:
+        sample = sample.lower()
+        letters = sum(c.isalpha() for c in sample)
+        if letters < 20:
+            return None
+        if sum(c in _VIETNAMESE_LETTERS for c in sample) > 0.05 * letters:
+            return "Vietnamese"
+        words = _WORD_RE.findall(sample)
+        french = sum(w in _FRENCH_WORDS for w in words)
+        english = sum(w in _ENGLISH_WORDS for w in words)
+        if french >= 3 and french >= 2 * english:
+            return "French"
+        if english >= 3 and english >= 2 * french:
+            return "English"
+        return None
 
     def resolve(
         self,
@@ -92,8 +149,9 @@ class LanguageResolver:
         if normalized_user and normalized_user in NON_DEFAULT_LANGUAGES:
             if normalized_detected != normalized_user:
                 logger.info(
-                    f"LanguageResolver: Blocking detection '{normalized_detected}' "
-                    f"— frontend manually chose '{normalized_user}'"
+                    "LanguageResolver: Blocking detection '%s' — frontend manually chose '%s'",
+                    normalized_detected,
+                    normalized_user,
                 )
             # Always honor the frontend choice when it's explicitly non-French
             return normalized_user
@@ -102,10 +160,7 @@ class LanguageResolver:
         # If detected is French but we're already in English/Vietnamese,
         # the detector likely hallucinated due to French admin keywords in the query.
         if detected_lang == "fr" and current in NON_DEFAULT_LANGUAGES:
-            logger.info(
-                f"LanguageResolver: Ignoring 'fr' hallucination — "
-                f"already in '{current}'"
-            )
+            logger.info("LanguageResolver: Ignoring 'fr' hallucination — already in '%s'", current)
             return current
 
         # Rule 3: FIX — previously, the first message in English was incorrectly
@@ -114,19 +169,15 @@ class LanguageResolver:
         if normalized_detected in NON_DEFAULT_LANGUAGES and current == "French":
             if not has_history:
                 # First message with no prior context: trust the detector
-                logger.info(
-                    f"LanguageResolver: First-message switch fr → {normalized_detected}"
-                )
+                logger.info("LanguageResolver: First-message switch fr → %s", normalized_detected)
                 return normalized_detected
             else:
                 # With history: also allow the switch
-                logger.info(
-                    f"LanguageResolver: History-based switch {current} → {normalized_detected}"
-                )
+                logger.info("LanguageResolver: History-based switch %s → %s", current, normalized_detected)
                 return normalized_detected
 
         # Rule 4: Default — apply the detected language
-        logger.info(f"LanguageResolver: Applying detection → {normalized_detected}")
+        logger.info("LanguageResolver: Applying detection → %s", normalized_detected)
         return normalized_detected
 
     def apply_to_state(
@@ -161,16 +212,17 @@ class LanguageResolver:
                 has_history=has_history,
             )
             if state_profile.language != resolved:
-                logger.info(f"LanguageResolver: {state_profile.language} → {resolved}")
+                logger.info("LanguageResolver: %s → %s", state_profile.language, resolved)
                 state_profile.language = resolved
                 updated = True
 
         # --- Handle other fields ---
-        current_profile_dict = state_profile.model_dump()
+        # Field names from the class: no per-request dump of the whole profile
+        valid_fields = type(state_profile).model_fields
         for key, value in extracted_data.items():
             if key in ("language", "_reasoning"):
                 continue
-            if value is not None and key in current_profile_dict:
+            if value is not None and key in valid_fields:
                 if getattr(state_profile, key) != value:
                     setattr(state_profile, key, value)
                     updated = True
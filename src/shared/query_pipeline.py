@@ -28,7 +28,9 @@ DESIGN:
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass, field
+from functools import lru_cache
 
 from src.utils.logger import logger
 
@@ -53,7 +55,7 @@ class QueryPipeline:
         2. Query rewriting (anchored to core_goal + user profile)
         3. Contextual continuation detection (the "Yes Trap" fix)
         4. Intent classification
-        5. Profile extraction (for language and entity memory)
+        5. Profile extraction (for language and entity memory), concurrently with 1-4
     """
 
     def __init__(
@@ -62,11 +64,15 @@ class QueryPipeline:
         query_rewriter,
         intent_classifier,
         profile_extractor,
+        combined_preprocessor=None,
     ):
         self._goal_extractor = goal_extractor
         self._query_rewriter = query_rewriter
         self._intent_classifier = intent_classifier
         self._profile_extractor = profile_extractor
+        # Optional: steps 1, 2, 4 and 5 in a single LLM call, the separate
+        # steps being the fallback when it fails
+        self._combined_preprocessor = combined_preprocessor
 
     async def run(
         self,
@@ -88,6 +94,37 @@ class QueryPipeline:
         Returns:
             PipelineResult with all preprocessing outputs.
         """
+        if self._combined_preprocessor is not None:
+            result = await self._run_combined(query, chat_history, current_goal, user_profile_dict, model_override)
+            if result is not None:
+                return result
+
+        # Profile extraction only reads the raw query and history: it runs
+        # concurrently with the goal → rewrite → intent chain
+        (new_core_goal, rewritten_query, intent, is_contextual_continuation), extracted_data = (
+            await asyncio.gather(
+                self._understand(query, chat_history, current_goal, user_profile_dict, model_override),
+                self._extract_profile(query, chat_history, model_override),
+            )
+        )
+
+        return PipelineResult(
+            rewritten_query=rewritten_query,
+            intent=intent,
+            extracted_data=extracted_data,
+            new_core_goal=new_core_goal,
+            is_contextual_continuation=is_contextual_continuation,
+        )
+
+    async def _understand(
+        self,
+        query: str,
+        chat_history: list,
+        current_goal: str | None,
+        user_profile_dict: dict | None,
+        model_override: str | None,
+    ) -> tuple:
+        """Steps 1-4: (new_core_goal, rewritten_query, intent, is_contextual_continuation)."""
         # Step 1: Goal extraction — must happen BEFORE rewriting
         new_core_goal = current_goal
         try:
@@ -96,7 +133,7 @@ class QueryPipeline:
             )
             if extracted_goal and extracted_goal != current_goal:
                 new_core_goal = extracted_goal
-                logger.info(f"QueryPipeline: Core goal → {new_core_goal}")
+                logger.info("QueryPipeline: Core goal → %s", new_core_goal)
         except Exception as e:
             logger.error(f"QueryPipeline: Goal extraction failed: {e}")
 
@@ -109,25 +146,13 @@ class QueryPipeline:
                 user_profile=user_profile_dict,
                 model_override=model_override,
             )
-            logger.info(f"QueryPipeline: Rewritten → {rewritten_query}")
+            logger.info("QueryPipeline: Rewritten → %s", rewritten_query)
         except Exception as e:
             logger.error(f"QueryPipeline: Query rewrite failed: {e}")
             rewritten_query = query
 
         # Step 3: Contextual continuation detection ("Yes Trap" fix)
-        # Short answers after an agent question are always routed to the AgentGraph.
-        is_short_answer = len(query.split()) <= 5
-        last_msg_is_question = (
-            chat_history
-            and chat_history[-1].type == "ai"
-            and "?" in chat_history[-1].content
-        )
-        has_clarification_step = (
-            False  # CALLER must inject current_step == CLARIFICATION
-        )
-        is_contextual_continuation = (
-            has_clarification_step or last_msg_is_question
-        ) and is_short_answer
+        is_contextual_continuation = self._is_contextual_continuation(query, chat_history)
 
         # Step 4: Intent classification (or short-circuit for contextual continuation)
         if is_contextual_continuation:
@@ -138,44 +163,92 @@ class QueryPipeline:
         else:
             try:
                 intent = await self._intent_classifier.classify(rewritten_query, model_override=model_override)
-                logger.info(f"QueryPipeline: Intent → {intent}")
+                logger.info("QueryPipeline: Intent → %s", intent)
             except Exception as e:
                 logger.error(f"QueryPipeline: Intent classification failed: {e}")
                 intent = "UNKNOWN"
 
-        # Step 5: Profile extraction (always on original query for clean language signal)
-        try:
-            extracted_data = await self._profile_extractor.extract(query, chat_history, model_override=model_override)
-        except Exception as e:
-            logger.error(f"QueryPipeline: Profile extraction failed: {e}")
-            extracted_data = {}
+        return new_core_goal, rewritten_query, intent, is_contextual_continuation
+
+    @staticmethod
+    def _is_contextual_continuation(query: str, chat_history: list) -> bool:
+        # Short answers after an agent question are always routed to the AgentGraph.
+        is_short_answer = len(query.split()) <= 5
+        last_msg_is_question = (
+            chat_history
+            and chat_history[-1].type == "ai"
+            and "?" in chat_history[-1].content
+        )
+        has_clarification_step = (
+            False  # CALLER must inject current_step == CLARIFICATION
+        )
+        return bool((has_clarification_step or last_msg_is_question) and is_short_answer)
 
+    async def _run_combined(
+        self,
+        query: str,
+        chat_history: list,
+        current_goal: str | None,
+        user_profile_dict: dict | None,
+        model_override: str | None,
+    ) -> PipelineResult | None:
+        """All steps from one combined LLM call; None if that call failed."""
+        combined = await self._combined_preprocessor.run(
+            query,
+            chat_history,
+            current_goal=current_goal,
+            user_profile=user_profile_dict,
+            model_override=model_override,
+        )
+        if combined is None:
+            return None
+
+        is_contextual_continuation = self._is_contextual_continuation(query, chat_history)
+        intent = "COMPLEX_PROCEDURE" if is_contextual_continuation else combined.intent
+        logger.info("QueryPipeline (combined): Rewritten → %s, Intent → %s", combined.rewritten_query, intent)
         return PipelineResult(
-            rewritten_query=rewritten_query,
+            rewritten_query=combined.rewritten_query,
             intent=intent,
-            extracted_data=extracted_data,
-            new_core_goal=new_core_goal,
+            extracted_data=combined.profile,
+            new_core_goal=combined.core_goal,
             is_contextual_continuation=is_contextual_continuation,
         )
 
+    async def _extract_profile(self, query: str, chat_history: list, model_override: str | None) -> dict:
+        # Step 5: Profile extraction (always on original query for clean language signal)
+        try:
+            return await self._profile_extractor.extract(query, chat_history, model_override=model_override)
+        except Exception as e:
+            logger.error(f"QueryPipeline: Profile extraction failed: {e}")
+            return {}
+
 
 # ---------------------------------------------------------------------------
 # Factory: build from real singletons (used by orchestrator)
 # ---------------------------------------------------------------------------
 
 
+@lru_cache(maxsize=1)
 def get_query_pipeline() -> QueryPipeline:
-    """Build QueryPipeline using production singletons. Call lazily (avoids import cycles)."""
+    """
+    QueryPipeline over the production singletons. Call lazily (avoids import
+    cycles); built on the first call, then shared, since it holds no state.
+    """
+    # Intentional cycle break: this module stays importable without the agent
+    # (and LLM client) modules
     from src.agents.intent_classifier import intent_classifier
     from src.agents.preprocessor import (
+        combined_preprocessor,
         goal_extractor,
         profile_extractor,
         query_rewriter,
     )
+    from src.config import settings
 
     return QueryPipeline(
         goal_extractor=goal_extractor,
         query_rewriter=query_rewriter,
         intent_classifier=intent_classifier,
         profile_extractor=profile_extractor,
+        combined_preprocessor=combined_preprocessor if settings.COMBINED_PREPROCESSING_ENABLED else None,
     )
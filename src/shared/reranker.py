@@ -1,13 +1,126 @@
+import asyncio
 from sentence_transformers import CrossEncoder
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from src.config import settings
 from src.utils.logger import logger
-from functools import lru_cache
+from src.utils import metrics
+from functools import lru_cache, partial
+
+
+class RerankBatcher:
+    """
+    Coalesces concurrent rerank requests into a single cross-encoder forward pass.
+
+    Each caller submits its (query, doc) pairs and awaits a Future. A background
+    worker collects submissions for up to `max_wait_s` or until `max_batch`
+    requests are queued, runs one `model.predict` over all pairs in the default
+    executor (keeping the event loop free), then slices the scores back to
+    each awaiter. At low QPS a request waits at most `max_wait_s`.
+    """
+
+    def __init__(
+        self,
+        model,
+        max_batch: int = 8,
+        max_wait_s: float = 0.005,
+        predict_batch_size: int = 64,
+    ):
+        self._model = model
+        self._max_batch = max_batch
+        self._max_wait_s = max_wait_s
+        self._predict_batch_size = predict_batch_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def submit(self, pairs: Sequence[Tuple[str, str]]) -> List[float]:
+        if not pairs:
+            return []
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((pairs, future))
+        return await future
+
+    def _ensure_worker(self):
+        # The worker is bound to the running loop; restart it if the loop changed
+        loop = asyncio.get_running_loop()
+        if (
+            self._worker is None
+            or self._worker.done()
+            or self._worker.get_loop() is not loop
+        ):
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._max_wait_s
+            while len(batch) < self._max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            await self._flush(batch)
+
+    async def _flush(self, batch):
+        all_pairs = [pair for pairs, _ in batch for pair in pairs]
+        metrics.RERANKER_BATCH_SIZE.observe(len(batch))
+        try:
+            scores = await asyncio.get_running_loop().run_in_executor(
+                None,
+                partial(
+                    self._model.predict, all_pairs, batch_size=self._predict_batch_size
+                ),
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        offset = 0
+        for pairs, future in batch:
+            if not future.done():
+                future.set_result(
+                    [float(s) for s in scores[offset : offset + len(pairs)]]
+                )
+            offset += len(pairs)
 
 
 class Reranker:
-    def __init__(self, model_name: str = "BAAI/bge-reranker-v2-m3"):
-        logger.info(f"Initializing Reranker with model: {model_name}")
-        self.model = CrossEncoder(model_name)
+    def __init__(
+        self, model_name: str = "BAAI/bge-reranker-v2-m3", backend: str = "torch"
+    ):
+        logger.info(
+            f"Initializing Reranker with model: {model_name} (backend: {backend})"
+        )
+        self.model = self._load_model(model_name, backend)
+        self._batcher = RerankBatcher(self.model)
+
+    @staticmethod
+    def _load_model(model_name: str, backend: str) -> CrossEncoder:
+        """
+        Loads the cross-encoder. The "onnx" backend runs an int8-quantized ONNX
+        export through onnxruntime (3-5x CPU throughput vs PyTorch FP32); it needs
+        sentence-transformers>=4.1 with the onnx extra, so any failure falls back
+        to the PyTorch model.
+        """
+        if backend == "onnx":
+            try:
+                return CrossEncoder(
+                    model_name,
+                    backend="onnx",
+                    model_kwargs={"file_name": settings.RERANKER_ONNX_FILE},
+                )
+            except Exception as e:
+                logger.error(
+                    f"ONNX reranker unavailable ({e}). Falling back to PyTorch."
+                )
+        return CrossEncoder(model_name)
 
     def rerank(
         self,
@@ -23,6 +136,34 @@ class Reranker:
         if not docs:
             return []
 
+        pairs = self._build_pairs(query, docs, user_profile)
+
+        # Predict scores
+        scores = self.model.predict(pairs)
+
+        return self._rank(docs, scores, user_profile, top_k)
+
+    async def arerank(
+        self,
+        query: str,
+        docs: List[Dict[str, Any]],
+        user_profile: Optional[Any] = None,
+        top_k: int = 5,
+    ) -> List[Dict[str, Any]]:
+        """
+        Async variant of `rerank`: scoring goes through the shared batcher so that
+        concurrent requests share one cross-encoder forward pass.
+        """
+        if not docs:
+            return []
+
+        pairs = self._build_pairs(query, docs, user_profile)
+        scores = await self._batcher.submit(pairs)
+        return self._rank(docs, scores, user_profile, top_k)
+
+    def _build_pairs(
+        self, query: str, docs: List[Dict[str, Any]], user_profile: Optional[Any]
+    ) -> List[Tuple[str, str]]:
         # Prepare pairs for Cross-Encoder
         # If user_profile is provided, enrich the query with context
         augmented_query = query
@@ -44,11 +185,15 @@ class Reranker:
                 augmented_query = f"{query} [Context: {', '.join(context_parts)}]"
 
         # (Query, Document Content)
-        pairs = [(augmented_query, doc["content"]) for doc in docs]
-
-        # Predict scores
-        scores = self.model.predict(pairs)
+        return [(augmented_query, doc["content"]) for doc in docs]
 
+    def _rank(
+        self,
+        docs: List[Dict[str, Any]],
+        scores: Sequence[float],
+        user_profile: Optional[Any],
+        top_k: int,
+    ) -> List[Dict[str, Any]]:
         # Attach scores to docs
         for i, doc in enumerate(docs):
             doc["score"] = float(scores[i])
@@ -106,7 +251,9 @@ class Reranker:
 
         if is_non_eu_user and has_eu_keyword and not has_non_eu_keyword:
             logger.info(
-                f"Filtering out EU doc for Non-EU user ({nationality}): {doc.get('metadata', {}).get('title', 'Unknown')}"
+                "Filtering out EU doc for Non-EU user (%s): %s",
+                nationality,
+                doc.get("metadata", {}).get("title", "Unknown"),
             )
             doc["score"] -= 10.0  # Heavy penalty
 
@@ -114,4 +261,4 @@ class Reranker:
 # Singleton
 @lru_cache(maxsize=1)
 def get_reranker():
-    return Reranker()
+    return Reranker(backend=settings.RERANKER_BACKEND)
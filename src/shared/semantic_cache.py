@@ -0,0 +1,112 @@
+"""
+SemanticResponseCache — Redis-backed cache of final answers keyed by query embedding.
+
+PURPOSE:
+    Users ask the same administrative questions in many phrasings
+    ("renouvellement titre de séjour" vs "how do I renew my residence permit").
+    Matching on embedding similarity lets LegalResearchAgent return a previous
+    answer in milliseconds, skipping retrieval, groundedness and synthesis.
+
+DESIGN:
+    One Redis hash per namespace (the response language, so a French answer is
+    never served to an English question; LegalResearchAgent prefixes it with
+    the synthesis prompt hash so a prompt edit retires old answers). Each field holds the L2-normalized
+    float32 query embedding followed by the UTF-8 answer. A lookup is a single
+    HGETALL plus one numpy mat-vec product; a hit requires cosine >= threshold.
+
+    Entries expire individually via HEXPIRE (Redis >= 7.4) and each namespace
+    is capped at `max_entries` (random eviction), which bounds the HGETALL size.
+
+    All Redis errors are logged and treated as a miss — the cache must never
+    break the answer path.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Optional, Sequence
+
+import numpy as np
+import redis.asyncio as redis
+
+from src.config import settings
+from src.utils.logger import logger
+
+
+class SemanticResponseCache:
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        threshold: Optional[float] = None,
+        ttl: Optional[int] = None,
+        max_entries: int = 500,
+        prefix: str = "semcache",
+    ):
+        # Raw bytes: values are packed embedding + answer, not text
+        self.client = redis.from_url(redis_url or settings.REDIS_URL)
+        self.threshold = (
+            threshold if threshold is not None else settings.SEMANTIC_CACHE_THRESHOLD
+        )
+        self.ttl = ttl if ttl is not None else settings.SEMANTIC_CACHE_TTL
+        self.max_entries = max_entries
+        self.prefix = prefix
+
+    def _key(self, namespace: str) -> str:
+        return f"{self.prefix}:{namespace}"
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    async def get(self, embedding: Sequence[float], namespace: str) -> Optional[str]:
+        """Returns the cached answer of the most similar query, if similar enough."""
+        try:
+            entries = await self.client.hgetall(self._key(namespace))
+        except Exception as e:
+            logger.error(f"Semantic cache read failed: {e}")
+            return None
+        if not entries:
+            return None
+
+        query_vector = self._normalize(embedding)
+        width = query_vector.nbytes
+        # Skip entries written with a different embedding dimension
+        values = [v for v in entries.values() if len(v) >= width]
+        if not values:
+            return None
+
+        matrix = np.frombuffer(b"".join(v[:width] for v in values), dtype=np.float32)
+        similarities = matrix.reshape(len(values), -1) @ query_vector
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+
+        logger.info(
+            "Semantic cache hit (cosine=%.3f, ns=%s)", similarities[best], namespace
+        )
+        return values[best][width:].decode("utf-8")
+
+    async def set(self, embedding: Sequence[float], answer: str, namespace: str):
+        vector = self._normalize(embedding)
+        entry_id = hashlib.blake2b(vector.tobytes(), digest_size=8).hexdigest()
+        key = self._key(namespace)
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.hset(key, entry_id, vector.tobytes() + answer.encode("utf-8"))
+                pipe.hexpire(key, self.ttl, entry_id)
+                pipe.hlen(key)
+                _, _, size = await pipe.execute()
+
+            overflow = size - self.max_entries
+            if overflow > 0:
+                victims = await self.client.hrandfield(key, overflow)
+                if victims:
+                    await self.client.hdel(key, *victims)
+        except Exception as e:
+            logger.error(f"Semantic cache write failed: {e}")
+
+
+# Singleton
+semantic_cache = SemanticResponseCache()
@@ -1,7 +1,9 @@
 import os
 import json
+import queue
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime
 from typing import Any, Dict
 
@@ -30,6 +32,8 @@ class JSONFormatter(logging.Formatter):
 def get_audit_logger(name: str = "audit_logger") -> logging.Logger:
     """
     Returns a configured audit logger that outputs structured JSON to logs/audit.log.
+    Records are queued and written by a background thread (QueueListener), so
+    an audit entry never blocks the event loop on a file write or a rotation.
     """
     logger = logging.getLogger(name)
     
@@ -47,7 +51,13 @@ def get_audit_logger(name: str = "audit_logger") -> logging.Logger:
         
         formatter = JSONFormatter()
         handler.setFormatter(formatter)
-        logger.addHandler(handler)
+
+        records = queue.SimpleQueue()
+        logger.addHandler(QueueHandler(records))
+        listener = QueueListener(records, handler)
+        listener.start()
+        # Flush queued entries on interpreter exit
+        atexit.register(listener.stop)
         
         # Prevent logs from propagating to the root logger which might write to stdout
         logger.propagate = False
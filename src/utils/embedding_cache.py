@@ -0,0 +1,182 @@
+"""
+EmbeddingCache — in-process LRU + TTL cache of query and document embeddings.
+
+PURPOSE:
+    The same (or trivially different) questions are embedded many times:
+    once per searched collection, once more for the semantic response cache,
+    and again every time another user asks the same FAQ. bge-m3 inference is
+    deterministic for a given text, so repeated embeddings are pure waste.
+
+DESIGN:
+    Texts are NFKC-normalized, lower-cased and stripped, and the normalized
+    text is what gets embedded, so whitespace/case/Unicode-form variants
+    share one entry and the cached vector is the same whichever variant
+    arrived first. Keys are 128-bit BLAKE2b digests (raw bytes) of that text,
+    personalized with the embedding kind: query and document embeddings
+    come from different model calls and never share an entry. A key is
+    computed once per lookup, then reused for the in-flight map and the
+    write-back.
+    An OrderedDict gives O(1) LRU ordering (move_to_end on hit, popitem on
+    overflow); entries older than `ttl` seconds are treated as misses.
+    An RLock guards the dict since the embedding itself runs in the
+    retriever's dedicated executor (not the loop's default one).
+    Concurrent misses for the same key await a single in-flight embedding.
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from functools import partial
+from typing import List
+
+from src.utils.logger import logger
+
+# Embedding kinds (key namespaces)
+QUERY = "query"
+DOCUMENT = "document"
+
+
+class EmbeddingCache:
+    def __init__(self, maxsize: int = 2000, ttl: float = 3600, log_every: int = 100):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.log_every = log_every
+        self._entries: "OrderedDict[bytes, tuple[float, List[float]]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._pending: dict = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return unicodedata.normalize("NFKC", text.lower().strip())
+
+    @classmethod
+    def _key(cls, text: str, kind: str = QUERY) -> bytes:
+        return hashlib.blake2b(
+            cls._normalize(text).encode("utf-8"),
+            digest_size=16,
+            person=kind.encode("ascii"),
+        ).digest()
+
+    def get(self, text: str, kind: str = QUERY):
+        return self._get(self._key(text, kind))
+
+    def _get(self, key: bytes):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self._maybe_log()
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            self._maybe_log()
+            return None
+
+    def put(self, text: str, embedding: List[float], kind: str = QUERY):
+        self._put(self._key(text, kind), embedding)
+
+    def _put(self, key: bytes, embedding: List[float]):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), embedding)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    async def get_or_embed(self, text: str) -> List[float]:
+        """Returns the cached query embedding of `text`, computing it on a miss."""
+        normalized = self._normalize(text)
+        key = self._key(normalized)
+        embedding = self._get(key)
+        if embedding is not None:
+            return embedding
+
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._embed(normalized, key))
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def get_or_embed_many(
+        self, texts: List[str], kind: str = DOCUMENT
+    ) -> List[List[float]]:
+        """
+        Batch variant: all misses are embedded in a single executor job.
+        Documents go through one `embed_documents` call; queries (kind=QUERY)
+        are embedded one by one with `embed_query`, as the model expects.
+        """
+        normalized = [self._normalize(text) for text in texts]
+        keys = [self._key(text, kind) for text in normalized]
+        embeddings = [self._get(key) for key in keys]
+        misses = [text for text, e in zip(normalized, embeddings) if e is None]
+        if misses:
+            from skills.legal_retriever.main import _get_embeddings, _get_retrieval_executor
+
+            model = _get_embeddings()
+            if kind == QUERY:
+                embed = partial(_embed_queries, model, misses)
+            else:
+                embed = partial(model.embed_documents, misses)
+            computed = iter(
+                await asyncio.get_running_loop().run_in_executor(
+                    _get_retrieval_executor(), embed
+                )
+            )
+            for i, embedding in enumerate(embeddings):
+                if embedding is None:
+                    embeddings[i] = next(computed)
+                    self._put(keys[i], embeddings[i])
+        return embeddings
+
+    async def _embed(self, text: str, key: bytes) -> List[float]:
+        # Imported lazily: the retriever module itself depends on this cache
+        from skills.legal_retriever.main import _get_embeddings, _get_retrieval_executor
+
+        embedding = await asyncio.get_running_loop().run_in_executor(
+            _get_retrieval_executor(), _get_embeddings().embed_query, text
+        )
+        self._put(key, embedding)
+        return embedding
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._entries),
+            }
+
+    def _maybe_log(self):
+        total = self.hits + self.misses
+        if self.log_every and total % self.log_every == 0:
+            stats = self.stats()
+            logger.info(
+                "Embedding cache: %d hits / %d misses (hit rate %.1f%%, size %d)",
+                stats["hits"],
+                stats["misses"],
+                stats["hit_rate"] * 100,
+                stats["size"],
+            )
+
+
+def _embed_queries(model, texts: List[str]) -> List[List[float]]:
+    return [model.embed_query(text) for text in texts]
+
+
+# Singleton
+embedding_cache = EmbeddingCache()
@@ -1,10 +1,57 @@
+import importlib.util
+from functools import lru_cache
+
+import httpx
 from langchain_openai import ChatOpenAI
 from src.config import settings
 
+# HTTP/2 multiplexing needs the optional `h2` package; fall back to HTTP/1.1 pooling.
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+# Long synthesis answers can take well over a minute; fail before the SDK's 10 min default
+_HTTP_TIMEOUT = httpx.Timeout(120.0, connect=10.0)
+
+
+@lru_cache(maxsize=1)
+def get_http_async_client() -> httpx.AsyncClient:
+    """
+    Process-wide async HTTP connection pool shared by every ChatOpenAI instance.
+    Each ChatOpenAI would otherwise create its own httpx client (and TLS
+    connections), which serializes under concurrency.
+    """
+    return httpx.AsyncClient(
+        limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT, http2=_HTTP2_AVAILABLE
+    )
+
+
+@lru_cache(maxsize=1)
+def get_http_client() -> httpx.Client:
+    """
+    Blocking counterpart of get_http_async_client, for the sync OpenAI client
+    of the voice skill (Whisper/TTS run in worker threads). httpx.Client is
+    thread-safe, so one pool keeps its TLS connections across requests.
+    """
+    return httpx.Client(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT, http2=_HTTP2_AVAILABLE)
+
+
+async def aclose_http_async_client():
+    """Closes the shared pools on shutdown; a later get_http_(async_)client() opens a new one."""
+    if get_http_async_client.cache_info().currsize:
+        await get_http_async_client().aclose()
+        get_http_async_client.cache_clear()
+    if get_http_client.cache_info().currsize:
+        get_http_client().close()
+        get_http_client.cache_clear()
+    # Cached models hold the closed pool
+    _build_llm.cache_clear()
+
+
 def get_llm(temperature: float = 0.2, model_override: str = None, streaming: bool = False, provider_override: str = None):
     """
     Factory function to initialize ChatOpenAI with either OpenAI 
     or a Local LLM backend based on settings.
+    Instances are shared: identical arguments return the same ChatOpenAI.
     """
     # Handle UI Dropdown mappings
     if model_override == "Qwen Finetuned (Local)":
@@ -15,19 +62,30 @@ def get_llm(temperature: float = 0.2, model_override: str = None, streaming: boo
         model_override = settings.OPENAI_MODEL
 
     provider = provider_override or settings.LLM_PROVIDER
+    return _build_llm(temperature, model_override, streaming, provider)
+
 
+@lru_cache(maxsize=32)
+def _build_llm(temperature: float, model_override: str, streaming: bool, provider: str) -> ChatOpenAI:
+    """
+    ChatOpenAI is immutable once built (callers only `.bind()` on it), so one
+    instance per configuration serves every request instead of re-validating
+    the model and rebuilding its openai clients on each call.
+    """
     if provider == "local":
         return ChatOpenAI(
             model=model_override or settings.LOCAL_LLM_MODEL,
             temperature=temperature,
             openai_api_key="local-placeholder",
             base_url=settings.LOCAL_LLM_URL,
-            streaming=streaming
+            streaming=streaming,
+            http_async_client=get_http_async_client(),
         )
 
     return ChatOpenAI(
         model=model_override or settings.OPENAI_MODEL,
         temperature=temperature,
         api_key=settings.OPENAI_API_KEY,
-        streaming=streaming
+        streaming=streaming,
+        http_async_client=get_http_async_client(),
     )
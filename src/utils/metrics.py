@@ -1,3 +1,6 @@
+from functools import lru_cache
+from typing import NamedTuple
+
 from prometheus_client import Counter, Histogram
 
 # LLM Metrics
@@ -14,6 +17,28 @@ LLM_REQUEST_DURATION = Histogram(
     buckets=[0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0],
 )
 
+
+class LLMMetrics(NamedTuple):
+    """Children of the LLM metrics for one model, resolved once."""
+
+    duration: object
+    prompt_tokens: object
+    completion_tokens: object
+
+
+@lru_cache(maxsize=None)
+def llm_metrics(model: str) -> LLMMetrics:
+    """
+    Labelled LLM metrics of `model`. `.labels()` takes a lock and builds the
+    label tuple on every call; the handful of models in use are resolved once.
+    """
+    return LLMMetrics(
+        duration=LLM_REQUEST_DURATION.labels(model=model),
+        prompt_tokens=LLM_TOKEN_USAGE.labels(model=model, type="prompt"),
+        completion_tokens=LLM_TOKEN_USAGE.labels(model=model, type="completion"),
+    )
+
+
 # RAG Metrics
 RAG_RETRIEVAL_LATENCY = Histogram(
     "rag_retrieval_latency_seconds",
@@ -34,6 +59,17 @@ RERANKER_LATENCY = Histogram(
     buckets=[0.1, 0.2, 0.5, 1.0, 2.0],
 )
 
+RERANKER_BATCH_SIZE = Histogram(
+    "reranker_batch_size",
+    "Number of concurrent rerank requests coalesced into one forward pass",
+    buckets=[1, 2, 4, 8, 16],
+)
+
+CACHE_WRITES_SKIPPED = Counter(
+    "response_cache_writes_skipped_total",
+    "Response-cache writes dropped because too many were already in flight",
+)
+
 # Business Metrics
 USER_FEEDBACK = Counter(
     "user_feedback_total",
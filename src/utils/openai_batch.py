@@ -0,0 +1,112 @@
+"""
+OpenAI Batch API helper for offline chat completions.
+
+PURPOSE:
+    Bulk jobs (warming the semantic response cache, regenerating answers,
+    evaluation runs) do not need an answer within seconds. The Batch API
+    runs them asynchronously within 24h at half the price, and outside the
+    per-minute rate limits shared with live traffic.
+
+DESIGN:
+    `run_chat_batch` writes one `/v1/chat/completions` request per line of a
+    JSONL file, uploads it, creates the batch, polls until it reaches a
+    terminal status, then maps the output file back by `custom_id`.
+    Results come back in input order; a request that failed or never ran
+    yields None instead of failing the whole job.
+
+    Only the OpenAI provider supports batches: local (vLLM) backends do not.
+"""
+
+import asyncio
+import json
+from typing import Dict, List, Optional
+
+from openai import AsyncOpenAI
+
+from src.config import settings
+from src.utils.llm_factory import get_http_async_client
+from src.utils.logger import logger
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def build_batch_jsonl(requests: List[Dict], model: str, **params) -> bytes:
+    """One chat-completions request per line; `custom_id` is the request's index."""
+    lines = []
+    for i, messages in enumerate(requests):
+        body = {"model": model, "messages": messages, **params}
+        lines.append(
+            json.dumps(
+                {
+                    "custom_id": str(i),
+                    "method": "POST",
+                    "url": BATCH_ENDPOINT,
+                    "body": body,
+                },
+                ensure_ascii=False,
+            )
+        )
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def parse_batch_output(text: str, count: int) -> List[Optional[str]]:
+    """Maps batch output lines back to the input order (None for failed requests)."""
+    results: List[Optional[str]] = [None] * count
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        response = entry.get("response") or {}
+        if response.get("status_code") != 200:
+            logger.error(
+                f"Batch request {entry.get('custom_id')} failed: {entry.get('error') or response}"
+            )
+            continue
+        choices = (response.get("body") or {}).get("choices") or []
+        if choices:
+            results[int(entry["custom_id"])] = choices[0]["message"]["content"]
+    return results
+
+
+async def run_chat_batch(
+    requests: List[List[Dict]],
+    model: Optional[str] = None,
+    poll_interval: float = 30.0,
+    client: Optional[AsyncOpenAI] = None,
+    **params,
+) -> List[Optional[str]]:
+    """
+    Runs chat completions for `requests` (each a list of OpenAI message dicts)
+    through the Batch API and waits for the results.
+    """
+    if not requests:
+        return []
+    client = client or AsyncOpenAI(
+        api_key=settings.OPENAI_API_KEY, http_client=get_http_async_client()
+    )
+
+    payload = build_batch_jsonl(requests, model or settings.OPENAI_MODEL, **params)
+    input_file = await client.files.create(
+        file=("batch.jsonl", payload), purpose="batch"
+    )
+    batch = await client.batches.create(
+        input_file_id=input_file.id, endpoint=BATCH_ENDPOINT, completion_window="24h"
+    )
+    logger.info(f"Submitted batch {batch.id} ({len(requests)} requests)")
+
+    while batch.status not in _TERMINAL_STATUSES:
+        await asyncio.sleep(poll_interval)
+        batch = await client.batches.retrieve(batch.id)
+        counts = batch.request_counts
+        if counts is not None:
+            logger.info(
+                f"Batch {batch.id}: {batch.status} ({counts.completed}/{counts.total} done)"
+            )
+
+    if batch.status != "completed":
+        logger.error(f"Batch {batch.id} ended with status '{batch.status}'")
+    if not batch.output_file_id:
+        return [None] * len(requests)
+    output = await client.files.content(batch.output_file_id)
+    return parse_batch_output(output.text, len(requests))
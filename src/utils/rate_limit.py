@@ -0,0 +1,97 @@
+"""
+Retry policy and process-wide rate-limit gate for LLM calls.
+
+PURPOSE:
+    Retrying is only useful for transient provider failures (429, 5xx,
+    timeouts, dropped connections). Retrying schema/parsing bugs or 4xx
+    client errors wastes attempts and hides the real error.
+
+DESIGN:
+    RETRYABLE_ERRORS is the exception tuple for tenacity's
+    `retry_if_exception_type`, paired with jittered exponential backoff
+    (LLM_RETRY_WAIT / LLM_RETRY_STOP).
+
+    On a 429 the provider says how long to back off (Retry-After). The gate
+    records that deadline once for the whole process, and every LLM call
+    awaits `wait_if_cooling()` first, so concurrent requests stop hammering
+    the API during the cooldown instead of each retrying on its own schedule.
+    The same hook logs every retry, so transient provider trouble shows up
+    in the logs even when the call eventually succeeds.
+"""
+
+import asyncio
+import time
+
+import openai
+from tenacity import stop_after_attempt, wait_random_exponential
+
+from src.utils.logger import logger
+
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.InternalServerError,
+)
+
+LLM_RETRY_WAIT = wait_random_exponential(multiplier=2, max=60)
+LLM_RETRY_STOP = stop_after_attempt(5)
+
+# Used when a 429 carries no usable Retry-After header
+DEFAULT_COOLDOWN_SECONDS = 1.0
+MAX_COOLDOWN_SECONDS = 60.0
+
+
+def _retry_after_seconds(error: Exception) -> float:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms") is not None:
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after") is not None:
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        # Retry-After may also be an HTTP date; not worth parsing here
+        pass
+    return DEFAULT_COOLDOWN_SECONDS
+
+
+class RateLimitGate:
+    def __init__(self):
+        self._cooldown_until = 0.0
+
+    async def wait_if_cooling(self):
+        delay = self._cooldown_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def record(self, error: BaseException):
+        """Starts (or extends) the shared cooldown if `error` is a 429."""
+        if not isinstance(error, openai.RateLimitError):
+            return
+        delay = min(_retry_after_seconds(error), MAX_COOLDOWN_SECONDS)
+        self._cooldown_until = max(self._cooldown_until, time.monotonic() + delay)
+        logger.warning(f"LLM rate limited; pausing LLM calls for {delay:.1f}s")
+
+    def before_sleep(self, retry_state):
+        """tenacity `before_sleep` hook."""
+        if retry_state.outcome is not None and retry_state.outcome.failed:
+            error = retry_state.outcome.exception()
+            sleep = (
+                retry_state.next_action.sleep
+                if retry_state.next_action is not None
+                else 0.0
+            )
+            logger.warning(
+                "Retrying %s in %.1fs after attempt %s failed: %s: %s",
+                getattr(retry_state.fn, "__qualname__", "LLM call"),
+                sleep,
+                retry_state.attempt_number,
+                type(error).__name__,
+                error,
+            )
+            self.record(error)
+
+
+# Singleton
+rate_limit_gate = RateLimitGate()
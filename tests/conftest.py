@@ -65,6 +65,19 @@ def mock_openai_globally():
         yield
 
 
+@pytest.fixture(autouse=True)
+def reset_vector_store_cache():
+    """Vector stores and query embeddings are cached; drop them so each test sees its own mocks."""
+    from skills.legal_retriever import main as retriever_module
+    from src.utils.embedding_cache import embedding_cache
+
+    retriever_module._STORES.clear()
+    embedding_cache.clear()
+    yield
+    retriever_module._STORES.clear()
+    embedding_cache.clear()
+
+
 @pytest_asyncio.fixture
 async def ac() -> AsyncGenerator[AsyncClient, None]:
     """
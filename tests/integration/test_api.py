@@ -6,12 +6,9 @@ from httpx import AsyncClient
 @pytest.mark.asyncio
 async def test_health_check(ac: AsyncClient):
     """Health endpoint should return 200 with status and dependencies."""
-    with patch("redis.from_url") as mock_redis_from_url, patch(
-        "qdrant_client.QdrantClient"
-    ) as mock_qdrant_cls:
-        # Mock Redis ping
-        mock_r = mock_redis_from_url.return_value
-        mock_r.ping.return_value = True
+    with patch(
+        "src.main.orchestrator.cache.ping", new_callable=AsyncMock, return_value=True
+    ) as mock_ping, patch("qdrant_client.QdrantClient") as mock_qdrant_cls:
 
         # Mock Qdrant get_collections
         mock_q = mock_qdrant_cls.return_value
@@ -22,6 +19,9 @@ async def test_health_check(ac: AsyncClient):
         data = response.json()
         assert "status" in data
         assert "dependencies" in data
+        # Redis is probed through the shared pool
+        mock_ping.assert_awaited_once()
+        assert data["dependencies"]["redis"] is True
 
 
 @pytest.mark.asyncio
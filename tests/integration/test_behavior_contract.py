@@ -65,13 +65,13 @@ async def test_contract_handle_query_simple_qa_returns_answer():
         # External boundary: LLM mocked
         orch = AdminOrchestrator()
         orch.cache = AsyncMock()
-        orch.cache.get.return_value = None  # Cache miss
+        orch.cache.getex.return_value = None  # Cache miss
         orch.cache.setex = AsyncMock()
         orch._call_llm = AsyncMock(return_value=mock_llm_response("La réponse est 42."))
 
         # Qdrant returns no docs (simplest case)
         mock_client.return_value.collection_exists.return_value = False
-        mock_reranker.return_value.rerank.return_value = []
+        mock_reranker.return_value.arerank = AsyncMock(return_value=[])
 
         # Memory
         state = make_state()
@@ -105,15 +105,15 @@ async def test_contract_handle_query_cache_hit():
     ):
         orch = AdminOrchestrator()
         orch.cache = AsyncMock()
-        orch.cache.get.return_value = "Cached correct answer"
+        orch.cache.getex.return_value = b"Cached correct answer"
         orch._call_llm = AsyncMock()  # Should never be called
+        orch._bypass_cache = False  # Cache lookups on, whatever DEBUG is
 
         state = make_state()
         mock_mem.load_agent_state = AsyncMock(return_value=state)
         mock_mem.save_agent_state = AsyncMock()
 
-        with patch("src.config.settings.DEBUG", False):
-            result = await orch.handle_query("Any query", "fr", "session-cache")
+        result = await orch.handle_query("Any query", "fr", "session-cache")
 
         # CONTRACT: LLM not called, cached value returned
         assert result == "Cached correct answer"
@@ -150,7 +150,7 @@ async def test_contract_handle_query_topic_rejection_french():
     ):
         orch = AdminOrchestrator()
         orch.cache = AsyncMock()
-        orch.cache.get.return_value = None
+        orch.cache.getex.return_value = None
         orch._call_llm = AsyncMock()
 
         state = make_state()
@@ -186,7 +186,7 @@ async def test_contract_handle_query_topic_rejection_french_text():
     ):
         orch = AdminOrchestrator()
         orch.cache = AsyncMock()
-        orch.cache.get.return_value = None
+        orch.cache.getex.return_value = None
         orch._call_llm = AsyncMock()
 
         state = make_state()
@@ -221,7 +221,7 @@ async def test_contract_handle_query_topic_rejection_english():
     ):
         orch = AdminOrchestrator()
         orch.cache = AsyncMock()
-        orch.cache.get.return_value = None
+        orch.cache.getex.return_value = None
         orch._call_llm = AsyncMock()
 
         state = make_state()
@@ -266,7 +266,7 @@ async def test_contract_stream_query_simple_qa_yields_events():
     ):
         orch = AdminOrchestrator()
         orch.cache = AsyncMock()
-        orch.cache.get.return_value = None
+        orch.cache.getex.return_value = None
         orch.cache.setex = AsyncMock()
 
         # LLM streams tokens
@@ -309,7 +309,8 @@ async def test_contract_stream_query_cache_hit():
     ):
         orch = AdminOrchestrator()
         orch.cache = AsyncMock()
-        orch.cache.get.return_value = "Cached stream answer"
+        orch.cache.getex.return_value = b"Cached stream answer"
+        orch._bypass_cache = False  # Cache lookups on, whatever DEBUG is
         orch.llm = MagicMock()
         orch.llm.astream = AsyncMock()
 
@@ -317,10 +318,9 @@ async def test_contract_stream_query_cache_hit():
         mock_mem.load_agent_state = AsyncMock(return_value=state)
         mock_mem.save_agent_state = AsyncMock()
 
-        with patch("src.config.settings.DEBUG", False):
-            events = []
-            async for event in orch.stream_query("Cached query", "fr", "s5"):
-                events.append(event)
+        events = []
+        async for event in orch.stream_query("Cached query", "fr", "s5"):
+            events.append(event)
 
         # CONTRACT: exactly 2 events: status + token with cached content
         assert len(events) == 2
@@ -347,7 +347,7 @@ async def test_contract_stream_query_topic_rejection():
     ):
         orch = AdminOrchestrator()
         orch.cache = AsyncMock()
-        orch.cache.get.return_value = None
+        orch.cache.getex.return_value = None
         orch.llm = MagicMock()
         orch.llm.astream = AsyncMock()
 
@@ -389,14 +389,14 @@ async def test_contract_handle_query_redis_error_does_not_crash():
     ):
         orch = AdminOrchestrator()
         orch.cache = AsyncMock()
-        orch.cache.get.side_effect = Exception("Redis is down")
+        orch.cache.getex.side_effect = Exception("Redis is down")
         orch.cache.setex.side_effect = Exception("Redis is down")
         orch._call_llm = AsyncMock(
             return_value=mock_llm_response("Answer despite Redis error.")
         )
 
         mock_client.return_value.collection_exists.return_value = False
-        mock_reranker.return_value.rerank.return_value = []
+        mock_reranker.return_value.arerank = AsyncMock(return_value=[])
 
         state = make_state()
         mock_mem.load_agent_state = AsyncMock(return_value=state)
@@ -442,7 +442,7 @@ async def test_contract_language_detection_updates_state():
     ):
         orch = AdminOrchestrator()
         orch.cache = AsyncMock()
-        orch.cache.get.return_value = None
+        orch.cache.getex.return_value = None
         orch.cache.setex = AsyncMock()
         orch._call_llm = AsyncMock(return_value=mock_llm_response("Answer."))
 
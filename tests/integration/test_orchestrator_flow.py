@@ -18,11 +18,12 @@ async def test_orchestrator_full_flow_simple_qa():
 
     # Mock Redis (Cache)
     mock_cache = AsyncMock()
-    mock_cache.get.return_value = None
+    mock_cache.getex.return_value = None
 
     # Mock Memory Redis
     mock_mem_client = AsyncMock()
-    mock_mem_client.get.return_value = None  # No existing state
+    mock_mem_client.hgetall.return_value = {}  # No existing state
+    mock_mem_client.get.return_value = None
 
     with patch("src.agents.orchestrator.get_llm", return_value=mock_llm), patch(
         "src.agents.orchestrator.retrieve_legal_info", mock_retriever
@@ -68,12 +69,12 @@ async def test_orchestrator_full_flow_simple_qa():
         mock_classify.assert_called_once()
 
         # Verify State Persistence
-        # memory_manager.redis_client.set should be called to save the state
-        assert mock_mem_client.set.called
+        # memory_manager.redis_client.hset should be called to save the state
+        assert mock_mem_client.hset.called
 
         # Inspect what was saved
-        args, _ = mock_mem_client.set.call_args
-        key, val = args
-        assert key == f"agent_state:{session_id}"
-        assert "SIMPLE_QA" in val  # Validates intent was saved
-        assert "Generated Answer" in val  # Validates message history saved
+        key, = mock_mem_client.hset.call_args.args
+        fields = mock_mem_client.hset.call_args.kwargs["mapping"]
+        assert key == f"session_state:{session_id}"
+        assert fields["intent"] == b'"SIMPLE_QA"'  # Validates intent was saved (orjson bytes)
+        assert b"Generated Answer" in fields["messages"]  # Validates message history saved
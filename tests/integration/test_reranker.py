@@ -1,6 +1,6 @@
 import asyncio
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from src.agents.orchestrator import AdminOrchestrator
 from src.agents.state import UserProfile
 
@@ -56,36 +56,33 @@ async def test_reranker_retrieve_direct():
     # Mock QdrantVectorStore to avoid initialization errors
     with (
         patch("skills.legal_retriever.main.QdrantVectorStore") as mock_vectorstore_cls,
-        patch("skills.legal_retriever.main._get_embeddings"),
+        patch("skills.legal_retriever.main._get_embeddings") as mock_embed_fn,
         patch("skills.legal_retriever.main._get_qdrant_client"),
     ):
+        mock_embed_fn.return_value.embed_query.return_value = [0.1, 0.2]
         # Mock vector store instance
         mock_vs = mock_vectorstore_cls.return_value
 
-        # Mock asimilarity_search (async)
+        # Mock similarity_search_with_score_by_vector (run in the executor)
         from langchain_core.documents import Document
 
-        # Create a coroutine mock
-        async def mock_asimilarity_search(*args, **kwargs):
-            return [
-                Document(page_content="Doc 1", metadata={"source": "url1"}),
-                Document(page_content="Doc 2", metadata={"source": "url2"}),
-            ]
-
-        mock_vs.asimilarity_search.side_effect = mock_asimilarity_search
+        mock_vs.similarity_search_with_score_by_vector.return_value = [
+            (Document(page_content="Doc 1", metadata={"source": "url1"}), 0.8),
+            (Document(page_content="Doc 2", metadata={"source": "url2"}), 0.7),
+        ]
 
         with patch("skills.legal_retriever.main.get_reranker") as mock_get_reranker:
             mock_reranker = MagicMock()
-            mock_reranker.rerank.return_value = [
+            mock_reranker.arerank = AsyncMock(return_value=[
                 {"content": "Doc 1", "source": "url1", "score": 0.9}
-            ]
+            ])
             mock_get_reranker.return_value = mock_reranker
 
             # Run
             await retrieve_legal_info("query", user_profile=profile)
 
             # Verify Reranker called with profile
-            args, kwargs = mock_reranker.rerank.call_args
+            args, kwargs = mock_reranker.arerank.call_args
             called_profile = kwargs.get("user_profile")
 
             assert (
@@ -94,6 +91,52 @@ async def test_reranker_retrieve_direct():
             print("SUCCESS: Reranker was called with UserProfile.")
 
 
+@pytest.mark.asyncio
+async def test_rerank_batcher_coalesces_concurrent_requests():
+    """Concurrent submissions share one predict() call and get their own slice back."""
+    from src.shared.reranker import RerankBatcher
+
+    model = MagicMock()
+    model.predict.side_effect = lambda pairs, batch_size: [float(len(d)) for _, d in pairs]
+    batcher = RerankBatcher(model, max_batch=8, max_wait_s=0.05)
+
+    first, second = await asyncio.gather(
+        batcher.submit([("q1", "a"), ("q1", "bb")]),
+        batcher.submit([("q2", "ccc")]),
+    )
+
+    assert first == [1.0, 2.0]
+    assert second == [3.0]
+    model.predict.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_rerank_batcher_propagates_errors():
+    from src.shared.reranker import RerankBatcher
+
+    model = MagicMock()
+    model.predict.side_effect = RuntimeError("OOM")
+    batcher = RerankBatcher(model, max_wait_s=0.001)
+
+    with pytest.raises(RuntimeError):
+        await batcher.submit([("q", "doc")])
+
+
+def test_reranker_onnx_backend_falls_back_to_torch():
+    """If the ONNX export cannot be loaded, the PyTorch cross-encoder is used."""
+    from src.shared.reranker import Reranker
+
+    with patch("src.shared.reranker.CrossEncoder") as mock_cross_encoder:
+        torch_model = MagicMock()
+        mock_cross_encoder.side_effect = [RuntimeError("no onnxruntime"), torch_model]
+
+        reranker = Reranker(backend="onnx")
+
+        assert reranker.model is torch_model
+        assert mock_cross_encoder.call_args_list[0].kwargs["backend"] == "onnx"
+        assert mock_cross_encoder.call_args_list[1].kwargs == {}
+
+
 if __name__ == "__main__":
     asyncio.run(test_layer3_reranker_integration())
     asyncio.run(test_reranker_retrieve_direct())
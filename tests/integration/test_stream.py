@@ -12,7 +12,7 @@ async def test_chat_stream_endpoint(ac: AsyncClient):
         yield {"type": "token", "content": " response"}
 
     with patch("src.main.orchestrator") as mock_orch:
-        mock_orch.stream_query = mock_stream_query
+        mock_orch.bounded_stream_query = mock_stream_query
 
         # Streaming responses in httpx require reading the stream or just fetching it.
         # Since FastAPI StreamingResponse sends data as it comes, we can just GET request.
@@ -27,9 +27,9 @@ async def test_chat_stream_endpoint(ac: AsyncClient):
         
         text = response.text
         # Check standard SSE formatting
-        assert "data: {\"type\": \"status\", \"content\": \"Analysing request...\"}\n\n" in text
-        assert "data: {\"type\": \"token\", \"content\": \"Test\"}\n\n" in text
-        assert "data: {\"type\": \"token\", \"content\": \" response\"}\n\n" in text
+        assert "data: {\"type\":\"status\",\"content\":\"Analysing request...\"}\n\n" in text
+        assert "data: {\"type\":\"token\",\"content\":\"Test\"}\n\n" in text
+        assert "data: {\"type\":\"token\",\"content\":\" response\"}\n\n" in text
         assert "data: [DONE]\n\n" in text
 
 @pytest.mark.asyncio
@@ -101,3 +101,87 @@ async def test_chat_stream_valid_request_passes_validation():
                 headers={"X-API-Key": "test-key"},
             ) as response:
                 assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_translate_stream_endpoint():
+    async def mock_translate_stream(text, target_language):
+        assert target_language == "English"
+        yield "Residence "
+        yield "permit"
+
+    with patch("src.main.translate_admin_text_stream", side_effect=mock_translate_stream):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            async with client.stream(
+                "POST",
+                "/translate/stream",
+                json={"text": "Titre de séjour", "language": "en"},
+                headers={"X-API-Key": "test-key"},
+            ) as response:
+                assert response.status_code == 200
+                assert "text/event-stream" in response.headers["content-type"]
+
+                events = []
+                async for line in response.aiter_lines():
+                    if line.startswith("data: "):
+                        data = line[6:]
+                        if data == "[DONE]":
+                            break
+                        events.append(json.loads(data))
+
+    assert events == [
+        {"type": "token", "content": "Residence "},
+        {"type": "token", "content": "permit"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_chat_stream_error_event_is_valid_json():
+    """Exception messages with quotes must not break the SSE JSON payload."""
+
+    async def failing_stream_query(query, user_lang, session_id, model=None):
+        yield {"type": "token", "content": "Bonjour é"}
+        raise RuntimeError('bad "quote"')
+
+    with patch("src.main.orchestrator.stream_query", side_effect=failing_stream_query):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            async with client.stream(
+                "POST",
+                "/chat/stream",
+                json={"query": "Test", "language": "fr", "session_id": "123"},
+                headers={"X-API-Key": "test-key"},
+            ) as response:
+                lines = [line[6:] async for line in response.aiter_lines() if line.startswith("data: ")]
+
+    assert lines[-1] == "[DONE]"
+    assert [json.loads(data) for data in lines[:-1]] == [
+        {"type": "token", "content": "Bonjour é"},
+        {"type": "error", "content": 'bad "quote"'},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_chat_streams_when_client_accepts_event_stream():
+    """/chat answers with the /chat/stream SSE response when asked for text/event-stream."""
+
+    async def mock_stream_query(query, user_lang, session_id, model=None):
+        yield {"type": "token", "content": "Bonjour"}
+
+    with (
+        patch("src.main.orchestrator.stream_query", side_effect=mock_stream_query),
+        patch("src.main.orchestrator.handle_query") as mock_handle,
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                "/chat",
+                json={"query": "Test", "language": "fr", "session_id": "123"},
+                headers={"X-API-Key": "test-key", "Accept": "text/event-stream"},
+            )
+
+    assert response.status_code == 200
+    assert "text/event-stream" in response.headers["content-type"]
+    assert response.text == 'data: {"type":"token","content":"Bonjour"}\n\ndata: [DONE]\n\n'
+    mock_handle.assert_not_called()
@@ -0,0 +1,24 @@
+import json
+from logging.handlers import QueueHandler
+from unittest.mock import patch
+
+from src.utils.audit import get_audit_logger
+
+
+def test_audit_entries_are_written_by_background_listener(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "logs").mkdir()
+    stops = []
+
+    with patch("src.utils.audit.atexit.register", side_effect=stops.append):
+        audit = get_audit_logger("test_audit_background")
+    try:
+        assert all(isinstance(h, QueueHandler) for h in audit.handlers)
+        audit.info("Query successfully processed.", extra={"audit_data": {"session_id": "s1"}})
+    finally:
+        # QueueListener.stop drains the queue before returning
+        stops[0]()
+
+    entry = json.loads((tmp_path / "logs" / "audit.log").read_text(encoding="utf-8"))
+    assert entry["message"] == "Query successfully processed."
+    assert entry["audit_data"] == {"session_id": "s1"}
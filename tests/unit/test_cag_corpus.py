@@ -0,0 +1,57 @@
+import json
+
+from src.shared.cag_corpus import CagCorpus
+
+CLUSTERS = [
+    {
+        "id": "c001",
+        "label": "renouvellement titre de séjour",
+        "size": 40,
+        "centroid": [1.0, 0.0, 0.0],
+        "passages": [
+            {
+                "source": "service-public",
+                "title": "Titre de séjour",
+                "content": "Délai {2 mois}",
+            }
+        ],
+    },
+    {
+        "id": "c002",
+        "label": "acte de naissance",
+        "size": 12,
+        "centroid": [0.0, 1.0, 0.0],
+        "passages": [
+            {"source": "service-public", "title": "Acte", "content": "En ligne"}
+        ],
+    },
+]
+
+
+def test_match_nearest_cluster_above_threshold():
+    corpus = CagCorpus(CLUSTERS, threshold=0.85)
+
+    assert corpus.match([0.9, 0.1, 0.0])["id"] == "c001"
+    assert corpus.match([0.1, 2.0, 0.0])["id"] == "c002"
+    # Between clusters: below threshold for both
+    assert corpus.match([1.0, 1.0, 0.0]) is None
+    # Wrong dimension (different embedding model) never matches
+    assert corpus.match([1.0, 0.0]) is None
+
+
+def test_corpus_text_contains_every_cluster():
+    text = CagCorpus(CLUSTERS, threshold=0.85).text
+
+    assert "### renouvellement titre de séjour" in text
+    assert "### acte de naissance" in text
+    assert "Content: Délai {2 mois}" in text
+
+
+def test_load_skips_clusters_without_passages(tmp_path):
+    path = tmp_path / "corpus.json"
+    empty = {**CLUSTERS[1], "passages": []}
+    path.write_text(json.dumps({"clusters": [CLUSTERS[0], empty]}), encoding="utf-8")
+
+    corpus = CagCorpus.load(str(path), threshold=0.85)
+
+    assert [c["id"] for c in corpus.clusters] == ["c001"]
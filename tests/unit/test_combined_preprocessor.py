@@ -0,0 +1,56 @@
+import json
+
+import pytest
+from unittest.mock import patch
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from src.agents.preprocessor import CombinedPreprocessor
+
+
+async def run_with_response(response: str, **kwargs):
+    fake_llm = FakeListChatModel(responses=[response])
+    with patch("src.agents.preprocessor.get_llm", return_value=fake_llm):
+        return await CombinedPreprocessor().run(**kwargs)
+
+
+@pytest.mark.asyncio
+async def test_combined_call_returns_all_steps():
+    response = json.dumps(
+        {
+            "core_goal": "Obtenir un permis de conduire",
+            "rewritten_query": "Permis de conduire pour un résident vietnamien",
+            "intent": "complex_procedure",
+            "profile": {"nationality": "Vietnamienne", "language": "fr", "unknown_field": 1, "age": None},
+        }
+    )
+    history = [HumanMessage(content="Je veux un permis"), AIMessage(content="Quelle nationalité ?")]
+
+    result = await run_with_response(response, query="Je suis vietnamienne", history=history)
+
+    assert result.core_goal == "Obtenir un permis de conduire"
+    assert result.rewritten_query == "Permis de conduire pour un résident vietnamien"
+    assert result.intent == "COMPLEX_PROCEDURE"
+    # Unknown and null fields are dropped
+    assert result.profile == {"nationality": "Vietnamienne", "language": "fr"}
+
+
+@pytest.mark.asyncio
+async def test_combined_call_keeps_goal_and_first_turn_query():
+    response = json.dumps(
+        {"core_goal": None, "rewritten_query": "How to get a visa in France", "intent": "WHATEVER", "profile": {"language": "fr"}}
+    )
+
+    result = await run_with_response(response, query="how to get a visa", history=[], current_goal=None)
+
+    assert result.core_goal is None
+    # No history and no goal: nothing to resolve, the query is kept as typed
+    assert result.rewritten_query == "how to get a visa"
+    assert result.intent == "UNKNOWN"
+    # Same English correction as ProfileExtractor
+    assert result.profile == {"language": "en"}
+
+
+@pytest.mark.asyncio
+async def test_combined_call_invalid_json_returns_none():
+    assert await run_with_response("not json", query="Bonjour", history=[]) is None
@@ -0,0 +1,88 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.shared.context_pruner import (
+    allocate_budget,
+    dedupe_docs,
+    mmr_select,
+    prune_context,
+)
+
+
+@pytest.fixture(autouse=True)
+def _char_token_estimate():
+    # Deterministic token counts (4 chars = 1 token), independent of tiktoken downloads
+    with patch("src.shared.context_pruner._get_encoding", return_value=None):
+        yield
+
+
+def test_dedupe_ignores_case_and_whitespace():
+    docs = [
+        {"source": "a", "content": "Le titre de séjour  se renouvelle\nen préfecture."},
+        {"source": "b", "content": "le titre de séjour se renouvelle en Préfecture."},
+        {"source": "c", "content": "Acte de naissance"},
+    ]
+
+    assert [d["source"] for d in dedupe_docs(docs)] == ["a", "c"]
+
+
+def test_mmr_prefers_diverse_documents():
+    query = [1.0, 1.0]
+    docs = [
+        [1.0, 0.2],  # most relevant
+        [1.0, 0.19],  # near-duplicate of the first
+        [0.1, 1.0],  # different angle, slightly less relevant
+    ]
+
+    assert mmr_select(query, docs, k=2, lambda_mult=0.6) == [0, 2]
+    # Pure relevance keeps the near-duplicate
+    assert mmr_select(query, docs, k=2, lambda_mult=1.0) == [0, 1]
+
+
+def test_allocate_budget_redistributes_unused_share():
+    # The short document only needs 10 of its 50-token share
+    assert allocate_budget([10, 500, 500], [1.0, 1.0, 2.0], budget=150) == [10, 46, 93]
+    assert allocate_budget([10, 20], [1.0, 1.0], budget=150) == [10, 20]
+    # No relevance information: equal shares
+    assert allocate_budget([100, 100], [0.0, 0.0], budget=100) == [50, 50]
+
+
+@pytest.mark.asyncio
+async def test_prune_context_selects_and_budgets():
+    docs = [
+        {"source": "a", "content": "a" * 400, "vector_score": 0.8},
+        {"source": "a-copy", "content": "A" * 400, "vector_score": 0.8},
+        {"source": "b", "content": "b" * 400, "vector_score": 0.7},
+        {"source": "c", "content": "c" * 400, "vector_score": 0.6},
+    ]
+    with patch("src.shared.context_pruner.embedding_cache") as mock_cache:
+        mock_cache.get_or_embed = AsyncMock(return_value=[1.0, 1.0])
+        mock_cache.get_or_embed_many = AsyncMock(
+            return_value=[[1.0, 0.2], [1.0, 0.19], [0.1, 1.0]]
+        )
+
+        pruned = await prune_context(
+            "query", docs, k=2, lambda_mult=0.6, token_budget=100
+        )
+
+    # Exact copy dropped, then MMR keeps the best and the most different one
+    assert [d["source"] for d in pruned] == ["a", "c"]
+    assert sum(len(d["content"]) for d in pruned) <= 100 * 4
+    # The budget follows relevance: "a" is the closer one to the query
+    assert len(pruned[0]["content"]) > len(pruned[1]["content"])
+    assert docs[0]["content"] == "a" * 400
+
+
+@pytest.mark.asyncio
+async def test_prune_context_without_embeddings_keeps_top_k():
+    docs = [{"source": str(i), "content": f"document {i}"} for i in range(4)]
+    with patch("src.shared.context_pruner.embedding_cache") as mock_cache:
+        mock_cache.get_or_embed = AsyncMock(
+            side_effect=RuntimeError("model unavailable")
+        )
+
+        pruned = await prune_context("query", docs, k=2, token_budget=100)
+
+    assert [d["source"] for d in pruned] == ["0", "1"]
+    assert pruned[0]["content"] == "document 0"
@@ -17,11 +17,9 @@ async def test_legal_agent_groundedness_failure():
     assert res is False
     
     # CASE 2: Exception in LLM -> returns True (Line 141)
-    with patch("src.agents.legal_agent.get_llm") as mock_get:
-        mock_llm = MagicMock()
-        mock_llm.ainvoke.side_effect = Exception("LLM Error")
-        mock_get.return_value = mock_llm
-        
+    mock_chain = MagicMock()
+    mock_chain.ainvoke = AsyncMock(side_effect=Exception("LLM Error"))
+    with patch.object(agent, "_get_chain", return_value=mock_chain):
         res = await agent._verify_groundedness("query", [{"content": "x"}], {}, state)
         assert res is True  # Default to True on exception
 
@@ -54,8 +52,8 @@ async def test_legal_agent_insufficient_context_fallback():
 async def test_memory_manager_exceptions():
     """Hồ sơ: memory/manager.py - Lines 37, 57 (exception handling)"""
     mock_redis = MagicMock()
-    mock_redis.get.side_effect = Exception("Redis error")
-    mock_redis.set.side_effect = Exception("Redis error")
+    mock_redis.hgetall.side_effect = Exception("Redis error")
+    mock_redis.hset.side_effect = Exception("Redis error")
     
     manager = MemoryManager()
     manager.redis_client = mock_redis
@@ -102,15 +100,17 @@ async def test_main_chat_stream_error_gen():
         async for chunk in response.body_iterator:
             events.append(chunk)
         
-        assert any("error" in e for e in events)
+        assert any(b"error" in e for e in events)
 
 def test_llm_factory_local():
     """Hồ sơ: llm_factory.py - local provider path"""
-    from src.utils.llm_factory import get_llm as get_llm_fn_local
+    from src.utils.llm_factory import get_llm as get_llm_fn_local, _build_llm
+    _build_llm.cache_clear()
     with patch("src.utils.llm_factory.ChatOpenAI") as mock_chat:
         get_llm_fn_local(model_override="Qwen Finetuned (Local)")
         args, kwargs = mock_chat.call_args
         assert kwargs.get("openai_api_key") == "local-placeholder"
+    _build_llm.cache_clear()
 
 @pytest.mark.asyncio
 async def test_orchestrator_handle_query_error():
@@ -141,10 +141,59 @@ async def test_orchestrator_call_llm_token_usage():
 
 def test_llm_factory_openai_mapping():
     """Hồ sơ: llm_factory.py - hitting GPT-4o mapping"""
-    from src.utils.llm_factory import get_llm as get_llm_fn
+    from src.utils.llm_factory import get_llm as get_llm_fn, _build_llm
+    _build_llm.cache_clear()
     with patch("src.utils.llm_factory.ChatOpenAI"):
         get_llm_fn(model_override="GPT-4o")
         # Just hitting lines 13-15
+    _build_llm.cache_clear()
+
+
 
 
+def test_llm_factory_shares_http_pool():
+    """Hồ sơ: llm_factory.py - every ChatOpenAI reuses the same httpx pool"""
+    from src.utils.llm_factory import get_llm as get_llm_fn, get_http_async_client, _build_llm
+    _build_llm.cache_clear()
+    with patch("src.utils.llm_factory.ChatOpenAI") as mock_chat:
+        get_llm_fn(model_override="GPT-4o")
+        get_llm_fn(model_override="Qwen Finetuned (Local)")
+        clients = [c.kwargs["http_async_client"] for c in mock_chat.call_args_list]
+        assert clients[0] is clients[1] is get_http_async_client()
+    _build_llm.cache_clear()
+
+
+def test_llm_factory_reuses_instances():
+    """Hồ sơ: llm_factory.py - identical settings share one ChatOpenAI"""
+    from src.utils.llm_factory import get_llm as get_llm_fn, _build_llm
+    _build_llm.cache_clear()
+    with patch("src.utils.llm_factory.ChatOpenAI", side_effect=lambda **kw: MagicMock()) as mock_chat:
+        first = get_llm_fn(temperature=0, streaming=True, provider_override="openai")
+        assert get_llm_fn(temperature=0, streaming=True, provider_override="openai") is first
+        assert get_llm_fn(temperature=0.3, streaming=True, provider_override="openai") is not first
+        assert mock_chat.call_count == 2
+    _build_llm.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_llm_factory_closes_http_pool():
+    """Hồ sơ: llm_factory.py - shutdown closes the pool, next use opens a fresh one"""
+    from src.utils.llm_factory import aclose_http_async_client, get_http_async_client
+    client = get_http_async_client()
+    await aclose_http_async_client()
+    assert client.is_closed
+    assert get_http_async_client() is not client
+    # Closing twice (or before first use) is a no-op
+    await aclose_http_async_client()
+    await aclose_http_async_client()
+
 
+def test_voice_skill_reuses_sync_http_pool():
+    """Hồ sơ: polyglot_voice - Whisper/TTS clients share one httpx pool"""
+    from skills.polyglot_voice.main import _get_client
+    from src.utils.llm_factory import get_http_client
+    with patch("skills.polyglot_voice.main.OpenAI") as mock_openai:
+        _get_client()
+        _get_client()
+    clients = [c.kwargs["http_client"] for c in mock_openai.call_args_list]
+    assert clients[0] is clients[1] is get_http_client()
@@ -0,0 +1,96 @@
+import asyncio
+import time
+import pytest
+from unittest.mock import patch
+
+from src.utils.embedding_cache import DOCUMENT, QUERY, EmbeddingCache
+
+
+def test_key_is_normalized():
+    """Case, surrounding whitespace and Unicode form do not change the key."""
+    assert EmbeddingCache._key("  Passeport ") == EmbeddingCache._key("passeport")
+    # NFKC folds the "ﬁ" ligature into "fi"
+    assert EmbeddingCache._key("ﬁche") == EmbeddingCache._key("fiche")
+    assert EmbeddingCache._key("passeport") != EmbeddingCache._key("visa")
+
+
+def test_query_and_document_keys_are_separate():
+    assert EmbeddingCache._key("passeport", QUERY) != EmbeddingCache._key("passeport", DOCUMENT)
+
+    cache = EmbeddingCache()
+    cache.put("passeport", [1.0], kind=DOCUMENT)
+    assert cache.get("passeport", kind=QUERY) is None
+    assert cache.get("passeport", kind=DOCUMENT) == [1.0]
+
+
+def test_lru_eviction_and_stats():
+    cache = EmbeddingCache(maxsize=2)
+    cache.put("a", [1.0])
+    cache.put("b", [2.0])
+    assert cache.get("a") == [1.0]  # "a" becomes most recently used
+    cache.put("c", [3.0])  # evicts "b"
+
+    assert cache.get("b") is None
+    assert cache.get("c") == [3.0]
+    assert cache.stats() == {"hits": 2, "misses": 1, "hit_rate": 2 / 3, "size": 2}
+
+
+def test_expired_entries_are_misses():
+    cache = EmbeddingCache(ttl=10)
+    with patch("src.utils.embedding_cache.time.monotonic", return_value=100.0):
+        cache.put("passeport", [1.0])
+    with patch("src.utils.embedding_cache.time.monotonic", return_value=111.0):
+        assert cache.get("passeport") is None
+    assert cache.stats()["size"] == 0
+
+
+@pytest.mark.asyncio
+async def test_get_or_embed_embeds_once():
+    """Variants of one query share a single embedding call, made on the normalized text."""
+    cache = EmbeddingCache()
+
+    def slow_embed(text):
+        time.sleep(0.01)  # runs in the retrieval executor
+        return [0.1, 0.2]
+
+    with patch("skills.legal_retriever.main._get_embeddings") as mock_embed_fn:
+        mock_embed_fn.return_value.embed_query.side_effect = slow_embed
+
+        first, second = await asyncio.gather(
+            cache.get_or_embed(" Passeport"), cache.get_or_embed("passeport")
+        )
+        third = await cache.get_or_embed("passeport ")
+
+    assert first == second == third == [0.1, 0.2]
+    mock_embed_fn.return_value.embed_query.assert_called_once_with("passeport")
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_or_embed_many_batches_only_misses():
+    cache = EmbeddingCache()
+    cache.put("titre de séjour", [0.0], kind=DOCUMENT)
+    cache.put("visa", [9.0])  # query embedding: not reused for documents
+
+    with patch("skills.legal_retriever.main._get_embeddings") as mock_embed_fn:
+        mock_embed_fn.return_value.embed_documents.return_value = [[1.0], [2.0]]
+
+        result = await cache.get_or_embed_many(["visa", "Titre de séjour", "passeport"])
+
+    assert result == [[1.0], [0.0], [2.0]]
+    mock_embed_fn.return_value.embed_documents.assert_called_once_with(["visa", "passeport"])
+    assert cache.get("passeport", kind=DOCUMENT) == [2.0]
+
+
+@pytest.mark.asyncio
+async def test_get_or_embed_many_embeds_queries_as_queries():
+    cache = EmbeddingCache()
+
+    with patch("skills.legal_retriever.main._get_embeddings") as mock_embed_fn:
+        mock_embed_fn.return_value.embed_query.side_effect = lambda text: [float(len(text))]
+
+        result = await cache.get_or_embed_many(["Visa", "passeport"], kind=QUERY)
+
+    assert result == [[4.0], [9.0]]
+    mock_embed_fn.return_value.embed_documents.assert_not_called()
+    assert cache.get("visa") == [4.0]
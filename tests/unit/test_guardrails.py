@@ -132,6 +132,22 @@ async def test_check_hallucination_detected():
             assert result is False
 
 
+@pytest.mark.asyncio
+async def test_check_hallucination_skips_llm_for_empty_answer():
+    """An empty answer cannot be ungrounded: no grounding call is made."""
+    with patch("src.shared.guardrails.ChatOpenAI") as mock_llm_cls:
+        mock_llm_cls.return_value = MagicMock()
+
+        from src.shared.guardrails import GuardrailManager
+
+        gm = GuardrailManager()
+
+        with patch("src.shared.guardrails.ChatPromptTemplate") as mock_prompt:
+            assert await gm.check_hallucination(context="Le passeport coûte 86€.", answer="  \n") is True
+            mock_prompt.from_messages.assert_not_called()
+        assert gm._grounding_chain is None
+
+
 def test_add_disclaimer_french():
     """French disclaimer should be fully in French."""
     with patch("src.shared.guardrails.ChatOpenAI"):
@@ -163,3 +179,47 @@ def test_add_disclaimer_unknown_language_defaults_to_french():
 
         result = gm.add_disclaimer("Test answer", "de")
         assert result == "Test answer"
+
+
+@pytest.mark.asyncio
+async def test_validate_topic_reports_personal_route():
+    """Approved queries about the user themselves are routed as personal."""
+    with patch("src.shared.guardrails.ChatOpenAI") as mock_llm_cls:
+        mock_llm_cls.return_value = MagicMock()
+
+        from src.shared.guardrails import GuardrailManager, TOPIC_ROUTE_PERSONAL
+
+        gm = GuardrailManager()
+        with patch("src.shared.guardrails.ChatPromptTemplate") as mock_prompt:
+            mock_chain = MagicMock()
+            mock_chain.ainvoke = AsyncMock(return_value="APPROVED: PERSONAL")
+            mock_prompt.from_messages.return_value.__or__ = MagicMock(
+                return_value=MagicMock(__or__=MagicMock(return_value=mock_chain))
+            )
+
+            is_valid, reason = await gm.validate_topic("Je m'appelle Minh")
+            assert is_valid is True
+            assert reason == TOPIC_ROUTE_PERSONAL
+
+
+@pytest.mark.asyncio
+async def test_validate_topic_builds_its_chain_once():
+    """The static prompt is compiled into a chain on first use, then reused."""
+    with patch("src.shared.guardrails.ChatOpenAI") as mock_llm_cls:
+        mock_llm_cls.return_value = MagicMock()
+
+        from src.shared.guardrails import GuardrailManager
+
+        gm = GuardrailManager()
+        with patch("src.shared.guardrails.ChatPromptTemplate") as mock_prompt:
+            mock_chain = MagicMock()
+            mock_chain.ainvoke = AsyncMock(return_value="APPROVED")
+            mock_prompt.from_messages.return_value.__or__ = MagicMock(
+                return_value=MagicMock(__or__=MagicMock(return_value=mock_chain))
+            )
+
+            await gm.validate_topic("Comment obtenir un passeport ?")
+            await gm.validate_topic("Et pour un titre de séjour ?")
+
+            mock_prompt.from_messages.assert_called_once()
+            assert mock_chain.ainvoke.await_count == 2
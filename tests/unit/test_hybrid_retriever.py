@@ -9,9 +9,10 @@ Tests cover:
   - Graceful fallback when corpus has no tokens
   - top_n truncation
   - module-level hybrid_rerank convenience function
+  - rrf_fuse over several ranked document lists
 """
 
-from src.shared.hybrid_retriever import HybridRetriever, hybrid_rerank, _rrf_merge
+from src.shared.hybrid_retriever import HybridRetriever, hybrid_rerank, rrf_fuse, _rrf_merge
 
 
 # ---------------------------------------------------------------------------
@@ -175,3 +176,11 @@ def test_hybrid_rerank_convenience():
 def test_hybrid_rerank_empty():
     """Convenience function with empty docs → empty list."""
     assert hybrid_rerank([], "query") == []
+
+
+def test_rrf_fuse_dedupes_and_rewards_consensus():
+    """A doc ranked by several paraphrase searches beats single-list docs."""
+    a, b, c = _docs("a", "b", "c")
+    fused = rrf_fuse([[a, b], [dict(b), c]])
+    assert [d["content"] for d in fused] == ["b", "a", "c"]
+    assert rrf_fuse([[a, b], [b, c]], top_n=1) == [b]
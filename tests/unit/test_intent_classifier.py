@@ -63,3 +63,61 @@ async def test_classify_exception_handling():
             classifier = IntentClassifier()
             intent = await classifier.classify("Some question")
             assert intent == Intent.UNKNOWN
+
+
+@pytest.mark.asyncio
+async def test_classify_local_backend():
+    mock_pipeline = MagicMock(
+        return_value={
+            "labels": ["a request for help filling out a specific form"],
+            "scores": [0.91],
+        }
+    )
+    with patch("src.agents.intent_classifier.settings") as mock_settings, patch(
+        "src.agents.intent_classifier._get_zero_shot_pipeline",
+        return_value=mock_pipeline,
+    ), patch("src.agents.intent_classifier.get_llm") as mock_get_llm:
+        mock_settings.INTENT_CLASSIFIER_BACKEND = "local"
+        classifier = IntentClassifier()
+        intent = await classifier.classify("Help me fill Cerfa 12345")
+        assert intent == Intent.FORM_FILLING
+        mock_get_llm.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_classify_local_backend_falls_back_to_llm():
+    with patch("src.agents.intent_classifier.settings") as mock_settings, patch(
+        "src.agents.intent_classifier._get_zero_shot_pipeline",
+        side_effect=ImportError("transformers missing"),
+    ), patch("src.agents.intent_classifier.get_llm") as mock_get_llm:
+        mock_settings.INTENT_CLASSIFIER_BACKEND = "local"
+        mock_get_llm.return_value = MagicMock()
+
+        mock_chain = MagicMock()
+        mock_chain.ainvoke = AsyncMock(return_value=MagicMock(content="SIMPLE_QA"))
+
+        with patch("langchain_core.prompts.ChatPromptTemplate.__or__", return_value=mock_chain):
+            classifier = IntentClassifier()
+            intent = await classifier.classify("How much is a passport?")
+            assert intent == Intent.SIMPLE_QA
+
+
+@pytest.mark.asyncio
+async def test_classify_local_backend_does_not_retry_failed_load():
+    with patch("src.agents.intent_classifier.settings") as mock_settings, patch(
+        "src.agents.intent_classifier._get_zero_shot_pipeline",
+        side_effect=OSError("model not found"),
+    ) as mock_loader, patch("src.agents.intent_classifier.get_llm") as mock_get_llm:
+        mock_settings.INTENT_CLASSIFIER_BACKEND = "local"
+        mock_get_llm.return_value = MagicMock()
+
+        mock_chain = MagicMock()
+        mock_chain.ainvoke = AsyncMock(return_value=MagicMock(content="SIMPLE_QA"))
+
+        with patch("langchain_core.prompts.ChatPromptTemplate.__or__", return_value=mock_chain):
+            classifier = IntentClassifier()
+            await classifier.classify("How much is a passport?")
+            intent = await classifier.classify("Where is the prefecture?")
+
+        assert intent == Intent.SIMPLE_QA
+        mock_loader.assert_called_once()
@@ -205,20 +205,15 @@ def test_rule4_fr_on_fr_state_stays_french(resolver):
 class MockProfile:
     """Mock of AgentState.user_profile for testing apply_to_state."""
 
+    # Mirrors the pydantic class attribute apply_to_state reads the field names from
+    model_fields = {"language": None, "name": None, "nationality": None, "location": None}
+
     def __init__(self):
         self.language = "French"
         self.name = None
         self.nationality = None
         self.location = None
 
-    def model_dump(self):
-        return {
-            "language": self.language,
-            "name": self.name,
-            "nationality": self.nationality,
-            "location": self.location,
-        }
-
 
 def test_apply_to_state_switches_language(resolver):
     """apply_to_state updates profile language when detection is valid."""
@@ -274,3 +269,57 @@ def test_apply_to_state_returns_false_when_no_changes(resolver):
     # Frontend is 'en' → Rule 1 applies, returns "English" which equals current
     assert updated is False
     assert profile.language == "English"
+
+
+def test_apply_to_state_ignores_unknown_fields_on_real_profile(resolver):
+    """Only UserProfile fields are merged; extra keys from the extractor are dropped."""
+    from src.agents.state import UserProfile
+
+    profile = UserProfile(language="French")
+    updated = resolver.apply_to_state(
+        extracted_data={"language": None, "visa_type": "VLS-TS", "favourite_colour": "blue"},
+        user_lang="fr",
+        state_profile=profile,
+        has_history=False,
+    )
+    assert updated is True
+    assert profile.visa_type == "VLS-TS"
+    assert not hasattr(profile, "favourite_colour")
+
+
+# ---------------------------------------------------------------------------
+# detect_text_language()
+# ---------------------------------------------------------------------------
+
+
+def test_detect_text_language_on_answers(resolver):
+    assert resolver.detect_text_language(
+        "To renew your titre de séjour, you need to book an appointment at the préfecture."
+    ) == "English"
+    assert resolver.detect_text_language(
+        "Pour renouveler votre titre de séjour, vous devez prendre rendez-vous à la préfecture."
+    ) == "French"
+    assert resolver.detect_text_language(
+        "Để gia hạn thẻ cư trú, bạn cần đặt lịch hẹn tại tỉnh và mang theo giấy tờ."
+    ) == "Vietnamese"
+
+
+def test_detect_text_language_mixed_answer_returns_none(resolver):
+    """An English opening followed by a quoted French article is not 'English'."""
+    english = (
+        "To renew your residence permit, you need to book "
+        "an appointment with the prefecture. " * 8
+    )
+    french = (
+        "Article L433-1 : La carte de séjour est délivrée à l'étranger qui en fait "
+        "la demande et qui justifie de ses moyens d'existence dans les conditions "
+        "prévues par la loi. " * 5
+    )
+    assert resolver.detect_text_language(english) == "English"
+    assert resolver.detect_text_language(english + french) is None
+    assert resolver.detect_text_language(english + english) == "English"
+
+
+def test_detect_text_language_unsure_returns_none(resolver):
+    # Too short to tell
+    assert resolver.detect_text_language("Préfecture") is None
@@ -1,7 +1,8 @@
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
-from src.agents.legal_agent import LegalResearchAgent
+from src.agents.legal_agent import SYNTHESIS_PROMPT_VERSION, LegalResearchAgent
 from src.agents.state import AgentState
+from src.config import settings
 
 
 @pytest.mark.asyncio
@@ -96,3 +97,481 @@ async def test_legal_agent_insufficient_context():
             # Should call fallback when context is insufficient/irrelevant
             agent._ask_clarification_fallback.assert_called()
             assert response == "Fallback Answer"
+
+
+@pytest.mark.asyncio
+async def test_legal_agent_semantic_cache_hit_skips_pipeline():
+    with (
+        patch("src.agents.legal_agent.settings") as mock_settings,
+        patch("src.agents.legal_agent.semantic_cache") as mock_cache,
+        patch(
+            "src.agents.legal_agent.retrieve_legal_info", new_callable=AsyncMock
+        ) as mock_retrieve,
+    ):
+        mock_settings.SEMANTIC_CACHE_ENABLED = True
+        mock_settings.CAG_ENABLED = False
+        mock_settings.LEGAL_QUERY_EXPANSIONS = 0
+        mock_cache.get = AsyncMock(return_value="Cached answer")
+
+        agent = LegalResearchAgent()
+        agent._embed_query = AsyncMock(return_value=[0.1, 0.2])
+
+        from src.agents.state import UserProfile
+
+        state = AgentState(
+            session_id="test", messages=[], user_profile=UserProfile(language="English")
+        )
+        res = await agent.run("how to renew my residence permit", state)
+
+        assert res == "Cached answer"
+        mock_cache.get.assert_awaited_once_with([0.1, 0.2], namespace=f"{SYNTHESIS_PROMPT_VERSION}:English")
+        # Retrieval is started speculatively and cancelled on the hit,
+        # possibly before it even reached the retriever
+        assert mock_retrieve.call_count <= 1
+
+
+@pytest.mark.asyncio
+async def test_legal_agent_cache_hit_cancels_speculative_retrieval():
+    import asyncio
+
+    started = asyncio.Event()
+
+    async def slow_retrieve(*args, **kwargs):
+        started.set()
+        await asyncio.sleep(10)
+        return []
+
+    async def embed_after_retrieval_started(query):
+        await started.wait()
+        return [0.1, 0.2]
+
+    with (
+        patch("src.agents.legal_agent.settings") as mock_settings,
+        patch("src.agents.legal_agent.semantic_cache") as mock_cache,
+        patch("src.agents.legal_agent.retrieve_legal_info", side_effect=slow_retrieve),
+    ):
+        mock_settings.SEMANTIC_CACHE_ENABLED = True
+        mock_settings.CAG_ENABLED = False
+        mock_settings.LEGAL_QUERY_EXPANSIONS = 0
+        mock_cache.get = AsyncMock(return_value="Cached answer")
+
+        agent = LegalResearchAgent()
+        agent._embed_query = embed_after_retrieval_started
+
+        state = AgentState(session_id="test", messages=[])
+        res = await asyncio.wait_for(agent.run("titre de séjour", state), timeout=1)
+
+        assert res == "Cached answer"
+
+
+@pytest.mark.asyncio
+async def test_legal_agent_semantic_cache_stores_synthesized_answer_only():
+    with (
+        patch("src.agents.legal_agent.settings") as mock_settings,
+        patch("src.agents.legal_agent.semantic_cache") as mock_cache,
+        patch(
+            "src.agents.legal_agent.retrieve_legal_info", new_callable=AsyncMock
+        ) as mock_retrieve,
+    ):
+        from src.agents.legal_agent import INSUFFICIENT_CONTEXT_MESSAGE
+        from src.agents.state import UserProfile
+
+        mock_settings.SEMANTIC_CACHE_ENABLED = True
+        mock_settings.CAG_ENABLED = False
+        mock_settings.LEGAL_QUERY_EXPANSIONS = 0
+        mock_cache.get = AsyncMock(return_value=None)
+        mock_cache.set = AsyncMock()
+        mock_retrieve.return_value = [
+            {"content": "doc", "source": "url", "metadata": {"title": "T"}}
+        ]
+
+        agent = LegalResearchAgent()
+        agent._embed_query = AsyncMock(return_value=[0.1, 0.2])
+        agent._verify_groundedness = AsyncMock(return_value=True)
+        state = AgentState(
+            session_id="test", messages=[], user_profile=UserProfile(language="fr")
+        )
+
+        agent._synthesize_answer = AsyncMock(return_value="answer")
+        await agent.run("query", state)
+        mock_cache.set.assert_awaited_once_with([0.1, 0.2], "answer", namespace=f"{SYNTHESIS_PROMPT_VERSION}:fr")
+
+        mock_cache.set.reset_mock()
+        agent._synthesize_answer = AsyncMock(return_value=INSUFFICIENT_CONTEXT_MESSAGE)
+        await agent.run("query", state)
+        mock_cache.set.assert_not_called()
+
+
+def test_synthesis_prompt_prefix_is_static():
+    """The system message must not vary with the request, so prefix caching applies."""
+    agent = LegalResearchAgent()
+    first = agent.synthesis_prompt.format_messages(
+        context="doc A", query="q1", user_language="English"
+    )
+    second = agent.synthesis_prompt.format_messages(
+        context="doc B", query="q2", user_language="Vietnamese"
+    )
+
+    assert first[0].content == second[0].content
+    assert "Answer in Vietnamese:" in second[1].content
+
+
+def test_format_docs_layout_and_truncation():
+    from src.agents.legal_agent import _CONTENT_TRUNC
+
+    agent = LegalResearchAgent()
+    docs = [
+        {"source": "service-public", "metadata": {"title": "Passeport"}, "content": "x" * 2000},
+        {"content": "Article L.123"},
+    ]
+
+    assert agent._format_docs(docs) == (
+        f"Source: service-public\nTitle: Passeport\nContent: {'x' * _CONTENT_TRUNC}"
+        "\n\nSource: Unknown\nTitle: N/A\nContent: Article L.123"
+    )
+    assert agent._format_docs([]) == ""
+
+
+@pytest.mark.asyncio
+async def test_chains_are_built_once_per_model():
+    with patch("src.agents.legal_agent.get_llm") as mock_get_llm:
+        agent = LegalResearchAgent()
+        agent._run_chain = AsyncMock(return_value="Final Answer")
+
+        await agent._synthesize_answer("q1", "context", "fr")
+        await agent._synthesize_answer("q2", "context", "fr")
+        assert mock_get_llm.call_count == 1
+
+        # A different model gets its own chain
+        state = AgentState(session_id="test", metadata={"model": "GPT-4o"})
+        await agent._synthesize_answer("q3", "context", "fr", state=state)
+        assert mock_get_llm.call_count == 2
+        assert agent._run_chain.call_args_list[0].args[0] is agent._run_chain.call_args_list[1].args[0]
+
+
+def _groundedness_message(top_logprobs):
+    from langchain_core.messages import AIMessage
+
+    return AIMessage(
+        content=top_logprobs[0]["token"] if top_logprobs else "",
+        response_metadata={"logprobs": {"content": [{"top_logprobs": top_logprobs}]}},
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "top_logprobs, expected",
+    [
+        ([{"token": "YES", "logprob": -0.05}, {"token": "NO", "logprob": -3.0}], True),
+        # YES wins but is below the confidence threshold
+        ([{"token": "YES", "logprob": -0.6}, {"token": "NO", "logprob": -0.9}], False),
+        ([{"token": "NO", "logprob": -0.1}, {"token": " YES", "logprob": -2.4}], False),
+    ],
+)
+async def test_verify_groundedness_uses_logprobs(top_logprobs, expected):
+    agent = LegalResearchAgent()
+    chain = MagicMock()
+    chain.ainvoke = AsyncMock(return_value=_groundedness_message(top_logprobs))
+    agent._get_chain = MagicMock(return_value=chain)
+
+    assert await agent._verify_groundedness("query", [{"content": "doc"}], {}) is expected
+
+
+@pytest.mark.asyncio
+async def test_verify_groundedness_without_logprobs_reads_text():
+    from langchain_core.messages import AIMessage
+
+    agent = LegalResearchAgent()
+    chain = MagicMock()
+    chain.ainvoke = AsyncMock(return_value=AIMessage(content="YES"))
+    agent._get_chain = MagicMock(return_value=chain)
+
+    assert await agent._verify_groundedness("query", [{"content": "doc"}], {}) is True
+
+
+@pytest.mark.asyncio
+async def test_streamed_synthesis_stops_at_sentinel():
+    closed = []
+
+    async def astream(_input):
+        try:
+            for chunk in ["INSUFF", "ICIENT_CONTEXT", " and more text"]:
+                yield chunk
+        finally:
+            closed.append(True)
+
+    chain = MagicMock()
+    chain.astream = astream
+
+    agent = LegalResearchAgent()
+    agent._get_chain = MagicMock(return_value=chain)
+
+    res = await agent._synthesize_answer("query", "context", "fr")
+
+    from src.agents.legal_agent import INSUFFICIENT_CONTEXT_MESSAGE
+
+    assert res == INSUFFICIENT_CONTEXT_MESSAGE
+    # Draft and escalated stream both stopped early
+    assert closed == [True, True]
+
+
+@pytest.mark.asyncio
+async def test_streamed_synthesis_joins_chunks():
+    async def astream(_input):
+        for chunk in ["**[DONNER]**: ", "Oui."]:
+            yield chunk
+
+    chain = MagicMock()
+    chain.astream = astream
+
+    agent = LegalResearchAgent()
+    agent._get_chain = MagicMock(return_value=chain)
+
+    assert await agent._synthesize_answer("query", "context", "fr") == "**[DONNER]**: Oui."
+
+
+@pytest.mark.asyncio
+async def test_cag_hit_skips_retrieval_result():
+    from src.shared.cag_corpus import CagCorpus
+
+    corpus = CagCorpus(
+        [{"id": "c001", "label": "titre de séjour", "centroid": [1.0, 0.0],
+          "passages": [{"source": "service-public", "content": "Renouvellement en ligne"}]}],
+        threshold=0.85,
+    )
+    with (
+        patch("src.agents.legal_agent.settings") as mock_settings,
+        patch("src.agents.legal_agent.get_cag_corpus", return_value=corpus),
+        patch("src.agents.legal_agent.retrieve_legal_info", new_callable=AsyncMock),
+    ):
+        mock_settings.SEMANTIC_CACHE_ENABLED = False
+        mock_settings.CAG_ENABLED = True
+        mock_settings.LEGAL_QUERY_EXPANSIONS = 0
+
+        agent = LegalResearchAgent()
+        agent._embed_query = AsyncMock(return_value=[0.99, 0.05])
+        agent._run_chain = AsyncMock(return_value="CAG answer")
+        agent._verify_groundedness = AsyncMock()
+
+        res = await agent.run("renouveler titre de séjour", AgentState(session_id="test"))
+
+        assert res == "CAG answer"
+        assert agent._run_chain.call_args.args[1]["topic"] == "titre de séjour"
+        agent._verify_groundedness.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_cag_insufficient_falls_back_to_retrieval():
+    from src.shared.cag_corpus import CagCorpus
+
+    corpus = CagCorpus(
+        [{"id": "c001", "label": "titre de séjour", "centroid": [1.0, 0.0],
+          "passages": [{"source": "service-public", "content": "..."}]}],
+        threshold=0.85,
+    )
+    with (
+        patch("src.agents.legal_agent.settings") as mock_settings,
+        patch("src.agents.legal_agent.get_cag_corpus", return_value=corpus),
+        patch(
+            "src.agents.legal_agent.retrieve_legal_info", new_callable=AsyncMock
+        ) as mock_retrieve,
+    ):
+        mock_settings.SEMANTIC_CACHE_ENABLED = False
+        mock_settings.CAG_ENABLED = True
+        mock_settings.LEGAL_QUERY_EXPANSIONS = 0
+        mock_settings.LEGAL_SYNTHESIS_ESCALATION = False
+        mock_retrieve.return_value = [{"content": "doc", "source": "legi", "metadata": {}}]
+
+        agent = LegalResearchAgent()
+        agent._embed_query = AsyncMock(return_value=[1.0, 0.0])
+        agent._run_chain = AsyncMock(side_effect=["INSUFFICIENT_CONTEXT", "RAG answer"])
+        agent._verify_groundedness = AsyncMock(return_value=True)
+
+        res = await agent.run("titre de séjour", AgentState(session_id="test"))
+
+        assert res == "RAG answer"
+        agent._verify_groundedness.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_query_expansions_are_passed_to_retriever():
+    with (
+        patch("src.agents.legal_agent.settings") as mock_settings,
+        patch(
+            "src.agents.legal_agent.retrieve_legal_info", new_callable=AsyncMock
+        ) as mock_retrieve,
+    ):
+        mock_settings.LEGAL_QUERY_EXPANSIONS = 2
+        mock_retrieve.return_value = []
+        chain = MagicMock()
+        chain.ainvoke = AsyncMock(
+            return_value="- renouvellement carte de séjour\ntitre de séjour\n\nprolongation titre de séjour\nextra"
+        )
+        agent = LegalResearchAgent()
+        agent._get_chain = MagicMock(return_value=chain)
+
+        await agent._retrieve("titre de séjour", AgentState(session_id="test"))
+
+        mock_retrieve.assert_awaited_once_with(
+            "titre de séjour",
+            domain="general",
+            expansions=["renouvellement carte de séjour", "prolongation titre de séjour"],
+        )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "scores, expected, judge_called",
+    [
+        ([0.72, 0.5], True, False),
+        ([0.3, 0.41], False, False),
+        ([0.52], "judge", True),
+    ],
+)
+async def test_groundedness_cosine_tiers(scores, expected, judge_called):
+    agent = LegalResearchAgent()
+    chain = MagicMock()
+    chain.ainvoke = AsyncMock(
+        return_value=_groundedness_message([{"token": "YES", "logprob": -0.01}])
+    )
+    agent._get_chain = MagicMock(return_value=chain)
+    docs = [{"content": "doc", "vector_score": s} for s in scores]
+
+    result = await agent._verify_groundedness("query", docs, {})
+
+    assert result is (True if expected == "judge" else expected)
+    assert chain.ainvoke.called is judge_called
+
+
+def _draft_message(content, token_logprobs=(-0.1,), finish_reason="stop"):
+    from langchain_core.messages import AIMessage
+
+    return AIMessage(
+        content=content,
+        response_metadata={
+            "finish_reason": finish_reason,
+            "logprobs": {"content": [{"token": "t", "logprob": lp} for lp in token_logprobs]},
+        },
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "draft, escalated",
+    [
+        (_draft_message("Oui. [Source: service-public.fr/F123]"), False),
+        (_draft_message("INSUFFICIENT_CONTEXT"), True),
+        (_draft_message("Oui. [Source: service-public.fr/F123]", token_logprobs=(-2.0, -1.5)), True),
+        (_draft_message("Oui, sans source."), True),
+        (_draft_message("Oui. [Source: service-public.fr/F123] ...", finish_reason="length"), True),
+    ],
+)
+async def test_non_streamed_synthesis_escalates_failed_drafts(draft, escalated):
+    agent = LegalResearchAgent()
+    agent._get_chain = MagicMock(side_effect=lambda kind, model_override=None: (kind, model_override))
+    agent._run_chain = AsyncMock(side_effect=[draft, "Escalated [Source: legifrance.gouv.fr/L1]"])
+    state = AgentState(session_id="test", metadata={"streaming": False})
+
+    res = await agent._synthesize_answer("query", "context", "fr", state=state)
+
+    chains = [c.args[0] for c in agent._run_chain.call_args_list]
+    assert chains[0] == ("synthesis_draft", settings.FAST_LLM_MODEL)
+    if escalated:
+        assert chains[1] == ("synthesis", None)
+        assert res == "Escalated [Source: legifrance.gouv.fr/L1]"
+    else:
+        assert len(chains) == 1
+        assert res == draft.content
+
+
+@pytest.mark.asyncio
+async def test_streamed_synthesis_escalates_only_on_sentinel():
+    agent = LegalResearchAgent()
+    agent._get_chain = MagicMock(side_effect=lambda kind, model_override=None: (kind, model_override))
+    agent._run_chain = AsyncMock(return_value="Oui, sans source.")
+
+    # A streamed draft is already shown to the user: kept as is
+    assert await agent._synthesize_answer("query", "context", "fr") == "Oui, sans source."
+    assert agent._run_chain.call_args.args[0] == ("synthesis", settings.FAST_LLM_MODEL)
+
+    agent._run_chain = AsyncMock(side_effect=["INSUFFICIENT_CONTEXT", "Réponse"])
+    assert await agent._synthesize_answer("query", "context", "fr") == "Réponse"
+    assert agent._run_chain.call_args.args[0] == ("synthesis", None)
+
+
+@pytest.mark.asyncio
+async def test_explicit_model_skips_synthesis_tiering():
+    agent = LegalResearchAgent()
+    agent._get_chain = MagicMock(side_effect=lambda kind, model_override=None: (kind, model_override))
+    agent._run_chain = AsyncMock(return_value="INSUFFICIENT_CONTEXT")
+    state = AgentState(session_id="test", metadata={"model": "GPT-4o", "streaming": False})
+
+    await agent._synthesize_answer("query", "context", "fr", state=state)
+
+    agent._run_chain.assert_awaited_once()
+    assert agent._run_chain.call_args.args[0] == ("synthesis", "GPT-4o")
+
+
+@pytest.mark.asyncio
+async def test_run_prunes_context_before_synthesis():
+    long_doc = {"content": "x" * 3000, "source": "url", "metadata": {"title": "T"}}
+    with (
+        patch("src.agents.legal_agent.retrieve_legal_info", new_callable=AsyncMock) as mock_retrieve,
+        patch("src.agents.legal_agent.prune_context", new_callable=AsyncMock) as mock_prune,
+    ):
+        mock_retrieve.return_value = [long_doc, dict(long_doc)]
+        mock_prune.return_value = [long_doc]
+
+        agent = LegalResearchAgent()
+        agent._verify_groundedness = AsyncMock(return_value=True)
+        agent._synthesize_answer = AsyncMock(return_value="answer")
+
+        await agent.run("query", AgentState(session_id="test"))
+
+    mock_prune.assert_awaited_once_with("query", mock_retrieve.return_value)
+    context = agent._synthesize_answer.call_args.args[1]
+    # Budgeted by the pruner: no fixed per-document truncation on top
+    assert context.count("x") == 3000
+    assert context.count("Source: url") == 1
+
+
+@pytest.mark.asyncio
+async def test_synthesize_answer_batch_maps_results():
+    from src.agents.legal_agent import INSUFFICIENT_CONTEXT_MESSAGE, NO_CONTEXT_MESSAGE
+
+    agent = LegalResearchAgent()
+    items = [("q1", "ctx1", "French"), ("q2", "", "French"), ("q3", "ctx3", "English"), ("q4", "ctx4", "French")]
+    with patch("src.agents.legal_agent.run_chat_batch", new_callable=AsyncMock) as mock_batch:
+        mock_batch.return_value = ["Réponse 1", "INSUFFICIENT_CONTEXT", None]
+
+        answers = await agent.synthesize_answer_batch(items, poll_interval=0)
+
+    assert answers == ["Réponse 1", NO_CONTEXT_MESSAGE, INSUFFICIENT_CONTEXT_MESSAGE, None]
+    requests = mock_batch.call_args.args[0]
+    # Items without context never reach the batch
+    assert len(requests) == 3
+    assert requests[1][0]["role"] == "system"
+    assert requests[1][-1]["content"].endswith("Answer in English:")
+
+
+def test_cache_namespace_is_tied_to_prompt_version():
+    import hashlib
+
+    from src.agents.legal_agent import SYNTHESIS_SYSTEM_PROMPT
+
+    assert SYNTHESIS_PROMPT_VERSION == hashlib.sha256(SYNTHESIS_SYSTEM_PROMPT.encode()).hexdigest()[:16]
+    assert LegalResearchAgent._cache_namespace("French") == f"{SYNTHESIS_PROMPT_VERSION}:French"
+
+
+def test_retrieved_bundle_computes_views_once():
+    from src.agents.legal_agent import _SUMMARY_TRUNC, RetrievedBundle
+
+    docs = [{"content": "a" * 800, "vector_score": 0.4}, {"content": "b", "vector_score": 0.7}, {"content": "c"}]
+    bundle = RetrievedBundle(docs)
+
+    assert bundle.summary == "a" * _SUMMARY_TRUNC + "\nb\nc"
+    assert bundle.best_score == 0.7
+    docs[1]["vector_score"] = 0.9
+    # Cached for the rest of the request
+    assert bundle.best_score == 0.7
+    assert RetrievedBundle([{"content": "x"}]).best_score is None
@@ -15,3 +15,11 @@ def test_metrics_labels():
     metrics.LLM_REQUEST_DURATION.labels(model="gpt-4o").observe(0.5)
     metrics.RAG_RETRIEVAL_LATENCY.labels(domain="general").observe(0.2)
     metrics.USER_FEEDBACK.labels(score="positive").inc()
+
+
+def test_llm_metrics_resolves_labelled_children_once():
+    handles = metrics.llm_metrics("gpt-4o")
+    assert handles is metrics.llm_metrics("gpt-4o")
+    assert handles.duration is metrics.LLM_REQUEST_DURATION.labels(model="gpt-4o")
+    assert handles.prompt_tokens is metrics.LLM_TOKEN_USAGE.labels(model="gpt-4o", type="prompt")
+    assert handles.completion_tokens is metrics.LLM_TOKEN_USAGE.labels(model="gpt-4o", type="completion")
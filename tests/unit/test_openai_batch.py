@@ -0,0 +1,100 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.utils.openai_batch import build_batch_jsonl, parse_batch_output, run_chat_batch
+
+
+def _output_line(custom_id, content=None, status_code=200):
+    body = (
+        {"choices": [{"message": {"content": content}}]} if content is not None else {}
+    )
+    return json.dumps(
+        {"custom_id": custom_id, "response": {"status_code": status_code, "body": body}}
+    )
+
+
+def test_build_batch_jsonl_one_request_per_line():
+    payload = build_batch_jsonl(
+        [[{"role": "user", "content": "a"}], [{"role": "user", "content": "é"}]],
+        "gpt-4o",
+        temperature=0,
+    )
+    lines = [json.loads(line) for line in payload.decode("utf-8").splitlines()]
+
+    assert [line["custom_id"] for line in lines] == ["0", "1"]
+    assert lines[1]["url"] == "/v1/chat/completions"
+    assert lines[1]["body"] == {
+        "model": "gpt-4o",
+        "messages": [{"role": "user", "content": "é"}],
+        "temperature": 0,
+    }
+
+
+def test_parse_batch_output_restores_input_order():
+    text = "\n".join(
+        [
+            _output_line("2", "c"),
+            _output_line("0", "a"),
+            _output_line("1", status_code=500),
+        ]
+    )
+
+    assert parse_batch_output(text, 3) == ["a", None, "c"]
+
+
+@pytest.mark.asyncio
+async def test_run_chat_batch_polls_until_completed():
+    client = MagicMock()
+    client.files.create = AsyncMock(return_value=SimpleNamespace(id="file-in"))
+    client.batches.create = AsyncMock(
+        return_value=SimpleNamespace(id="batch-1", status="validating")
+    )
+    client.batches.retrieve = AsyncMock(
+        side_effect=[
+            SimpleNamespace(
+                id="batch-1",
+                status="in_progress",
+                request_counts=None,
+                output_file_id=None,
+            ),
+            SimpleNamespace(
+                id="batch-1",
+                status="completed",
+                request_counts=None,
+                output_file_id="file-out",
+            ),
+        ]
+    )
+    client.files.content = AsyncMock(
+        return_value=SimpleNamespace(text=_output_line("0", "réponse"))
+    )
+
+    results = await run_chat_batch(
+        [[{"role": "user", "content": "q"}]],
+        model="gpt-4o",
+        poll_interval=0,
+        client=client,
+    )
+
+    assert results == ["réponse"]
+    assert client.batches.retrieve.await_count == 2
+    assert client.files.create.call_args.kwargs["purpose"] == "batch"
+    assert client.batches.create.call_args.kwargs["completion_window"] == "24h"
+
+
+@pytest.mark.asyncio
+async def test_run_chat_batch_without_output_returns_none():
+    client = MagicMock()
+    client.files.create = AsyncMock(return_value=SimpleNamespace(id="file-in"))
+    client.batches.create = AsyncMock(
+        return_value=SimpleNamespace(
+            id="batch-1", status="failed", request_counts=None, output_file_id=None
+        )
+    )
+
+    assert await run_chat_batch(
+        [[{"role": "user", "content": "q"}]] * 2, client=client
+    ) == [None, None]
@@ -18,6 +18,23 @@ async def test_orchestrator_initialization():
         assert orchestrator.cache is not None
 
 
+def test_orchestrators_share_one_redis_pool():
+    with patch("src.agents.orchestrator.get_llm"):
+        first, second = AdminOrchestrator(), AdminOrchestrator()
+
+    assert first.cache.connection_pool is second.cache.connection_pool
+
+
+def test_redis_pool_waits_for_a_free_connection():
+    import redis.asyncio as redis_asyncio
+    from src.agents.orchestrator import _REDIS_POOL
+    from src.config import settings
+
+    assert isinstance(_REDIS_POOL, redis_asyncio.BlockingConnectionPool)
+    assert _REDIS_POOL.max_connections == settings.REDIS_POOL_SIZE
+    assert _REDIS_POOL.timeout == settings.REDIS_POOL_TIMEOUT
+
+
 @pytest.mark.asyncio
 async def test_handle_query_cache_hit():
     """Test that cache returns value if present."""
@@ -32,7 +49,7 @@ async def test_handle_query_cache_hit():
         mock_redis_cls.return_value = mock_redis
 
         # Setup cache hit
-        mock_redis.get.return_value = "Cached Response"
+        mock_redis.getex.return_value = b"Cached Response"
 
         # Mock Memory (State load happens BEFORE cache check)
         mock_state = AgentState(session_id="test", messages=[])
@@ -53,10 +70,38 @@ async def test_handle_query_cache_hit():
 
             response = await orchestrator.handle_query("test query", "fr")
             assert response == "Cached Response"
-            mock_redis.get.assert_called_once()
+            mock_redis.getex.assert_called_once()
             mock_memory.load_agent_state.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_cache_lookup_overlaps_state_load():
+    import asyncio
+
+    state_loading = asyncio.Event()
+
+    async def load_agent_state(session_id):
+        state_loading.set()
+        return AgentState(session_id=session_id, messages=[])
+
+    async def getex(key, ex):
+        # The state load is already in flight while Redis answers
+        await asyncio.wait_for(state_loading.wait(), timeout=1)
+        return b"Cached Response"
+
+    with (
+        patch("src.agents.orchestrator.get_llm"),
+        patch("src.agents.orchestrator.memory_manager") as mock_memory,
+        patch("src.config.settings.DEBUG", False),
+    ):
+        mock_memory.load_agent_state = load_agent_state
+        orchestrator = AdminOrchestrator()
+        orchestrator.cache = AsyncMock()
+        orchestrator.cache.getex = getex
+
+        assert await orchestrator.handle_query("query", "en", "s") == "Cached Response"
+
+
 @pytest.mark.asyncio
 async def test_handle_query_flow():
     """Test the full flow with mocks."""
@@ -88,7 +133,7 @@ async def test_handle_query_flow():
     ):
         # Setup Mocks
         mock_redis = AsyncMock()
-        mock_redis.get.return_value = None  # Cache miss
+        mock_redis.getex.return_value = None  # Cache miss
         mock_redis_cls.return_value = mock_redis
 
         # Mock Pipeline
@@ -174,7 +219,7 @@ async def test_orchestrator_cache_exceptions():
     ):
         # Mock Redis correctly as AsyncMock
         mock_redis = AsyncMock()
-        mock_redis.get.side_effect = Exception("Redis Down")
+        mock_redis.getex.side_effect = Exception("Redis Down")
         mock_redis.setex.side_effect = Exception("Redis Write Error")
         mock_redis_cls.return_value = mock_redis
 
@@ -245,3 +290,585 @@ async def test_orchestrator_guardrail_rejections():
         res = await orchestrator.handle_query("bad query")
         assert "Désolé" in res
         assert "Off topic" in res
+
+
+def test_cache_key_is_short_and_delimited():
+    key = AdminOrchestrator._cache_key("ab", "c", "session")
+
+    assert key.startswith("agent_res:") and len(key) == len("agent_res:") + 32
+    assert key == AdminOrchestrator._cache_key("ab", "c", "session")
+    # Concatenation boundaries are part of the key
+    assert key != AdminOrchestrator._cache_key("a", "bc", "session")
+    assert key != AdminOrchestrator._cache_key("ab", "c", "other")
+
+
+@pytest.mark.asyncio
+async def test_fast_lane_retrieval_overlaps_topic_guardrail():
+    import asyncio
+
+    started = asyncio.Event()
+
+    async def slow_retriever(query, user_profile):
+        started.set()
+        await asyncio.sleep(10)
+
+    async def validate_topic(query, history):
+        # Retrieval is already running while the guardrail decides
+        await asyncio.wait_for(started.wait(), timeout=1)
+        return False, "Off-topic"
+
+    with (
+        patch("src.agents.orchestrator.get_llm"),
+        patch("src.agents.orchestrator.guardrail_manager") as mock_guard,
+    ):
+        mock_guard.validate_topic = validate_topic
+        orchestrator = AdminOrchestrator()
+        orchestrator.retriever = slow_retriever
+
+        prep_task = orchestrator._start_lane_preparation(False, "query", "French", None)
+        is_valid, reason = await orchestrator._check_topic("query", [], prep_task)
+
+    assert (is_valid, reason) == (False, "Off-topic")
+    # A rejected topic cancels the retrieval
+    await asyncio.sleep(0)
+    assert prep_task.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_slow_lane_preparation_translates_non_french_query():
+    with patch("src.agents.orchestrator.get_llm"):
+        orchestrator = AdminOrchestrator()
+        orchestrator.translator = AsyncMock(return_value="titre de séjour")
+
+        assert await orchestrator._start_lane_preparation(True, "residence permit", "English", None) == "titre de séjour"
+        assert await orchestrator._start_lane_preparation(True, "titre", "French", None) == "titre"
+        orchestrator.translator.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_topic_check_starts_before_pipeline():
+    import asyncio
+
+    started = []
+
+    async def validate_topic(query, history):
+        started.append(query)
+        return True, ""
+
+    async def pipeline_run(**kwargs):
+        # The guardrail is already running while the pipeline preprocesses
+        await asyncio.sleep(0)
+        assert started == ["How do I renew my visa?"]
+        return PipelineResult(rewritten_query="renouvellement visa", intent="SIMPLE_QA")
+
+    with (
+        patch("src.agents.orchestrator.get_llm"),
+        patch("src.agents.orchestrator.guardrail_manager") as mock_guard,
+    ):
+        mock_guard.validate_topic = validate_topic
+        orchestrator = AdminOrchestrator()
+        orchestrator.translator = AsyncMock(return_value="renouvellement visa")
+        state = AgentState(session_id="s", messages=[])
+
+        topic_task = orchestrator._start_topic_check("How do I renew my visa?", [], state, fused_possible=False)
+        pr = await pipeline_run()
+        prep_task = orchestrator._start_lane_preparation(True, pr.rewritten_query, "English", None)
+
+        assert await orchestrator._check_topic("How do I renew my visa?", [], prep_task, topic_task) == (True, "")
+        assert await prep_task == "renouvellement visa"
+        # Only the rewritten query is translated
+        orchestrator.translator.assert_awaited_once()
+
+        # Short answer to a clarification: always a continuation, no check
+        state.current_step = "CLARIFICATION"
+        assert orchestrator._start_topic_check("oui", [], state, fused_possible=False) is None
+
+
+@pytest.mark.asyncio
+async def test_fused_fast_lane_parses_single_json_call():
+    with patch("src.agents.orchestrator.get_llm"):
+        orchestrator = AdminOrchestrator()
+    llm = MagicMock()
+    orchestrator._call_llm = AsyncMock(
+        return_value=MagicMock(content='{"valid": true, "reject_reason": "", "answer": "Réponse", "grounded": false}')
+    )
+
+    fused = await orchestrator._fused_fast_lane([], llm)
+
+    assert (fused.valid, fused.answer, fused.grounded) == (True, "Réponse", False)
+    llm.bind.assert_called_once_with(response_format={"type": "json_object"})
+    orchestrator._call_llm.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_fused_fast_lane_invalid_json_falls_back():
+    with patch("src.agents.orchestrator.get_llm"):
+        orchestrator = AdminOrchestrator()
+    orchestrator._call_llm = AsyncMock(return_value=MagicMock(content="APPROVED"))
+
+    assert await orchestrator._fused_fast_lane([], MagicMock()) is None
+
+
+@pytest.mark.asyncio
+async def test_personal_route_skips_fast_lane_retrieval():
+    import asyncio
+    from src.agents.orchestrator import NO_RETRIEVAL_TEXT
+    from src.shared.guardrails import TOPIC_ROUTE_PERSONAL
+
+    with patch("src.agents.orchestrator.get_llm"):
+        orchestrator = AdminOrchestrator()
+    prep_task = asyncio.create_task(asyncio.sleep(10, result=[{"source": "s", "content": "c"}]))
+
+    context, context_text = await orchestrator._resolve_fast_lane_context(prep_task, TOPIC_ROUTE_PERSONAL)
+
+    assert (context, context_text) == ([], NO_RETRIEVAL_TEXT)
+    await asyncio.sleep(0)
+    assert prep_task.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_answer_translation_overlaps_hallucination_check():
+    import asyncio
+    from src.agents.state import UserProfile
+
+    translations = []
+
+    async def translate(text, target_language):
+        translations.append(target_language)
+        return f"[{target_language}] {text}"
+
+    async def check_hallucination(context, answer, query="", history=None):
+        await asyncio.sleep(0)
+        # The answer translation is already running while grounding is checked
+        assert "English" in translations
+        return True
+
+    with (
+        patch("src.agents.orchestrator.get_llm") as mock_get_llm,
+        patch("src.agents.orchestrator.get_query_pipeline") as mock_get_pipeline,
+        patch("src.agents.orchestrator.guardrail_manager") as mock_guard,
+        patch("src.agents.orchestrator.memory_manager") as mock_memory,
+        patch("src.config.settings.DEBUG", True),
+    ):
+        mock_get_pipeline.return_value.run = AsyncMock(
+            return_value=PipelineResult(
+                rewritten_query="visa", intent="SIMPLE_QA", extracted_data={}, new_core_goal=None
+            )
+        )
+        mock_guard.validate_topic = AsyncMock(return_value=(True, ""))
+        mock_guard.check_hallucination = check_hallucination
+        mock_guard.add_disclaimer.side_effect = lambda text, lang: text
+        state = AgentState(session_id="s", user_profile=UserProfile(language="English"))
+        mock_memory.load_agent_state = AsyncMock(return_value=state)
+        mock_memory.save_agent_state = AsyncMock()
+        mock_get_llm.return_value.ainvoke = AsyncMock(return_value=MagicMock(content="Réponse"))
+
+        orchestrator = AdminOrchestrator()
+        orchestrator.cache = AsyncMock()
+        orchestrator.translator = translate
+        orchestrator.retriever = AsyncMock(return_value=[{"source": "s", "content": "visa"}])
+
+        response = await orchestrator.handle_query("How do I get a visa?", "en", "s")
+
+    assert response == "[English] Réponse"
+    # Retrieval query (French) + answer (English), the answer only once
+    assert translations == ["French", "English"]
+
+
+@pytest.mark.asyncio
+async def test_fast_lane_reads_only_the_recent_history():
+    from langchain_core.messages import AIMessage, HumanMessage
+
+    history = [HumanMessage(content=f"q{i}") if i % 2 == 0 else AIMessage(content=f"a{i}") for i in range(30)]
+
+    with (
+        patch("src.agents.orchestrator.get_llm") as mock_get_llm,
+        patch("src.agents.orchestrator.get_query_pipeline") as mock_get_pipeline,
+        patch("src.agents.orchestrator.guardrail_manager") as mock_guard,
+        patch("src.agents.orchestrator.memory_manager") as mock_memory,
+        patch("src.config.settings.DEBUG", True),
+    ):
+        mock_get_pipeline.return_value.run = AsyncMock(
+            return_value=PipelineResult(
+                rewritten_query="visa", intent="SIMPLE_QA", extracted_data={}, new_core_goal=None
+            )
+        )
+        mock_guard.validate_topic = AsyncMock(return_value=(True, ""))
+        mock_guard.add_disclaimer.side_effect = lambda text, lang: text
+        mock_memory.load_agent_state = AsyncMock(return_value=AgentState(session_id="s", messages=list(history)))
+        mock_memory.save_agent_state = AsyncMock()
+        mock_get_llm.return_value.ainvoke = AsyncMock(return_value=MagicMock(content="Réponse"))
+
+        orchestrator = AdminOrchestrator()
+        orchestrator.cache = AsyncMock()
+        orchestrator.retriever = AsyncMock(return_value=[])
+
+        await orchestrator.handle_query("Quel visa ?", "fr", "s")
+
+    recent = history[-10:]
+    assert mock_get_pipeline.return_value.run.call_args.kwargs["chat_history"] == recent
+    assert mock_guard.validate_topic.call_args.kwargs["history"] == recent
+    prompt = mock_get_llm.return_value.ainvoke.call_args.args[0]
+    assert prompt[1:-1] == recent
+
+
+@pytest.mark.asyncio
+async def test_bounded_stream_query_times_out_with_localized_message():
+    import asyncio
+    from src.agents.orchestrator import TIMEOUT_MESSAGES
+
+    closed = []
+
+    async def hanging_stream(query, user_lang, session_id, model_override):
+        try:
+            yield {"type": "token", "content": "Début"}
+            await asyncio.sleep(10)
+            yield {"type": "token", "content": "jamais"}
+        finally:
+            closed.append(True)
+
+    with patch("src.agents.orchestrator.get_llm"):
+        orchestrator = AdminOrchestrator()
+    orchestrator.stream_query = hanging_stream
+
+    with patch("src.agents.orchestrator.QUERY_TIMEOUT_SECONDS", 0.05):
+        events = [e async for e in orchestrator.bounded_stream_query("q", "en", "s")]
+
+    assert events == [
+        {"type": "token", "content": "Début"},
+        {"type": "token", "content": TIMEOUT_MESSAGES["en"]},
+        {"type": "status", "content": "Génération terminée."},
+    ]
+    assert closed == [True]
+
+
+@pytest.mark.asyncio
+async def test_bounded_stream_query_passes_events_through():
+    async def stream(query, user_lang, session_id, model_override):
+        yield {"type": "token", "content": "a"}
+        yield {"type": "token", "content": "b"}
+
+    with patch("src.agents.orchestrator.get_llm"):
+        orchestrator = AdminOrchestrator()
+    orchestrator.stream_query = stream
+
+    events = [e async for e in orchestrator.bounded_stream_query("q", "fr", "s")]
+    assert [e["content"] for e in events] == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_slow_lane_state_save_overlaps_answer_translation():
+    import asyncio
+    from langchain_core.messages import AIMessage
+    from src.agents.state import UserProfile
+
+    saved = asyncio.Event()
+
+    async def translate(text, target_language):
+        if target_language == "English":
+            # Completes only if the state save was not deferred behind the translation
+            await asyncio.wait_for(saved.wait(), timeout=1)
+        return f"[{target_language}] {text}"
+
+    async def save_agent_state(session_id, state):
+        saved.set()
+
+    with (
+        patch("src.agents.orchestrator.get_llm"),
+        patch("src.agents.orchestrator.get_query_pipeline") as mock_get_pipeline,
+        patch("src.agents.orchestrator.guardrail_manager") as mock_guard,
+        patch("src.agents.orchestrator.memory_manager") as mock_memory,
+        patch("src.agents.orchestrator.agent_graph") as mock_graph,
+        patch("src.config.settings.DEBUG", True),
+    ):
+        mock_get_pipeline.return_value.run = AsyncMock(
+            return_value=PipelineResult(
+                rewritten_query="visa étudiant", intent="COMPLEX_PROCEDURE", extracted_data={}, new_core_goal=None
+            )
+        )
+        mock_guard.validate_topic = AsyncMock(return_value=(True, ""))
+        mock_guard.add_disclaimer.side_effect = lambda text, lang: text
+        state = AgentState(session_id="s", user_profile=UserProfile(language="English"))
+        mock_memory.load_agent_state = AsyncMock(return_value=state)
+        mock_memory.save_agent_state = save_agent_state
+        mock_graph.ainvoke = AsyncMock(return_value={"messages": [AIMessage(content="Étapes du visa")]})
+
+        orchestrator = AdminOrchestrator()
+        orchestrator.translator = translate
+
+        response = await orchestrator.handle_query("How do I get a student visa step by step?", "en", "s")
+
+    assert response == "[English] Étapes du visa"
+
+
+@pytest.mark.asyncio
+async def test_cache_write_runs_in_background_and_logs_errors():
+    import asyncio
+
+    with patch("src.agents.orchestrator.get_llm"):
+        orchestrator = AdminOrchestrator()
+    orchestrator.cache = AsyncMock()
+    orchestrator.cache.setex.side_effect = Exception("Redis down")
+
+    with patch("src.agents.orchestrator.logger") as mock_logger:
+        task = orchestrator._in_background(orchestrator._safe_setex("agent_res:k", "answer"))
+        assert task in orchestrator._pending
+        await task
+        await asyncio.sleep(0)
+
+    orchestrator.cache.setex.assert_awaited_once_with("agent_res:k", 3600, "answer")
+    mock_logger.error.assert_called_once()
+    assert not orchestrator._pending
+
+
+@pytest.mark.asyncio
+async def test_local_cache_serves_hot_keys_without_redis():
+    with patch("src.agents.orchestrator.get_llm"):
+        orchestrator = AdminOrchestrator()
+    orchestrator._bypass_cache = False
+    orchestrator.cache = AsyncMock()
+    orchestrator.cache.getex.return_value = b"answer"
+
+    assert await orchestrator._get_cached_response("agent_res:k") == "answer"
+    assert await orchestrator._get_cached_response("agent_res:k") == "answer"
+    orchestrator.cache.getex.assert_awaited_once()
+
+    # Freshly written responses are served locally as well
+    await orchestrator._cache_response("agent_res:new", "fresh")
+    assert await orchestrator._get_cached_response("agent_res:new") == "fresh"
+    orchestrator.cache.getex.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_large_cached_responses_are_stored_compressed():
+    with patch("src.agents.orchestrator.get_llm"):
+        orchestrator = AdminOrchestrator()
+    orchestrator._bypass_cache = False
+    orchestrator.cache = AsyncMock()
+    long_answer = "Étape : déposer le dossier en préfecture.\n" * 200
+
+    await orchestrator._safe_setex("agent_res:long", long_answer)
+    stored = orchestrator.cache.setex.call_args.args[2]
+    assert stored.startswith(b"\x01") and len(stored) < len(long_answer.encode("utf-8")) / 2
+
+    orchestrator.cache.getex.return_value = stored
+    assert await orchestrator._get_cached_response("agent_res:long") == long_answer
+    # Short answers are stored as they are
+    assert AdminOrchestrator._encode_response("Réponse") == "Réponse"
+    assert AdminOrchestrator._decode_response("Réponse".encode("utf-8")) == "Réponse"
+
+
+@pytest.mark.asyncio
+async def test_local_cache_evicts_lru_and_expired_entries():
+    import time
+
+    with patch("src.agents.orchestrator.get_llm"):
+        orchestrator = AdminOrchestrator()
+    with patch("src.agents.orchestrator.LOCAL_CACHE_MAX_ENTRIES", 2):
+        orchestrator._put_local("a", "A")
+        orchestrator._put_local("b", "B")
+        assert orchestrator._get_local("a") == "A"  # "b" becomes least recently used
+        orchestrator._put_local("c", "C")
+    assert list(orchestrator._local_cache) == ["a", "c"]
+
+    with patch("src.agents.orchestrator.time.monotonic", return_value=time.monotonic() + 3601):
+        assert orchestrator._get_local("a") is None
+    assert "a" not in orchestrator._local_cache
+
+
+@pytest.mark.asyncio
+async def test_cache_write_skipped_when_too_many_in_flight():
+    import asyncio
+
+    with patch("src.agents.orchestrator.get_llm"):
+        orchestrator = AdminOrchestrator()
+    orchestrator.cache = AsyncMock()
+    slots = asyncio.Semaphore(1)
+
+    with (
+        patch("src.agents.orchestrator._CACHE_WRITE_SLOTS", slots),
+        patch("src.agents.orchestrator.metrics") as mock_metrics,
+    ):
+        async with slots:
+            assert orchestrator._cache_response("agent_res:k", "answer") is None
+        mock_metrics.CACHE_WRITES_SKIPPED.inc.assert_called_once()
+
+        await orchestrator._cache_response("agent_res:k", "answer")
+
+    orchestrator.cache.setex.assert_awaited_once_with("agent_res:k", 3600, "answer")
+
+
+@pytest.mark.asyncio
+async def test_handle_query_times_out_gracefully():
+    import asyncio
+
+    async def hang(*args, **kwargs):
+        await asyncio.sleep(10)
+
+    with (
+        patch("src.agents.orchestrator.get_llm"),
+        patch("src.agents.orchestrator.QUERY_TIMEOUT_SECONDS", 0.01),
+    ):
+        orchestrator = AdminOrchestrator()
+        orchestrator._handle_query_impl = hang
+
+        assert await orchestrator.handle_query("query", "en", "s") == (
+            "Sorry, the request timed out. Please try again with a shorter question."
+        )
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_queries_share_one_execution():
+    import asyncio
+
+    calls = []
+
+    async def slow_impl(query, user_lang, session_id, model_override):
+        calls.append(query)
+        await asyncio.sleep(0.01)
+        return f"answer to {query}"
+
+    with patch("src.agents.orchestrator.get_llm"):
+        orchestrator = AdminOrchestrator()
+        orchestrator._handle_query_impl = slow_impl
+
+        results = await asyncio.gather(
+            orchestrator.handle_query("titre de séjour", "en", "s"),
+            orchestrator.handle_query("titre de séjour", "en", "s"),
+            orchestrator.handle_query("passeport", "en", "s"),
+        )
+
+    assert results == ["answer to titre de séjour", "answer to titre de séjour", "answer to passeport"]
+    assert sorted(calls) == ["passeport", "titre de séjour"]
+    assert orchestrator._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_pipeline_timeout_falls_back_to_raw_query():
+    import asyncio
+
+    async def hang(**kwargs):
+        await asyncio.sleep(10)
+
+    with (
+        patch("src.agents.orchestrator.get_llm"),
+        patch("src.agents.orchestrator.PIPELINE_TIMEOUT_SECONDS", 0.01),
+    ):
+        orchestrator = AdminOrchestrator()
+        pipeline = MagicMock(run=hang)
+        state = AgentState(session_id="s", messages=[], core_goal="Renouveler un visa")
+
+        pr = await orchestrator._run_pipeline(pipeline, "query", [], state, None)
+
+    assert (pr.rewritten_query, pr.intent, pr.new_core_goal) == ("query", "UNKNOWN", "Renouveler un visa")
+
+
+def test_lang_key_maps_codes_and_names():
+    assert [AdminOrchestrator._lang_key(lang) for lang in ("English", "english", "EN", "vi", "Vietnamese")] == [
+        "en", "en", "en", "vi", "vi",
+    ]
+    # Unknown languages get the French messages
+    assert AdminOrchestrator._lang_key("Klingon") == "fr"
+    # Every spelling LanguageResolver normalizes has a message table
+    from src.shared.language_resolver import LANG_MAP
+    assert {AdminOrchestrator._lang_key(spelling) for spelling in LANG_MAP} == {"fr", "en", "vi"}
+
+
+def test_pick_message_localizes_and_formats():
+    from src.agents.orchestrator import REJECTION_TEMPLATES, TIMEOUT_MESSAGES
+
+    assert AdminOrchestrator._pick_message(TIMEOUT_MESSAGES, "English") == TIMEOUT_MESSAGES["en"]
+    assert AdminOrchestrator._pick_message(REJECTION_TEMPLATES, "vi", reason="X").endswith("Lý do: X")
+    assert AdminOrchestrator._pick_message(REJECTION_TEMPLATES, "Klingon", reason="X").startswith("Désolé")
+    with pytest.raises(TypeError):
+        TIMEOUT_MESSAGES["en"] = "changed"
+
+
+def test_needs_translation_skips_answers_already_in_target_language():
+    english = "To renew your residence permit, you need to book an appointment at the prefecture."
+
+    assert not AdminOrchestrator._needs_translation(english, "English")
+    assert AdminOrchestrator._needs_translation(english, "Vietnamese")
+    assert not AdminOrchestrator._needs_translation("Réponse", "French")
+    # Too short to tell: translate
+    assert AdminOrchestrator._needs_translation("Réponse", "English")
+    # English opening, quoted French law text at the end: translate
+    citation = (
+        "Selon l'article L433-1, la carte est délivrée pour une durée "
+        "de un an et elle est renouvelable. " * 8
+    )
+    assert AdminOrchestrator._needs_translation(english * 6 + citation, "English")
+
+
+def test_format_context_keeps_documents_within_token_budget():
+    context = [
+        {"source": "a", "content": "a" * 30},
+        {"source": "b", "content": "b" * 30},
+        {"source": "c", "content": "c" * 30},
+    ]
+    # 4 characters per token without tiktoken: each line is 11 tokens
+    with patch("src.shared.context_pruner._get_encoding", return_value=None):
+        assert AdminOrchestrator._format_context(context, token_budget=25).splitlines() == [
+            "Source a: " + "a" * 30,
+            "Source b: " + "b" * 30,
+        ]
+        # A first document larger than the budget is truncated, not dropped
+        assert AdminOrchestrator._format_context(context, token_budget=5) == "Source a: " + "a" * 10
+
+
+def test_format_context_skips_tokenization_when_bytes_fit_budget():
+    context = [{"source": "a", "content": "court"}, {"source": "b", "content": "aussi"}]
+    with patch("src.agents.orchestrator.count_tokens") as count:
+        assert AdminOrchestrator._format_context(context, token_budget=100) == (
+            "Source a: court\nSource b: aussi"
+        )
+    count.assert_not_called()
+
+
+def test_format_context_caps_each_document():
+    from src.agents.orchestrator import MAX_DOC_CHARS
+
+    context = [{"source": "long", "content": "x" * (MAX_DOC_CHARS * 3)}, {"source": "b", "content": "court"}]
+    with patch("src.shared.context_pruner._get_encoding", return_value=None):
+        lines = AdminOrchestrator._format_context(context, token_budget=10_000).splitlines()
+    # The long page is cut, so the next document still fits in the context
+    assert lines == ["Source long: " + "x" * MAX_DOC_CHARS, "Source b: court"]
+
+
+@pytest.mark.asyncio
+async def test_call_llm_records_labelled_metrics():
+    from src.utils import metrics
+
+    llm = MagicMock()
+    llm.model_name = "test-model-metrics"
+    llm.ainvoke = AsyncMock(
+        return_value=MagicMock(
+            response_metadata={"token_usage": {"prompt_tokens": 7, "completion_tokens": 3}}
+        )
+    )
+    with patch("src.agents.orchestrator.get_llm"):
+        orchestrator = AdminOrchestrator()
+    await orchestrator._call_llm(["hi"], llm=llm)
+
+    handles = metrics.llm_metrics("test-model-metrics")
+    assert handles is metrics.llm_metrics("test-model-metrics")
+    assert handles.prompt_tokens._value.get() == 7
+    assert handles.completion_tokens._value.get() == 3
+    assert handles.duration._sum.get() >= 0
+
+
+@pytest.mark.asyncio
+async def test_retrieval_query_already_french_is_not_translated():
+    with patch("src.agents.orchestrator.get_llm"):
+        orchestrator = AdminOrchestrator()
+    orchestrator.translator = AsyncMock(return_value="Comment renouveler mon titre de séjour")
+
+    french = "Comment est-ce que je peux renouveler mon titre de séjour dans le Rhône ?"
+    assert await orchestrator._to_french_retrieval_query(french, "English") == french
+    orchestrator.translator.assert_not_called()
+
+    english = "How can I renew my residence permit in the Rhône and what are the fees?"
+    assert await orchestrator._to_french_retrieval_query(english, "English") == (
+        "Comment renouveler mon titre de séjour"
+    )
+    orchestrator.translator.assert_awaited_once()
@@ -12,7 +12,7 @@ async def test_stream_query_fast_lane():
     with (
         patch("src.agents.orchestrator.redis.Redis"),
         patch("src.agents.orchestrator.get_llm") as mock_get_llm,
-        patch("src.shared.query_pipeline.get_query_pipeline") as mock_get_pipeline,
+        patch("src.agents.orchestrator.get_query_pipeline") as mock_get_pipeline,
         patch(
             "src.agents.orchestrator.retrieve_legal_info", new_callable=AsyncMock
         ) as mock_retriever,
@@ -29,7 +29,7 @@ async def test_stream_query_fast_lane():
         # Setup
         orchestrator = AdminOrchestrator()
         orchestrator.cache = AsyncMock()
-        orchestrator.cache.get.return_value = None
+        orchestrator.cache.getex.return_value = None
 
         # Mock Pipeline
         mock_pipeline_instance = AsyncMock()
@@ -80,7 +80,7 @@ async def test_stream_query_slow_lane():
     with (
         patch("src.agents.orchestrator.redis.Redis"),
         patch("src.agents.orchestrator.get_llm") as mock_get_llm,
-        patch("src.shared.query_pipeline.get_query_pipeline") as mock_get_pipeline,
+        patch("src.agents.orchestrator.get_query_pipeline") as mock_get_pipeline,
         patch(
             "src.shared.guardrails.guardrail_manager.validate_topic",
             new_callable=AsyncMock,
@@ -95,7 +95,7 @@ async def test_stream_query_slow_lane():
         # Setup
         orchestrator = AdminOrchestrator()
         orchestrator.cache = AsyncMock()
-        orchestrator.cache.get.return_value = None
+        orchestrator.cache.getex.return_value = None
         mock_get_llm.return_value = MagicMock()
 
         # Mock Pipeline
@@ -115,7 +115,7 @@ async def test_stream_query_slow_lane():
         mock_memory.save_agent_state = AsyncMock()
 
         # Mock Graph Events
-        async def event_generator(state, version):
+        async def event_generator(state, version, **filters):
             yield {"event": "on_tool_start", "name": "check_eligibility"}
             yield {
                 "event": "on_chat_model_stream",
@@ -154,7 +154,7 @@ async def test_stream_query_cache_hit():
     ):
         orchestrator = AdminOrchestrator()
         orchestrator.cache = AsyncMock()
-        orchestrator.cache.get.return_value = "Cached Answer"
+        orchestrator.cache.getex.return_value = b"Cached Answer"
         mock_get_llm.return_value = MagicMock()
 
         events = []
@@ -164,3 +164,25 @@ async def test_stream_query_cache_hit():
         assert len(events) == 2
         assert events[0] == {"type": "status", "content": "Récupération depuis le cache..."}
         assert events[1] == {"type": "token", "content": "Cached Answer"}
+
+
+@pytest.mark.asyncio
+async def test_stream_query_cache_hit_is_chunked():
+    """Long cached answers are streamed in several token events."""
+    cached = "Pour renouveler votre titre de séjour, " * 5
+    with (
+        patch("src.agents.orchestrator.get_llm"),
+        patch("src.config.settings.DEBUG", False),
+    ):
+        orchestrator = AdminOrchestrator()
+        orchestrator.cache = AsyncMock()
+        orchestrator.cache.getex.return_value = cached.encode("utf-8")
+
+        tokens = [
+            event["content"]
+            async for event in orchestrator.stream_query("Cached query", "fr")
+            if event["type"] == "token"
+        ]
+
+    assert len(tokens) == -(-len(cached) // 64)
+    assert "".join(tokens) == cached
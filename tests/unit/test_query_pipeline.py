@@ -237,3 +237,95 @@ async def test_pipeline_profile_extraction_failure_returns_empty():
 
     result = await pipeline.run(query="I am Vietnamese", chat_history=[])
     assert result.extracted_data == {}
+
+
+@pytest.mark.asyncio
+async def test_profile_extraction_runs_concurrently_with_rewrite_chain():
+    """Profile extraction starts before goal extraction / rewrite complete."""
+    import asyncio
+
+    pipeline = make_pipeline()
+    profile_started = asyncio.Event()
+
+    async def extract_goal(*args, **kwargs):
+        await asyncio.wait_for(profile_started.wait(), timeout=1)
+        return "Obtenir un permis de conduire"
+
+    async def extract_profile(*args, **kwargs):
+        profile_started.set()
+        return {"nationality": "Vietnamese"}
+
+    pipeline._goal_extractor.extract_goal = extract_goal
+    pipeline._profile_extractor.extract = extract_profile
+
+    result = await pipeline.run(query="I am Vietnamese", chat_history=[])
+    assert result.new_core_goal == "Obtenir un permis de conduire"
+    assert result.extracted_data == {"nationality": "Vietnamese"}
+
+
+# ---------------------------------------------------------------------------
+# Combined preprocessing (single LLM call)
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_combined_preprocessor_replaces_separate_steps():
+    from src.agents.preprocessor import CombinedPreprocessing
+
+    pipeline = make_pipeline()
+    combined = MagicMock()
+    combined.run = AsyncMock(
+        return_value=CombinedPreprocessing(
+            core_goal="Renouveler un titre de séjour",
+            rewritten_query="Renouvellement titre de séjour étudiant",
+            intent="SIMPLE_QA",
+            profile={"residency_status": "student"},
+        )
+    )
+    pipeline._combined_preprocessor = combined
+
+    result = await pipeline.run(query="Et pour un étudiant ?", chat_history=[])
+
+    assert result.new_core_goal == "Renouveler un titre de séjour"
+    assert result.rewritten_query == "Renouvellement titre de séjour étudiant"
+    assert result.intent == "SIMPLE_QA"
+    assert result.extracted_data == {"residency_status": "student"}
+    pipeline._goal_extractor.extract_goal.assert_not_called()
+    pipeline._query_rewriter.rewrite.assert_not_called()
+    pipeline._intent_classifier.classify.assert_not_called()
+    pipeline._profile_extractor.extract.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_combined_preprocessor_keeps_contextual_continuation():
+    from src.agents.preprocessor import CombinedPreprocessing
+
+    pipeline = make_pipeline()
+    pipeline._combined_preprocessor = MagicMock()
+    pipeline._combined_preprocessor.run = AsyncMock(
+        return_value=CombinedPreprocessing(rewritten_query="User confirms having a visa.", intent="SIMPLE_QA")
+    )
+    history = [HumanMessage(content="Visa ?"), AIMessage(content="Do you have a visa?")]
+
+    result = await pipeline.run(query="Yes", chat_history=history)
+
+    assert result.is_contextual_continuation is True
+    assert result.intent == "COMPLEX_PROCEDURE"
+
+
+@pytest.mark.asyncio
+async def test_combined_preprocessor_failure_falls_back_to_separate_steps():
+    pipeline = make_pipeline()
+    pipeline._combined_preprocessor = MagicMock()
+    pipeline._combined_preprocessor.run = AsyncMock(return_value=None)
+
+    result = await pipeline.run(query="Test", chat_history=[])
+
+    assert result.intent == "SIMPLE_QA"
+    pipeline._intent_classifier.classify.assert_awaited_once()
+
+
+def test_get_query_pipeline_is_built_once():
+    from src.shared.query_pipeline import get_query_pipeline
+
+    assert get_query_pipeline() is get_query_pipeline()
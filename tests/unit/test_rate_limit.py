@@ -0,0 +1,100 @@
+import httpx
+import openai
+import pytest
+from unittest.mock import AsyncMock, patch
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_none
+
+from src.utils.rate_limit import RETRYABLE_ERRORS, RateLimitGate
+
+
+def _rate_limit_error(headers=None):
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(429, headers=headers or {}, request=request)
+    return openai.RateLimitError("Rate limit reached", response=response, body=None)
+
+
+def test_record_uses_retry_after_header():
+    gate = RateLimitGate()
+    with patch("src.utils.rate_limit.time.monotonic", return_value=100.0):
+        gate.record(_rate_limit_error({"retry-after": "7"}))
+    assert gate._cooldown_until == 107.0
+
+    # retry-after-ms is more precise and takes precedence
+    gate = RateLimitGate()
+    with patch("src.utils.rate_limit.time.monotonic", return_value=100.0):
+        gate.record(_rate_limit_error({"retry-after-ms": "250", "retry-after": "1"}))
+    assert gate._cooldown_until == 100.25
+
+
+def test_record_ignores_non_rate_limit_errors():
+    gate = RateLimitGate()
+    gate.record(ValueError("bad schema"))
+    assert gate._cooldown_until == 0.0
+
+
+@pytest.mark.asyncio
+async def test_wait_if_cooling_sleeps_until_deadline():
+    gate = RateLimitGate()
+    gate._cooldown_until = 105.0
+    with (
+        patch("src.utils.rate_limit.time.monotonic", return_value=103.0),
+        patch(
+            "src.utils.rate_limit.asyncio.sleep", new_callable=AsyncMock
+        ) as mock_sleep,
+    ):
+        await gate.wait_if_cooling()
+    mock_sleep.assert_awaited_once_with(2.0)
+
+
+@pytest.mark.asyncio
+async def test_only_transient_errors_are_retried():
+    gate = RateLimitGate()
+    calls = []
+
+    @retry(
+        wait=wait_none(),
+        stop=stop_after_attempt(3),
+        retry=retry_if_exception_type(RETRYABLE_ERRORS),
+        before_sleep=gate.before_sleep,
+        reraise=True,
+    )
+    async def flaky(error):
+        calls.append(error)
+        if len(calls) == 1:
+            raise error
+        return "ok"
+
+    assert await flaky(_rate_limit_error({"retry-after": "0"})) == "ok"
+    assert len(calls) == 2
+
+    calls.clear()
+    with pytest.raises(ValueError):
+        await flaky(ValueError("parsing bug"))
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_retries_are_logged():
+    gate = RateLimitGate()
+    calls = []
+
+    @retry(
+        wait=wait_none(),
+        stop=stop_after_attempt(3),
+        retry=retry_if_exception_type(RETRYABLE_ERRORS),
+        before_sleep=gate.before_sleep,
+        reraise=True,
+    )
+    async def flaky():
+        calls.append(1)
+        if len(calls) == 1:
+            raise openai.APITimeoutError(
+                request=httpx.Request("POST", "https://api.openai.com/v1")
+            )
+        return "ok"
+
+    with patch("src.utils.rate_limit.logger") as mock_logger:
+        assert await flaky() == "ok"
+    mock_logger.warning.assert_called_once()
+    args = mock_logger.warning.call_args.args
+    assert args[3] == 1 and args[4] == "APITimeoutError"
@@ -237,3 +237,35 @@ class TestTopicRulesKeywordNormalization:
         data = {"guardrail_keywords": {"fr": ["a"], "en": [], "vi": []}}
         rules = TopicRules("test", data)
         assert rules.guardrail_keywords == ["a"]
+
+
+class TestPromptFragmentCache:
+    """Fragments are rendered once per (topic, variables still to ask for)."""
+
+    def test_same_missing_variables_reuse_fragment(self):
+        from src.rules.registry import TopicRegistry
+        registry = TopicRegistry()
+        first = registry.build_prompt_fragment("immigration", {"nationality": "VN"}, "visa")
+        again = registry.build_prompt_fragment("immigration", {"nationality": "US"}, "titre")
+        assert again is first
+        assert "nationality" not in first.split("FEW-SHOT")[0]
+
+        unknown = registry.build_prompt_fragment("immigration", {}, "visa")
+        assert unknown is not first
+        assert "- nationality:" in unknown
+
+
+class TestTopicDetectionCache:
+    """The keyword scan runs once per distinct (lower-cased) query."""
+
+    def test_repeated_query_reuses_keyword_scan(self):
+        registry = make_registry(FLAT_YAML)
+        assert registry.detect_topic("Mon EMPLOYEUR ne me paie pas") == "labor"
+        hits = registry._keyword_topic.cache_info().hits
+        assert registry.detect_topic("mon employeur ne me paie pas") == "labor"
+        assert registry._keyword_topic.cache_info().hits == hits + 1
+
+    def test_intent_fallback_not_cached_with_query(self):
+        registry = make_registry(FLAT_YAML)
+        assert registry.detect_topic("bonjour", "LEGAL_INQUIRY") == "identity"
+        assert registry.detect_topic("bonjour") == "daily_life"
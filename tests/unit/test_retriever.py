@@ -16,7 +16,7 @@ async def test_retrieve_general_returns_results():
         mock_client.collection_exists.return_value = True
         mock_client_fn.return_value = mock_client
 
-        mock_embed_fn.return_value = MagicMock()
+        mock_embed_fn.return_value.embed_query.return_value = [0.1, 0.2]
 
         # Mock the vector store search
         mock_doc = MagicMock()
@@ -24,7 +24,7 @@ async def test_retrieve_general_returns_results():
         mock_doc.metadata = {"title": "Passeport"}
 
         mock_store = MagicMock()
-        mock_store.asimilarity_search = AsyncMock(return_value=[mock_doc])
+        mock_store.similarity_search_with_score_by_vector = MagicMock(return_value=[(mock_doc, 0.8)])
         mock_store_cls.return_value = mock_store
 
         from skills.legal_retriever.main import retrieve_legal_info
@@ -47,7 +47,7 @@ async def test_retrieve_missing_collection_returns_empty():
         mock_client = MagicMock()
         mock_client.collection_exists.return_value = False
         mock_client_fn.return_value = mock_client
-        mock_embed_fn.return_value = MagicMock()
+        mock_embed_fn.return_value.embed_query.return_value = [0.1, 0.2]
 
         from skills.legal_retriever.main import retrieve_legal_info
 
@@ -69,14 +69,14 @@ async def test_retrieve_procedure_domain_only():
         mock_client = MagicMock()
         mock_client.collection_exists.return_value = True
         mock_client_fn.return_value = mock_client
-        mock_embed_fn.return_value = MagicMock()
+        mock_embed_fn.return_value.embed_query.return_value = [0.1, 0.2]
 
         mock_doc = MagicMock()
         mock_doc.page_content = "Procedure info"
         mock_doc.metadata = {"title": "Procedure"}
 
         mock_store = MagicMock()
-        mock_store.asimilarity_search = AsyncMock(return_value=[mock_doc])
+        mock_store.similarity_search_with_score_by_vector = MagicMock(return_value=[(mock_doc, 0.8)])
         mock_store_cls.return_value = mock_store
 
         from skills.legal_retriever.main import retrieve_legal_info
@@ -101,14 +101,14 @@ async def test_retrieve_legislation_domain_only():
         mock_client = MagicMock()
         mock_client.collection_exists.return_value = True
         mock_client_fn.return_value = mock_client
-        mock_embed_fn.return_value = MagicMock()
+        mock_embed_fn.return_value.embed_query.return_value = [0.1, 0.2]
 
         mock_doc = MagicMock()
         mock_doc.page_content = "Article L.123"
         mock_doc.metadata = {"title": "Loi"}
 
         mock_store = MagicMock()
-        mock_store.asimilarity_search = AsyncMock(return_value=[mock_doc])
+        mock_store.similarity_search_with_score_by_vector = MagicMock(return_value=[(mock_doc, 0.8)])
         mock_store_cls.return_value = mock_store
 
         from skills.legal_retriever.main import retrieve_legal_info
@@ -117,3 +117,244 @@ async def test_retrieve_legislation_domain_only():
 
         for r in results:
             assert r["source"] == "legi"
+
+
+def test_warmup_primes_embeddings_and_collections():
+    """Warmup should run one embedding and one query per existing collection."""
+    with patch(
+        "skills.legal_retriever.main._get_qdrant_client"
+    ) as mock_client_fn, patch(
+        "skills.legal_retriever.main._get_embeddings"
+    ) as mock_embed_fn, patch(
+        "skills.legal_retriever.main.QdrantVectorStore"
+    ) as mock_store_cls:
+        mock_client = MagicMock()
+        mock_client.collection_exists.side_effect = lambda name: name == "legi_legislation"
+        mock_client_fn.return_value = mock_client
+        mock_embed_fn.return_value.embed_query.return_value = [0.1, 0.2]
+
+        from skills.legal_retriever.main import warmup
+
+        warmup()
+
+        mock_embed_fn.return_value.embed_query.assert_called_once_with("warmup")
+        mock_client.query_points.assert_called_once_with(
+            collection_name="legi_legislation", query=[0.1, 0.2], limit=1
+        )
+        # The existing collection's vector store is built (and cached) up front
+        mock_store_cls.assert_called_once()
+        assert mock_store_cls.call_args.kwargs["collection_name"] == "legi_legislation"
+
+
+@pytest.mark.asyncio
+async def test_vector_store_is_built_once_per_collection():
+    """Repeated searches reuse the cached store instead of rebuilding it."""
+    with patch(
+        "skills.legal_retriever.main._get_qdrant_client"
+    ) as mock_client_fn, patch(
+        "skills.legal_retriever.main._get_embeddings"
+    ) as mock_embed_fn, patch(
+        "skills.legal_retriever.main.QdrantVectorStore"
+    ) as mock_store_cls:
+        mock_client = MagicMock()
+        mock_client.collection_exists.return_value = True
+        mock_client_fn.return_value = mock_client
+        mock_embed_fn.return_value.embed_query.return_value = [0.1, 0.2]
+
+        mock_store = MagicMock()
+        mock_store.similarity_search_with_score_by_vector = MagicMock(return_value=[])
+        mock_store_cls.return_value = mock_store
+
+        from skills.legal_retriever.main import retrieve_legal_info
+
+        await retrieve_legal_info("passeport", domain="procedure")
+        await retrieve_legal_info("visa", domain="procedure")
+
+        assert mock_store_cls.call_count == 1
+        assert mock_client.collection_exists.call_count == 1
+        assert mock_store.similarity_search_with_score_by_vector.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_embedding_and_search_run_in_dedicated_executor():
+    """Retrieval's blocking calls use its own pool, not the loop's default executor."""
+    import threading
+
+    threads = []
+
+    def record(result):
+        def call(*args, **kwargs):
+            threads.append(threading.current_thread().name)
+            return result
+        return call
+
+    with patch(
+        "skills.legal_retriever.main._get_qdrant_client"
+    ) as mock_client_fn, patch(
+        "skills.legal_retriever.main._get_embeddings"
+    ) as mock_embed_fn, patch(
+        "skills.legal_retriever.main.QdrantVectorStore"
+    ) as mock_store_cls:
+        mock_client_fn.return_value.collection_exists.return_value = True
+        mock_embed_fn.return_value.embed_query.side_effect = record([0.1, 0.2])
+        mock_store_cls.return_value.similarity_search_with_score_by_vector.side_effect = record([])
+
+        from skills.legal_retriever.main import retrieve_legal_info
+
+        await retrieve_legal_info("carte vitale", domain="procedure")
+
+    assert len(threads) == 2
+    assert all(name.startswith("retrieval") for name in threads)
+
+
+@pytest.mark.asyncio
+async def test_general_search_embeds_query_once():
+    """Both collections are searched with a single (cached) query embedding."""
+    with patch(
+        "skills.legal_retriever.main._get_qdrant_client"
+    ) as mock_client_fn, patch(
+        "skills.legal_retriever.main._get_embeddings"
+    ) as mock_embed_fn, patch(
+        "skills.legal_retriever.main.QdrantVectorStore"
+    ) as mock_store_cls:
+        mock_client_fn.return_value.collection_exists.return_value = True
+        mock_embed_fn.return_value.embed_query.return_value = [0.1, 0.2]
+        mock_store = MagicMock()
+        mock_store.similarity_search_with_score_by_vector = MagicMock(return_value=[])
+        mock_store_cls.return_value = mock_store
+
+        from skills.legal_retriever.main import retrieve_legal_info
+
+        await retrieve_legal_info("passeport", domain="general")
+        await retrieve_legal_info("  Passeport ", domain="general")
+
+        mock_embed_fn.return_value.embed_query.assert_called_once_with("passeport")
+        assert mock_store.similarity_search_with_score_by_vector.call_count == 4
+        assert mock_store.similarity_search_with_score_by_vector.call_args.args[0] == [0.1, 0.2]
+
+
+@pytest.mark.asyncio
+async def test_search_uses_quantization_rescoring():
+    """Searches pass rescoring params for the int8-quantized collections."""
+    with patch(
+        "skills.legal_retriever.main._get_qdrant_client"
+    ) as mock_client_fn, patch(
+        "skills.legal_retriever.main._get_embeddings"
+    ) as mock_embed_fn, patch(
+        "skills.legal_retriever.main.QdrantVectorStore"
+    ) as mock_store_cls:
+        mock_client_fn.return_value.collection_exists.return_value = True
+        mock_embed_fn.return_value.embed_query.return_value = [0.1, 0.2]
+        mock_store = MagicMock()
+        mock_store.similarity_search_with_score_by_vector = MagicMock(return_value=[])
+        mock_store_cls.return_value = mock_store
+
+        from skills.legal_retriever.main import retrieve_legal_info
+
+        await retrieve_legal_info("passeport", domain="legislation")
+
+        search_params = mock_store.similarity_search_with_score_by_vector.call_args.kwargs["search_params"]
+        assert search_params.quantization.rescore is True
+        assert search_params.quantization.oversampling == 2.0
+        assert search_params.hnsw_ef == 64
+
+        # High-recall callers can widen the HNSW beam
+        await retrieve_legal_info("passeport", domain="legislation", ef_search=200)
+        search_params = mock_store.similarity_search_with_score_by_vector.call_args.kwargs["search_params"]
+        assert search_params.hnsw_ef == 200
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_queries_are_coalesced():
+    """Identical in-flight retrievals share a single search."""
+    import asyncio
+    import time
+
+    with patch(
+        "skills.legal_retriever.main._get_qdrant_client"
+    ) as mock_client_fn, patch(
+        "skills.legal_retriever.main._get_embeddings"
+    ) as mock_embed_fn, patch(
+        "skills.legal_retriever.main.QdrantVectorStore"
+    ) as mock_store_cls, patch(
+        "skills.legal_retriever.main.get_reranker"
+    ) as mock_get_reranker:
+        mock_client_fn.return_value.collection_exists.return_value = True
+        mock_embed_fn.return_value.embed_query.return_value = [0.1, 0.2]
+
+        mock_doc = MagicMock()
+        mock_doc.page_content = "Le passeport coûte 86€"
+        mock_doc.metadata = {"title": "Passeport"}
+
+        def slow_search(*args, **kwargs):
+            time.sleep(0.01)  # runs in the executor
+            return [(mock_doc, 0.8)]
+
+        mock_store = MagicMock()
+        mock_store.similarity_search_with_score_by_vector = MagicMock(side_effect=slow_search)
+        mock_store_cls.return_value = mock_store
+        mock_get_reranker.return_value.arerank = AsyncMock(
+            side_effect=lambda query, docs, user_profile=None: docs
+        )
+
+        from skills.legal_retriever.main import retrieve_legal_info, _INFLIGHT
+
+        first, second = await asyncio.gather(
+            retrieve_legal_info("passeport", domain="procedure"),
+            retrieve_legal_info("passeport", domain="procedure"),
+        )
+
+        assert mock_store.similarity_search_with_score_by_vector.call_count == 1
+        mock_embed_fn.return_value.embed_query.assert_called_once_with("passeport")
+        assert first == second
+        assert first is not second
+        assert _INFLIGHT == {}
+
+
+@pytest.mark.asyncio
+async def test_expansions_are_embedded_as_queries_and_fused():
+    """Paraphrases are embedded as queries; per-collection rankings are RRF-fused."""
+
+    def doc(text):
+        d = MagicMock()
+        d.page_content = text
+        d.metadata = {"title": text}
+        return d
+
+    with patch(
+        "skills.legal_retriever.main._get_qdrant_client"
+    ) as mock_client_fn, patch(
+        "skills.legal_retriever.main._get_embeddings"
+    ) as mock_embed_fn, patch(
+        "skills.legal_retriever.main.QdrantVectorStore"
+    ) as mock_store_cls, patch(
+        "skills.legal_retriever.main.get_reranker"
+    ) as mock_get_reranker:
+        mock_client_fn.return_value.collection_exists.return_value = True
+        mock_embed_fn.return_value.embed_query.side_effect = lambda text: {
+            "titre de séjour": [1.0],
+            "carte de séjour": [2.0],
+        }[text]
+
+        rankings = {
+            1.0: [(doc("A"), 0.9), (doc("B"), 0.8)],
+            2.0: [(doc("B"), 0.9), (doc("C"), 0.7)],
+        }
+        mock_store = MagicMock()
+        mock_store.similarity_search_with_score_by_vector = MagicMock(
+            side_effect=lambda embedding, **kwargs: rankings[embedding[0]]
+        )
+        mock_store_cls.return_value = mock_store
+        mock_get_reranker.return_value.arerank = AsyncMock(
+            side_effect=lambda query, docs, user_profile=None: docs
+        )
+
+        from skills.legal_retriever.main import retrieve_legal_info
+
+        results = await retrieve_legal_info(
+            "titre de séjour", domain="procedure", expansions=["carte de séjour"]
+        )
+
+        assert mock_embed_fn.return_value.embed_query.call_count == 2
+        mock_embed_fn.return_value.embed_documents.assert_not_called()
+        assert sorted(r["content"] for r in results) == ["A", "B", "C"]
@@ -0,0 +1,115 @@
+"""
+Unit tests for src/shared/semantic_cache.py
+
+Redis is replaced by an in-memory dict behind AsyncMocks so the packing,
+similarity threshold and namespace isolation can be exercised directly.
+"""
+
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.shared.semantic_cache import SemanticResponseCache
+
+
+def make_cache(threshold=0.92, max_entries=500):
+    cache = SemanticResponseCache(threshold=threshold, ttl=60, max_entries=max_entries)
+    store = {}
+
+    async def hgetall(key):
+        return dict(store.get(key, {}))
+
+    class FakePipeline:
+        def __init__(self):
+            self.ops = []
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        def hset(self, key, field, value):
+            self.ops.append(lambda: store.setdefault(key, {}).__setitem__(field, value))
+
+        def hexpire(self, key, ttl, field):
+            self.ops.append(lambda: None)
+
+        def hlen(self, key):
+            self.ops.append(lambda: len(store.get(key, {})))
+
+        async def execute(self):
+            return [op() for op in self.ops]
+
+    async def hrandfield(key, count):
+        return list(store.get(key, {}))[:count]
+
+    async def hdel(key, *fields):
+        for field in fields:
+            store.get(key, {}).pop(field, None)
+
+    cache.client = MagicMock()
+    cache.client.hgetall = AsyncMock(side_effect=hgetall)
+    cache.client.pipeline = MagicMock(
+        side_effect=lambda transaction=False: FakePipeline()
+    )
+    cache.client.hrandfield = AsyncMock(side_effect=hrandfield)
+    cache.client.hdel = AsyncMock(side_effect=hdel)
+    return cache, store
+
+
+@pytest.mark.asyncio
+async def test_hit_on_similar_embedding():
+    cache, _ = make_cache()
+    await cache.set([1.0, 0.0, 0.0], "Réponse titre de séjour", namespace="French")
+
+    assert (
+        await cache.get([0.99, 0.05, 0.0], namespace="French")
+        == "Réponse titre de séjour"
+    )
+
+
+@pytest.mark.asyncio
+async def test_miss_below_threshold():
+    cache, _ = make_cache()
+    await cache.set([1.0, 0.0, 0.0], "answer", namespace="French")
+
+    assert await cache.get([0.0, 1.0, 0.0], namespace="French") is None
+
+
+@pytest.mark.asyncio
+async def test_namespaces_are_isolated():
+    cache, _ = make_cache()
+    await cache.set([1.0, 0.0], "French answer", namespace="French")
+
+    assert await cache.get([1.0, 0.0], namespace="English") is None
+
+
+@pytest.mark.asyncio
+async def test_best_match_wins():
+    cache, _ = make_cache(threshold=0.5)
+    await cache.set([1.0, 0.0], "first", namespace="fr")
+    await cache.set([0.7, 0.7], "second", namespace="fr")
+
+    assert await cache.get([0.6, 0.8], namespace="fr") == "second"
+
+
+@pytest.mark.asyncio
+async def test_namespace_is_capped():
+    cache, store = make_cache(max_entries=2)
+    for i in range(4):
+        vector = np.zeros(4)
+        vector[i] = 1.0
+        await cache.set(vector, f"answer {i}", namespace="fr")
+
+    assert len(store["semcache:fr"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_are_a_miss():
+    cache, _ = make_cache()
+    cache.client.hgetall = AsyncMock(side_effect=Exception("Redis down"))
+    cache.client.pipeline = MagicMock(side_effect=Exception("Redis down"))
+
+    await cache.set([1.0, 0.0], "answer", namespace="fr")
+    assert await cache.get([1.0, 0.0], namespace="fr") is None
@@ -17,6 +17,12 @@ def mock_memory_manager():
         return mgr
 
 
+def _stored_hash(client):
+    """The fields written by the last HSET, as Redis would return them from HGETALL."""
+    key, = client.hset.call_args.args
+    return key, {field.encode(): value for field, value in client.hset.call_args.kwargs["mapping"].items()}
+
+
 @pytest.mark.asyncio
 async def test_save_and_load_state(mock_memory_manager):
     session_id = "test_session"
@@ -29,32 +35,87 @@ async def test_save_and_load_state(mock_memory_manager):
     # Test Save
     await mock_memory_manager.save_agent_state(session_id, state)
 
-    # Verify Redis set call
-    mock_memory_manager.redis_client.set.assert_called_once()
-    args, _ = mock_memory_manager.redis_client.set.call_args
-    key, val = args
-    assert key == f"agent_state:{session_id}"
+    # Verify Redis HSET call: one orjson value per field
+    mock_memory_manager.redis_client.hset.assert_called_once()
+    key, stored = _stored_hash(mock_memory_manager.redis_client)
+    assert key == f"session_state:{session_id}"
 
-    saved_data = json.loads(val)
-    assert saved_data["intent"] == "SIMPLE_QA"
-    assert len(saved_data["messages"]) == 2
-    assert saved_data["messages"][0]["type"] == "human"
+    assert json.loads(stored[b"intent"]) == "SIMPLE_QA"
+    saved_messages = json.loads(stored[b"messages"])
+    assert len(saved_messages) == 2
+    assert saved_messages[0]["type"] == "human"
 
     # Test Load
-    mock_memory_manager.redis_client.get.return_value = val
+    mock_memory_manager.redis_client.hgetall.return_value = stored
     loaded_state = await mock_memory_manager.load_agent_state(session_id)
 
     assert loaded_state.session_id == session_id
+    assert loaded_state.intent == "SIMPLE_QA"
     assert len(loaded_state.messages) == 2
     assert isinstance(loaded_state.messages[0], HumanMessage)
     assert loaded_state.messages[0].content == "Hello"
 
 
+@pytest.mark.asyncio
+async def test_save_writes_only_changed_fields(mock_memory_manager):
+    client = mock_memory_manager.redis_client
+    state = AgentState(session_id="s", messages=[HumanMessage(content="Hello")])
+    await mock_memory_manager.save_agent_state("s", state)
+    client.hgetall.return_value = _stored_hash(client)[1]
+    client.hset.reset_mock()
+
+    loaded = await mock_memory_manager.load_agent_state("s")
+    loaded.messages.append(AIMessage(content="Hi"))
+    loaded.intent = "SIMPLE_QA"
+    await mock_memory_manager.save_agent_state("s", loaded)
+
+    assert set(client.hset.call_args.kwargs["mapping"]) == {"messages", "intent"}
+
+    # Nothing changed since the last save: no write at all
+    client.hset.reset_mock()
+    await mock_memory_manager.save_agent_state("s", loaded)
+    client.hset.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_load_migrates_single_json_state(mock_memory_manager):
+    client = mock_memory_manager.redis_client
+    client.hgetall.return_value = {}
+    client.get.return_value = json.dumps(
+        {
+            "session_id": "old",
+            "intent": "SIMPLE_QA",
+            "messages": [{"type": "human", "data": {"content": "Bonjour", "type": "human"}}],
+        }
+    ).encode()
+
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    client.pipeline = MagicMock()
+    client.pipeline.return_value.__aenter__ = AsyncMock(return_value=pipe)
+    client.pipeline.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    state = await mock_memory_manager.load_agent_state("old")
+
+    client.get.assert_awaited_once_with("agent_state:old")
+    assert state.intent == "SIMPLE_QA"
+    assert state.messages[0].content == "Bonjour"
+    # Rewritten in the hash layout and the old key dropped, in one round trip
+    assert pipe.hset.call_args.args == ("session_state:old",)
+    pipe.delete.assert_called_once_with("agent_state:old")
+    pipe.execute.assert_awaited_once()
+    client.hset.assert_not_called()
+    # Recorded as stored: saving the unchanged state writes nothing
+    await mock_memory_manager.save_agent_state("old", state)
+    client.hset.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_migration_from_legacy(mock_memory_manager):
     session_id = "legacy_session"
 
-    # 1. Simulate NO existing state (cache miss on new key)
+    # 1. Simulate NO existing state (cache miss on both state keys)
+    mock_memory_manager.redis_client.hgetall.return_value = {}
     mock_memory_manager.redis_client.get.return_value = None
 
     # 2. Simulate YES existing legacy messages
@@ -71,4 +132,20 @@ async def test_migration_from_legacy(mock_memory_manager):
         assert state.messages[0].content == "Legacy Msg"
 
         # Should have saved new state immediately
-        mock_memory_manager.redis_client.set.assert_called_once()
+        mock_memory_manager.redis_client.hset.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_save_keeps_only_recent_messages(mock_memory_manager):
+    from src.memory.manager import MAX_STORED_MESSAGES
+
+    messages = [HumanMessage(content=f"q{i}") for i in range(MAX_STORED_MESSAGES + 5)]
+    state = AgentState(session_id="long", messages=messages)
+
+    await mock_memory_manager.save_agent_state("long", state)
+
+    saved = json.loads(_stored_hash(mock_memory_manager.redis_client)[1][b"messages"])
+    assert len(saved) == MAX_STORED_MESSAGES
+    assert saved[-1]["data"]["content"] == f"q{MAX_STORED_MESSAGES + 4}"
+    # The in-memory state is untouched
+    assert len(state.messages) == MAX_STORED_MESSAGES + 5
@@ -46,7 +46,7 @@ async def test_stream_filtering():
     # Create Orchestrator
     with (
         patch("src.agents.orchestrator.memory_manager", mock_memory),
-        patch("src.agents.graph.agent_graph") as mock_agent_graph,
+        patch("src.agents.orchestrator.agent_graph") as mock_agent_graph,
         patch("src.agents.preprocessor.query_rewriter") as mock_rewriter,
         patch("src.agents.preprocessor.profile_extractor") as mock_profile,
         patch("src.agents.intent_classifier.intent_classifier") as mock_intent,
@@ -62,7 +62,7 @@ async def test_stream_filtering():
         patch("src.agents.orchestrator.get_query_pipeline") as mock_get_pipeline,
     ):
         mock_redis.return_value = AsyncMock()
-        mock_redis.return_value.get.return_value = None
+        mock_redis.return_value.getex.return_value = None
         mock_agent_graph.astream_events = mock_astream_events
         # Setup Translator/Retriever
         mock_translator.return_value = "Mocked translation"
@@ -98,5 +98,90 @@ async def test_stream_filtering():
         print("SUCCESS: Stream filtering works.")
 
 
+async def _stream_tokens(events):
+    """Runs stream_query through the slow lane with the given graph events."""
+
+    async def mock_astream_events(*args, **kwargs):
+        for e in events:
+            yield e
+
+    mock_memory = AsyncMock()
+    mock_memory.load_agent_state.return_value = AgentState(session_id="test")
+
+    with (
+        patch("src.agents.orchestrator.memory_manager", mock_memory),
+        patch("src.agents.orchestrator.agent_graph") as mock_agent_graph,
+        patch("src.agents.orchestrator.guardrail_manager") as mock_guard,
+        patch("src.agents.orchestrator.redis.Redis") as mock_redis,
+        patch("src.agents.orchestrator.get_llm"),
+        patch("src.agents.orchestrator.translate_admin_text", new_callable=AsyncMock),
+        patch("src.agents.orchestrator.get_query_pipeline") as mock_get_pipeline,
+    ):
+        mock_redis.return_value = AsyncMock()
+        mock_redis.return_value.getex.return_value = None
+        mock_agent_graph.astream_events = mock_astream_events
+        mock_guard.validate_topic = AsyncMock(return_value=(True, ""))
+        mock_guard.add_disclaimer.side_effect = lambda text, lang: text
+        mock_get_pipeline.return_value.run = AsyncMock(
+            return_value=PipelineResult(
+                rewritten_query="query",
+                intent=Intent.LEGAL_INQUIRY,
+                extracted_data={},
+                new_core_goal=None,
+            )
+        )
+
+        orchestrator = AdminOrchestrator()
+        return [
+            event["content"]
+            async for event in orchestrator.stream_query("query", "fr", "test")
+            if event["type"] == "token"
+        ]
+
+
+def _token_event(text, run_id=None):
+    chunk = MagicMock()
+    chunk.content = text
+    return {"event": "on_chat_model_stream", "tags": ["final_answer"], "run_id": run_id, "data": {"chunk": chunk}}
+
+
+async def test_insufficient_context_sentinel_is_not_streamed():
+    from langchain_core.messages import AIMessage
+    from src.agents.legal_agent import INSUFFICIENT_CONTEXT_MESSAGE
+
+    tokens = await _stream_tokens(
+        [
+            _token_event("INSUFF"),
+            _token_event("ICIENT_CONTEXT"),
+            {
+                "event": "on_chain_end",
+                "name": "legal_expert",
+                "data": {"output": {"messages": [AIMessage(content=INSUFFICIENT_CONTEXT_MESSAGE)]}},
+            },
+        ]
+    )
+
+    assert tokens == [INSUFFICIENT_CONTEXT_MESSAGE]
+
+
+async def test_held_back_prefix_is_released():
+    """Tokens that only look like the start of the sentinel are still delivered."""
+    tokens = await _stream_tokens([_token_event("IN"), _token_event(" France, "), _token_event("oui.")])
+
+    assert "".join(tokens) == "IN France, oui."
+
+
+async def test_escalated_synthesis_streams_after_suppressed_draft():
+    tokens = await _stream_tokens(
+        [
+            _token_event("INSUFFICIENT_CONTEXT", run_id="draft"),
+            _token_event("Réponse ", run_id="escalated"),
+            _token_event("complète.", run_id="escalated"),
+        ]
+    )
+
+    assert "".join(tokens) == "Réponse complète."
+
+
 if __name__ == "__main__":
     asyncio.run(test_stream_filtering())
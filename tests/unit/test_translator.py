@@ -2,10 +2,20 @@ import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
 
+@pytest.fixture(autouse=True)
+def mock_translation_cache():
+    """Isolate translator tests from Redis: every lookup is a miss."""
+    cache = MagicMock()
+    cache.get = AsyncMock(return_value=None)
+    cache.setex = AsyncMock()
+    with patch("skills.admin_translator._get_cache", return_value=cache):
+        yield cache
+
+
 @pytest.mark.asyncio
 async def test_translate_returns_translation():
     """Translator should return translated text."""
-    with patch("skills.admin_translator.ChatOpenAI") as mock_llm_cls, patch(
+    with patch("skills.admin_translator.get_llm") as mock_llm_cls, patch(
         "skills.admin_translator._llm", None
     ):
         mock_llm = MagicMock()
@@ -36,7 +46,7 @@ async def test_translate_returns_translation():
 @pytest.mark.asyncio
 async def test_translate_accepts_vietnamese():
     """Translator should accept Vietnamese as target language."""
-    with patch("skills.admin_translator.ChatOpenAI") as mock_llm_cls, patch(
+    with patch("skills.admin_translator.get_llm") as mock_llm_cls, patch(
         "skills.admin_translator._llm", None
     ):
         mock_llm_cls.return_value = MagicMock()
@@ -60,7 +70,7 @@ async def test_translate_accepts_vietnamese():
 @pytest.mark.asyncio
 async def test_translate_passes_correct_params():
     """Translator should pass text and target_language to the chain."""
-    with patch("skills.admin_translator.ChatOpenAI") as mock_llm_cls, patch(
+    with patch("skills.admin_translator.get_llm") as mock_llm_cls, patch(
         "skills.admin_translator._llm", None
     ):
         mock_llm_cls.return_value = MagicMock()
@@ -79,3 +89,118 @@ async def test_translate_passes_correct_params():
             call_args = mock_chain.ainvoke.call_args[0][0]
             assert call_args["text"] == "Mon texte"
             assert call_args["target_language"] == "English"
+
+
+def test_translation_parser_extracts_json_field():
+    """JSON-mode output should be unwrapped to the bare translation."""
+    from skills.admin_translator import TranslationOutputParser
+
+    parser = TranslationOutputParser()
+    assert parser.parse('{"translation": "Residence permit"}') == "Residence permit"
+
+
+def test_translation_parser_falls_back_to_raw_text():
+    """Plain-text output (e.g. local backend without JSON mode) is returned as-is."""
+    from skills.admin_translator import TranslationOutputParser
+
+    parser = TranslationOutputParser()
+    assert parser.parse(" Residence permit \n") == "Residence permit"
+    assert parser.parse('{"text": "x"}') == '{"text": "x"}'
+
+
+@pytest.mark.asyncio
+async def test_translate_stream_yields_chunks():
+    """Streaming translator should forward non-empty chunks in order."""
+    with patch("skills.admin_translator.get_llm") as mock_get_llm:
+        mock_get_llm.return_value = MagicMock()
+
+        async def fake_astream(_input):
+            for chunk in ["Residence ", "", "permit"]:
+                yield chunk
+
+        with patch("skills.admin_translator.ChatPromptTemplate") as mock_prompt:
+            mock_chain = MagicMock()
+            mock_chain.astream = fake_astream
+            mock_prompt.from_messages.return_value.__or__ = MagicMock(
+                return_value=MagicMock(__or__=MagicMock(return_value=mock_chain))
+            )
+
+            from skills.admin_translator import translate_admin_text_stream
+
+            chunks = [c async for c in translate_admin_text_stream("Titre de séjour", "English")]
+            assert chunks == ["Residence ", "permit"]
+            assert mock_get_llm.call_args.kwargs["streaming"] is True
+
+
+@pytest.mark.asyncio
+async def test_translate_cache_hit_skips_llm(mock_translation_cache):
+    """A cached translation is returned without building the chain."""
+    mock_translation_cache.get.return_value = "Residence permit"
+    with patch("skills.admin_translator._get_llm") as mock_get_llm:
+        from skills.admin_translator import translate_admin_text
+
+        result = await translate_admin_text("Titre de séjour", "English")
+
+        assert result == "Residence permit"
+        mock_get_llm.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_translate_cache_miss_stores_result(mock_translation_cache):
+    """On a miss the translation is written back with the 30-day TTL."""
+    with patch("skills.admin_translator.get_llm") as mock_get_llm, patch(
+        "skills.admin_translator._llm", None
+    ):
+        mock_get_llm.return_value = MagicMock()
+
+        with patch("skills.admin_translator.ChatPromptTemplate") as mock_prompt:
+            mock_chain = MagicMock()
+            mock_chain.ainvoke = AsyncMock(return_value="Residence permit")
+            mock_prompt.from_messages.return_value.__or__ = MagicMock(
+                return_value=MagicMock(__or__=MagicMock(return_value=mock_chain))
+            )
+
+            from skills.admin_translator import (
+                translate_admin_text,
+                _cache_key,
+                TRANSLATION_CACHE_TTL,
+            )
+
+            await translate_admin_text("Titre de séjour", "English")
+
+            mock_translation_cache.setex.assert_awaited_once_with(
+                _cache_key("Titre de séjour", "English"),
+                TRANSLATION_CACHE_TTL,
+                "Residence permit",
+            )
+
+
+@pytest.mark.asyncio
+async def test_translate_cache_errors_are_ignored(mock_translation_cache):
+    """Redis being down must not break translation."""
+    mock_translation_cache.get.side_effect = Exception("Redis down")
+    mock_translation_cache.setex.side_effect = Exception("Redis down")
+    with patch("skills.admin_translator.get_llm") as mock_get_llm, patch(
+        "skills.admin_translator._llm", None
+    ):
+        mock_get_llm.return_value = MagicMock()
+
+        with patch("skills.admin_translator.ChatPromptTemplate") as mock_prompt:
+            mock_chain = MagicMock()
+            mock_chain.ainvoke = AsyncMock(return_value="Residence permit")
+            mock_prompt.from_messages.return_value.__or__ = MagicMock(
+                return_value=MagicMock(__or__=MagicMock(return_value=mock_chain))
+            )
+
+            from skills.admin_translator import translate_admin_text
+
+            assert await translate_admin_text("Titre de séjour", "English") == "Residence permit"
+
+
+def test_cache_key_is_short_and_delimited():
+    from skills.admin_translator import _cache_key
+
+    key = _cache_key("Titre de séjour", "English")
+    assert key.startswith("tr:") and len(key) == len("tr:") + 32
+    assert key != _cache_key("Titre de séjour", "Vietnamese")
+    assert _cache_key("ab", "c") != _cache_key("a", "bc")